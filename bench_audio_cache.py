@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Audio Cache Benchmark
+=====================
+Compares, for one downloaded audio stream, the disk usage and preprocessing
+time of:
+
+- legacy:  re-encode to 192 kbps MP3 (old FFmpegExtractAudio step), then
+           decode + resample the MP3 to 16 kHz mono for Whisper
+- native:  decode + resample the stream yt-dlp downloaded, as-is
+- pcm16:   load the 16 kHz mono int16 .npy cache (--pcm-cache)
+
+Needs ffmpeg, numpy and openai-whisper. A long video such as the 6H formation
+(GYjzjHlaod0) shows the difference best:
+
+    python3 bench_audio_cache.py audio_downloads/GYjzjHlaod0.webm
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from transcribe_missing_videos import WHISPER_SAMPLE_RATE, load_audio_16k, pcm_cache_path
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, time.perf_counter() - start
+
+
+def main():
+    if len(sys.argv) != 2 or not os.path.exists(sys.argv[1]):
+        print("Usage: python3 bench_audio_cache.py <downloaded audio file>")
+        sys.exit(1)
+
+    source = sys.argv[1]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Legacy path: MP3 transcode, then Whisper decodes the MP3
+        mp3_path = os.path.join(tmp_dir, "legacy.mp3")
+        _, encode_seconds = timed(subprocess.run, [
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+            "-i", source, "-vn", "-b:a", "192k", mp3_path,
+        ])
+        (audio, legacy_decode_seconds), _ = timed(load_audio_16k, mp3_path)
+
+        # Native path: decode the downloaded stream directly
+        native_copy = os.path.join(tmp_dir, "native" + os.path.splitext(source)[1])
+        with open(source, 'rb') as src, open(native_copy, 'wb') as dst:
+            dst.write(src.read())
+        (_, native_decode_seconds), _ = timed(load_audio_16k, native_copy, True)
+
+        # PCM cache path: second load hits the .npy written above
+        (_, pcm_load_seconds), _ = timed(load_audio_16k, native_copy)
+
+        duration = len(audio) / WHISPER_SAMPLE_RATE
+        rows = [
+            ("legacy mp3", os.path.getsize(mp3_path), encode_seconds + legacy_decode_seconds),
+            ("native", os.path.getsize(native_copy), native_decode_seconds),
+            ("pcm16 .npy", os.path.getsize(pcm_cache_path(native_copy)), pcm_load_seconds),
+        ]
+
+    print("=" * 60)
+    print(f"Audio cache benchmark: {os.path.basename(source)} ({duration / 60:.1f} min)")
+    print("=" * 60)
+    print(f"{'variant':<12} {'MB on disk':>12} {'preprocess s':>14}")
+    for name, size, seconds in rows:
+        print(f"{name:<12} {size / 1e6:>12.1f} {seconds:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
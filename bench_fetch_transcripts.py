@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Concurrent Fetch Benchmark
+==========================
+Measures videos/sec of fetch_transcripts.fetch_all_transcripts() for several
+worker counts, against a local stub of YouTubeTranscriptApi. Its two calls
+per video (track listing, track fetch) go through the client's HTTP session,
+whose transport is replaced by one that sleeps to simulate network latency,
+so --rate throttles them like real requests. No network access is needed.
+
+Usage:
+    python3 bench_fetch_transcripts.py [--videos 40] [--latency 0.2] [--workers 1 2 4 8 16]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import types
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class StubSnippet:
+    def __init__(self, text: str, start: float, duration: float):
+        self.text = text
+        self.start = start
+        self.duration = duration
+
+
+class StubTranscript(list):
+    """Stands in for FetchedTranscript: an iterable of snippets."""
+
+
+class StubNoTranscriptFound(Exception):
+    pass
+
+
+class StubTranscriptInfo:
+    """Stands in for Transcript: one listed track that can be fetched."""
+
+    def __init__(self, http_client, video_id: str, language_code: str):
+        self.http_client = http_client
+        self.video_id = video_id
+        self.language_code = language_code
+
+    def fetch(self):
+        self.http_client.get(f"https://stub.invalid/timedtext?v={self.video_id}")
+        return StubTranscript(
+            StubSnippet(f"{self.video_id} line {i}", float(i * 3), 3.0) for i in range(20)
+        )
+
+
+class StubTranscriptList(list):
+    """Stands in for TranscriptList."""
+
+    def find_transcript(self, languages):
+        for language in languages:
+            for track in self:
+                if track.language_code == language:
+                    return track
+        raise StubNoTranscriptFound(languages)
+
+
+class StubYouTubeTranscriptApi:
+    """Local stand-in for YouTubeTranscriptApi making one request per call."""
+
+    def __init__(self, http_client=None):
+        self.http_client = http_client
+
+    def list(self, video_id):
+        self.http_client.post("https://stub.invalid/youtubei/v1/player", json={'videoId': video_id})
+        return StubTranscriptList([StubTranscriptInfo(self.http_client, video_id, 'fr')])
+
+
+def stub_transport(latency: float):
+    """HTTPAdapter.send replacement: waits `latency`, then answers 200 with an empty body."""
+
+    def send(adapter, request, *args, **kwargs):
+        time.sleep(latency)
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response._content = b""
+        return response
+
+    return send
+
+
+class StubTextFormatter:
+    def format_transcript(self, transcript):
+        return "\n".join(snippet.text for snippet in transcript)
+
+
+def install_stubs() -> None:
+    """Register stub scrapetube / youtube_transcript_api modules before importing fetch_transcripts."""
+    api_module = types.ModuleType('youtube_transcript_api')
+    api_module.YouTubeTranscriptApi = StubYouTubeTranscriptApi
+    api_module.NoTranscriptFound = StubNoTranscriptFound
+    formatters_module = types.ModuleType('youtube_transcript_api.formatters')
+    formatters_module.TextFormatter = StubTextFormatter
+    api_module.formatters = formatters_module
+
+    sys.modules['youtube_transcript_api'] = api_module
+    sys.modules['youtube_transcript_api.formatters'] = formatters_module
+    sys.modules.setdefault('scrapetube', types.ModuleType('scrapetube'))
+
+
+def make_videos(count: int) -> list:
+    return [
+        {
+            'id': f"stub{i:07d}",
+            'title': f"Stub video {i}",
+            'published': 'today',
+            'views': '0 views',
+            'duration': '10:00',
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent transcript fetching.")
+    parser.add_argument('--videos', type=int, default=40)
+    parser.add_argument('--latency', type=float, default=0.2, help="Simulated seconds per HTTP request")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--rate', type=float, default=0, help="Token-bucket rate (0 = unlimited)")
+    parser.add_argument('--burst', type=int, default=None, help="Token-bucket burst (default: fetch_transcripts.DEFAULT_BURST)")
+    args = parser.parse_args()
+
+    install_stubs()
+    HTTPAdapter.send = stub_transport(args.latency)
+    import fetch_transcripts
+    burst = args.burst or fetch_transcripts.DEFAULT_BURST
+
+    videos = make_videos(args.videos)
+    rows = []
+
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = fetch_transcripts.ResultsStore(tmp_dir)
+            # Silence the per-video progress lines while timing
+            stdout = sys.stdout
+            sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+            try:
+                start = time.perf_counter()
+                fetch_transcripts.fetch_all_transcripts(
+                    videos, tmp_dir, store,
+                    workers=workers, rate=args.rate, burst=burst,
+                )
+                elapsed = time.perf_counter() - start
+            finally:
+                sys.stdout.close()
+                sys.stdout = stdout
+                store.close()
+        rows.append((workers, elapsed, len(videos) / elapsed))
+
+    baseline = rows[0][2]
+    print("=" * 60)
+    print(f"Concurrent fetch benchmark: {args.videos} videos, {args.latency}s latency, "
+          f"rate={args.rate or 'unlimited'}")
+    print("=" * 60)
+    print(f"{'workers':>8} {'seconds':>10} {'videos/s':>10} {'speedup':>9}")
+    for workers, elapsed, throughput in rows:
+        print(f"{workers:>8} {elapsed:>10.2f} {throughput:>10.2f} {throughput / baseline:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
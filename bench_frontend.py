@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Front-End Performance Benchmark
+===============================
+Loads index.html headless (served by serve.py, so the search index and
+transcripts load as in production) and times the main renders and
+interactions over N iterations:
+
+    renderSidebar, renderToday, renderExercises, renderPlanning,
+    toggleExercise, toggleWeek, handleSearch, searchTranscript
+
+Each iteration runs in its own task between performance.mark() pairs and
+includes the forced style/layout it causes; asynchronous operations
+(searchTranscript, whose matching runs in a worker) are timed until their
+result is on screen. PerformanceObserver collects the
+long tasks and layout shifts that fall inside each operation's window, and a
+MutationObserver counts the nodes each iteration inserts or removes (churn).
+
+Per fixture (default state, and a synthetic "large" state with thousands of
+completed items and notes) and operation, the run records p50/p95/max in ms,
+long tasks, cumulative layout shift, node churn, DOM node count and JS heap
+size:
+
+    metrics/frontend_bench.json         this run
+    bench_frontend_baseline.json        committed reference (--update-baseline)
+
+The run fails (exit code 1) when a p95 or long-task count exceeds its budget
+(BUDGET, or --budget FILE), the heap or DOM node budget is exceeded, or a p95
+regresses more than --max-regression against the baseline.
+
+--compare-full-render measures every fixture a second time with the keyed
+DOM patching disabled (window.FORMATION_FULL_RENDER: views are re-rendered
+through innerHTML as before) and prints the before/after p95 and churn.
+
+Usage:
+    python3 bench_frontend.py [--iterations 30] [--fixture default large]
+    python3 bench_frontend.py --op toggleExercise toggleWeek --compare-full-render
+    python3 bench_frontend.py --update-baseline
+    python3 bench_frontend.py --budget my_budget.json --max-regression 0.5
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+
+from playwright.sync_api import sync_playwright
+
+from serve import make_server
+from test_formation import HEADLESS, REPO_DIR, STATE_KEY, ensure_dir
+
+PAGE = "index.html"
+OUTPUT_FILE = os.path.join("metrics", "frontend_bench.json")
+BASELINE_FILE = str(REPO_DIR / "bench_frontend_baseline.json")
+
+OPERATIONS = ('renderSidebar', 'renderToday', 'renderExercises', 'renderPlanning',
+              'toggleExercise', 'toggleWeek', 'handleSearch', 'searchTranscript')
+
+# p95 milliseconds per operation, plus page-wide limits; checked on every fixture
+BUDGET = {
+    'p95_ms': {
+        'renderSidebar': 16,
+        'renderToday': 50,
+        'renderExercises': 80,
+        'renderPlanning': 50,
+        'toggleExercise': 80,
+        'toggleWeek': 50,
+        'handleSearch': 16,
+        'searchTranscript': 100,
+    },
+    # Long tasks per operation window (warmup included)
+    'long_tasks': {
+        'searchTranscript': 0,
+    },
+    'heap_mb': 64,
+    'dom_nodes': 8000,
+    'layout_shift': 0.1,
+}
+
+# Regressions smaller than this are noise whatever the ratio
+REGRESSION_FLOOR_MS = 2.0
+
+FIXTURES = {
+    'default': {
+        'description': "Fresh learner: empty progress, no notes",
+    },
+    'large': {
+        'description': "Every lesson/exercise done, 5000 stale completed ids, 3000 notes of ~1 KB, 10x transcript",
+        'stale_completed': 5000,
+        'notes': 3000,
+        'note_chars': 1000,
+        'transcript_repeat': 10,
+    },
+}
+
+# Builds the fixture state in the page, from coursData, so ids stay valid
+SEED_JS = """(fixture) => {
+    flushState();
+    const state = JSON.parse(JSON.stringify(defaultStateV3));
+    if (fixture.stale_completed) {
+        const lessons = coursData.phases.flatMap(phase => phase.lessons);
+        const extra = n => Array.from({ length: fixture.stale_completed }, (_, i) => `${n}-archived-${i}`);
+        state.progress.completedLessonIds = [...lessons.map(l => l.id), ...extra('lesson')];
+        state.progress.completedExerciseIds = [
+            ...lessons.filter(l => l.exercise).map(l => l.exercise.id), ...extra('exercise')
+        ];
+        state.progress.completedChecklistIds = extra('check');
+        state.progress.completedWeekIds = extra('week');
+        state.progress.timerSeconds = 360000;
+    }
+    if (fixture.notes) {
+        const lessons = coursData.phases.flatMap(phase => phase.lessons);
+        const body = 'Note de révision sur le contenu organique. '.repeat(
+            Math.ceil(fixture.note_chars / 44)).slice(0, fixture.note_chars);
+        for (let i = 0; i < fixture.notes; i++) {
+            const id = i < lessons.length ? lessons[i].id : `lesson-archived-${i}`;
+            state.notesByLessonId[id] = `${i} ${body}`;
+        }
+    }
+    localStorage.setItem(fixture.storageKey, JSON.stringify(state));
+    return localStorage.getItem(fixture.storageKey).length;
+}"""
+
+# Runs one operation N times in the page and returns the raw measurements
+MEASURE_JS = """async ({ op, iterations, warmup, transcriptRepeat }) => {
+    const nextFrame = () => new Promise(resolve => requestAnimationFrame(() => setTimeout(resolve, 0)));
+    const bench = window.__formationBench || (window.__formationBench = { longTasks: [], shifts: [] });
+    if (!bench.observing) {
+        bench.observing = true;
+        new PerformanceObserver(list => bench.longTasks.push(...list.getEntries()))
+            .observe({ type: 'longtask', buffered: true });
+        new PerformanceObserver(list => bench.shifts.push(...list.getEntries()))
+            .observe({ type: 'layout-shift', buffered: true });
+    }
+
+    const searchQueries = ['seo', 'tiktok', 'email marketing', 'contenu', 'prix', 'instagram'];
+    const transcriptQueries = ['client', 'produit', 'vous', 'marque', 'le'];
+    const firstLessonWithTranscript = () => coursData.phases
+        .flatMap(phase => phase.lessons)
+        .find(lesson => transcriptMap[lesson.videoId]);
+
+    const setups = {
+        renderSidebar: async () => {},
+        renderToday: async () => {},
+        renderExercises: async () => {},
+        renderPlanning: async () => {},
+        toggleExercise: async () => {
+            setExercisesFilter('all', false);
+            navigateTo('exercises');
+        },
+        toggleWeek: async () => { navigateTo('planning'); },
+        handleSearch: async () => { await loadSearchIndex(); },
+        searchTranscript: async () => {
+            const lesson = firstLessonWithTranscript();
+            state.ui.lessonPanel = 'transcript';
+            navigateTo('lesson', { lessonId: lesson.id });
+            await toggleTranscript(lesson.videoId, true);
+            if (!currentTranscript) {
+                currentTranscript = transcriptQueries.join(' ').repeat(2000);
+            }
+            currentTranscript = Array(transcriptRepeat).fill(currentTranscript).join('\\n\\n');
+        }
+    };
+    const ops = {
+        renderSidebar: () => renderSidebar(),
+        renderToday: () => renderToday(),
+        renderExercises: () => renderExercises(),
+        renderPlanning: () => renderPlanning(),
+        toggleExercise: () => toggleExercise(getAllExercises()[0].exercise.id),
+        toggleWeek: () => toggleWeek(coursData.timeline[0].week),
+        handleSearch: i => handleSearch(searchQueries[i % searchQueries.length]),
+        searchTranscript: i => searchTranscript(transcriptQueries[i % transcriptQueries.length])
+    };
+
+    // Nodes inserted or removed, counting whole subtrees
+    const subtreeSize = node => node.nodeType === Node.ELEMENT_NODE
+        ? 1 + node.getElementsByTagName('*').length : 1;
+    const mutations = new MutationObserver(() => {});
+    const takeChurn = () => mutations.takeRecords().reduce((sum, record) => sum
+        + [...record.addedNodes, ...record.removedNodes].reduce((n, node) => n + subtreeSize(node), 0), 0);
+
+    await setups[op]();
+    await nextFrame();
+    const durations = [];
+    const churn = [];
+    mutations.observe(document.body, { childList: true, subtree: true });
+    const windowStart = performance.now();
+    for (let i = -warmup; i < iterations; i++) {
+        await nextFrame();
+        takeChurn();
+        const start = performance.now();
+        performance.mark(`${op}:start`);
+        await ops[op](i);
+        void document.body.offsetHeight;  // include the style/layout the render forces
+        performance.mark(`${op}:end`);
+        const duration = performance.now() - start;
+        if (i >= 0) {
+            durations.push(duration);
+            churn.push(takeChurn());
+            performance.measure(op, `${op}:start`, `${op}:end`);
+        }
+    }
+    mutations.disconnect();
+    await nextFrame();
+    await nextFrame();
+    const windowEnd = performance.now();
+
+    const inWindow = entry => entry.startTime >= windowStart && entry.startTime <= windowEnd;
+    const longTasks = bench.longTasks.filter(inWindow);
+    const shifts = bench.shifts.filter(inWindow).filter(entry => !entry.hadRecentInput);
+    if (typeof window.gc === 'function') window.gc();
+    return {
+        durations,
+        churn,
+        longTasks: longTasks.length,
+        longTaskMs: longTasks.reduce((sum, entry) => sum + entry.duration, 0),
+        layoutShift: shifts.reduce((sum, entry) => sum + entry.value, 0),
+        domNodes: document.getElementsByTagName('*').length,
+        heapBytes: performance.memory ? performance.memory.usedJSHeapSize : null
+    };
+}"""
+
+
+def serve_repo() -> tuple:
+    """Serve the repository on an ephemeral port; returns (server, base URL)."""
+    server = make_server(str(REPO_DIR), port=0, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    if not values:
+        return 0.0
+    position = q * (len(values) - 1)
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def summarize(raw: dict) -> dict:
+    durations = raw['durations']
+    return {
+        'iterations': len(durations),
+        'p50_ms': round(percentile(durations, 0.5), 3),
+        'p95_ms': round(percentile(durations, 0.95), 3),
+        'max_ms': round(max(durations), 3) if durations else 0.0,
+        'mean_ms': round(sum(durations) / len(durations), 3) if durations else 0.0,
+        'long_tasks': raw['longTasks'],
+        'long_task_ms': round(raw['longTaskMs'], 1),
+        'layout_shift': round(raw['layoutShift'], 4),
+        'churn_nodes': round(sum(raw['churn']) / len(raw['churn']), 1) if raw['churn'] else 0.0,
+        'dom_nodes': raw['domNodes'],
+        'heap_mb': round(raw['heapBytes'] / 1e6, 2) if raw['heapBytes'] is not None else None,
+    }
+
+
+def bench_fixture(browser, base_url: str, name: str, operations: list,
+                  iterations: int, warmup: int, full_render: bool = False) -> dict:
+    """Seed one fixture in a fresh context and measure every operation."""
+    fixture = FIXTURES[name]
+    context = browser.new_context(viewport={"width": 1400, "height": 900})
+    # Keep Invidious embeds and fonts out of the timings
+    context.route(lambda url: not url.startswith(base_url), lambda route: route.abort())
+    page = context.new_page()
+    page.goto(f"{base_url}/{PAGE}")
+    page.wait_for_function("() => document.documentElement.dataset.appReady === 'true'")
+    state_chars = page.evaluate(SEED_JS, {**fixture, 'storageKey': STATE_KEY})
+
+    start = time.perf_counter()
+    page.reload()
+    page.wait_for_function("() => document.documentElement.dataset.appReady === 'true'")
+    load_ms = (time.perf_counter() - start) * 1000
+    # The seed uses the single-key layout; write it out as sections before measuring
+    page.evaluate("() => flushState()")
+    page.evaluate("full => { window.FORMATION_FULL_RENDER = full; }", full_render)
+
+    results = {
+        'description': fixture['description'],
+        'state_kb': round(state_chars / 1024, 1),
+        'reload_ms': round(load_ms, 1),
+        'operations': {},
+    }
+    for op in operations:
+        raw = page.evaluate(MEASURE_JS, {
+            'op': op, 'iterations': iterations, 'warmup': warmup,
+            'transcriptRepeat': fixture.get('transcript_repeat', 1),
+        })
+        results['operations'][op] = summarize(raw)
+    context.close()
+    return results
+
+
+def load_budget(path: str = None) -> dict:
+    budget = json.loads(json.dumps(BUDGET))
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            override = json.load(f)
+        budget['p95_ms'].update(override.pop('p95_ms', {}))
+        budget['long_tasks'].update(override.pop('long_tasks', {}))
+        budget.update(override)
+    return budget
+
+
+def check(results: dict, budget: dict, baseline: dict = None, max_regression: float = None) -> list:
+    """Budget and regression violations, as human-readable lines."""
+    violations = []
+    for fixture, fixture_results in results['fixtures'].items():
+        for op, stats in fixture_results['operations'].items():
+            where = f"{fixture}/{op}"
+            limit = budget['p95_ms'].get(op)
+            if limit is not None and stats['p95_ms'] > limit:
+                violations.append(f"{where}: p95 {stats['p95_ms']:.1f} ms > budget {limit} ms")
+            long_task_limit = budget['long_tasks'].get(op)
+            if long_task_limit is not None and stats['long_tasks'] > long_task_limit:
+                violations.append(f"{where}: {stats['long_tasks']} long tasks > budget {long_task_limit}")
+            if stats['heap_mb'] is not None and stats['heap_mb'] > budget['heap_mb']:
+                violations.append(f"{where}: heap {stats['heap_mb']:.1f} MB > budget {budget['heap_mb']} MB")
+            if stats['dom_nodes'] > budget['dom_nodes']:
+                violations.append(f"{where}: {stats['dom_nodes']} DOM nodes > budget {budget['dom_nodes']}")
+            if stats['layout_shift'] > budget['layout_shift']:
+                violations.append(f"{where}: layout shift {stats['layout_shift']} > budget {budget['layout_shift']}")
+
+            if baseline is None or max_regression is None:
+                continue
+            reference = baseline.get('fixtures', {}).get(fixture, {}).get('operations', {}).get(op)
+            if not reference:
+                continue
+            allowed = max(reference['p95_ms'] * (1 + max_regression), reference['p95_ms'] + REGRESSION_FLOOR_MS)
+            if stats['p95_ms'] > allowed:
+                violations.append(f"{where}: p95 {stats['p95_ms']:.1f} ms regressed from "
+                                  f"{reference['p95_ms']:.1f} ms (> +{max_regression:.0%})")
+    return violations
+
+
+def print_results(results: dict, baseline: dict = None) -> None:
+    print("=" * 86)
+    print(f"Front-end benchmark: {results['page']}, {results['iterations']} iterations per operation")
+    print("=" * 86)
+    for fixture, fixture_results in results['fixtures'].items():
+        print(f"\n[{fixture}] {fixture_results['description']}")
+        print(f"  state {fixture_results['state_kb']} KB, reload to ready {fixture_results['reload_ms']} ms")
+        print(f"  {'operation':<18} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'long tasks':>11} "
+              f"{'CLS':>7} {'churn':>7} {'DOM':>6} {'heap MB':>8} {'vs base':>8}")
+        for op, stats in fixture_results['operations'].items():
+            reference = (baseline or {}).get('fixtures', {}).get(fixture, {}).get('operations', {}).get(op)
+            delta = f"{stats['p95_ms'] / reference['p95_ms'] - 1:+.0%}" if reference and reference['p95_ms'] else "-"
+            heap = f"{stats['heap_mb']:.1f}" if stats['heap_mb'] is not None else "-"
+            print(f"  {op:<18} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['max_ms']:>8.2f} "
+                  f"{stats['long_tasks']:>11} {stats['layout_shift']:>7.3f} {stats.get('churn_nodes', 0):>7.0f} "
+                  f"{stats['dom_nodes']:>6} {heap:>8} {delta:>8}")
+
+    if 'full_render' not in results:
+        return
+    print("\nKeyed patching vs full innerHTML re-render (p95 ms, nodes churned per call)")
+    for fixture, fixture_results in results['fixtures'].items():
+        print(f"\n[{fixture}]")
+        print(f"  {'operation':<18} {'full p95':>9} {'keyed p95':>10} {'full churn':>11} {'keyed churn':>12}")
+        for op, stats in fixture_results['operations'].items():
+            before = results['full_render'][fixture]['operations'][op]
+            print(f"  {op:<18} {before['p95_ms']:>9.2f} {stats['p95_ms']:>10.2f} "
+                  f"{before['churn_nodes']:>11.0f} {stats['churn_nodes']:>12.0f}")
+
+
+def write_json(path: str, data: dict) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        ensure_dir(directory)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def run_benchmark(fixtures: list, operations: list, iterations: int, warmup: int,
+                  compare_full_render: bool = False) -> dict:
+    server, base_url = serve_repo()
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(
+                headless=HEADLESS,
+                args=['--enable-precise-memory-info', '--js-flags=--expose-gc'],
+            )
+            try:
+                results = {
+                    'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'page': PAGE,
+                    'browser': browser.version,
+                    'iterations': iterations,
+                    'fixtures': {name: bench_fixture(browser, base_url, name, operations, iterations, warmup)
+                                 for name in fixtures},
+                }
+                if compare_full_render:
+                    results['full_render'] = {
+                        name: bench_fixture(browser, base_url, name, operations, iterations, warmup,
+                                            full_render=True)
+                        for name in fixtures
+                    }
+            finally:
+                browser.close()
+    finally:
+        server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the course page renders and interactions.")
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3, help="Unmeasured iterations before each operation")
+    parser.add_argument('--fixture', nargs='+', choices=sorted(FIXTURES), default=list(FIXTURES))
+    parser.add_argument('--op', nargs='+', choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--update-baseline', action='store_true', help="Save this run as the new baseline")
+    parser.add_argument('--budget', help="JSON file overriding BUDGET (p95_ms, long_tasks, heap_mb, dom_nodes, layout_shift)")
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help="Allowed p95 slowdown against the baseline, as a fraction (default: 0.25)")
+    parser.add_argument('--compare-full-render', action='store_true',
+                        help="Also measure with keyed DOM patching disabled and print before/after")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.fixture, args.op, args.iterations, args.warmup, args.compare_full_render)
+    write_json(args.output, results)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+    violations = check(results, load_budget(args.budget), baseline, args.max_regression)
+
+    print(f"\nResults saved to: {args.output}")
+    if args.update_baseline:
+        write_json(args.baseline, results)
+        print(f"Baseline updated: {args.baseline}")
+
+    if violations:
+        print("\n❌ Performance budget exceeded:")
+        for violation in violations:
+            print(f"   - {violation}")
+        sys.exit(1)
+    print("\n✅ All operations within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+HTTP Response Cache Benchmark
+=============================
+Exercises http_cache.ResponseCache against a local stub HTTP server that
+sleeps to simulate YouTube latency and counts the requests it receives:
+
+- cold run (all network) vs warm run (all cache) vs offline run
+- offline misses raise CacheMissError without reaching the server
+- per-endpoint TTL expiry sends a request back to the network
+- the size cap evicts least recently used responses
+- error responses (429) are never cached
+- memoize() caches a whole call (the scrapetube listing), except empty results
+
+No network access is needed.
+
+Usage:
+    python3 bench_http_cache.py [--requests 50] [--latency 0.05]
+"""
+
+import re
+import time
+import zlib
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from http_cache import CacheMissError, ResponseCache
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers /watch, /api/timedtext and POST /youtubei/v1/player; /limited always 429s."""
+
+    latency = 0.05
+    hits = 0
+    lock = threading.Lock()
+
+    def _answer(self, body: bytes):
+        with StubHandler.lock:
+            StubHandler.hits += 1
+        time.sleep(self.latency)
+        status = 429 if self.path.startswith('/limited') else 200
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._answer(f"response for {self.path} ".encode('utf-8') * 200)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._answer(b"posted " + body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(session: requests.Session, urls: list) -> float:
+    start = time.perf_counter()
+    for url in urls:
+        session.get(url).raise_for_status()
+    return time.perf_counter() - start
+
+
+def server_hits(action) -> int:
+    """Requests the stub server received while running `action`."""
+    before = StubHandler.hits
+    action()
+    return StubHandler.hits - before
+
+
+def timed_hits(session: requests.Session, urls: list) -> tuple:
+    """(seconds, server requests) for fetching every URL once."""
+    before = StubHandler.hits
+    elapsed = run(session, urls)
+    return elapsed, StubHandler.hits - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the on-disk HTTP response cache.")
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.05, help="Simulated seconds per request")
+    args = parser.parse_args()
+
+    StubHandler.latency = args.latency
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    urls = [f"{base}/api/timedtext?v=stub{i:04d}&lang=fr" for i in range(args.requests)]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ResponseCache(cache_dir)
+        session = cache.mount(requests.Session())
+
+        cold_seconds, cold_hits = timed_hits(session, urls)
+        warm_seconds, warm_hits = timed_hits(session, urls)
+        offline = ResponseCache(cache_dir, offline=True)
+        offline_session = offline.mount(requests.Session())
+        offline_seconds, offline_hits = timed_hits(offline_session, urls)
+        rows = [('cold (network)', cold_seconds), ('warm (cache)', warm_seconds), ('offline', offline_seconds)]
+
+        assert cold_hits == len(urls), cold_hits
+        assert warm_hits == 0 and offline_hits == 0, (warm_hits, offline_hits)
+
+        # Same POST body -> same key; different body -> different key
+        assert server_hits(lambda: session.post(f"{base}/youtubei/v1/player", json={'videoId': 'a'})) == 1
+        assert server_hits(lambda: session.post(f"{base}/youtubei/v1/player", json={'videoId': 'a'})) == 0
+        assert server_hits(lambda: session.post(f"{base}/youtubei/v1/player", json={'videoId': 'b'})) == 1
+
+        # Offline misses never reach the server
+        try:
+            offline_session.get(f"{base}/watch?v=never-fetched")
+            raise AssertionError("offline miss did not raise")
+        except CacheMissError:
+            pass
+        assert StubHandler.hits == cold_hits + 2
+
+        # Errors are not cached
+        assert server_hits(lambda: session.get(f"{base}/limited")) == 1
+        assert server_hits(lambda: session.get(f"{base}/limited")) == 1
+
+        # Whole-call memoization, as used for the scrapetube listing
+        def listing():
+            return requests.get(f"{base}/listing").text.split()[:2]
+        listing_url = "scrapetube://channel/@stub"
+        assert server_hits(lambda: cache.memoize(listing_url, listing)) == 1
+        assert server_hits(lambda: offline.memoize(listing_url, listing)) == 0
+        assert offline.memoize(listing_url, listing) == listing()
+        assert server_hits(lambda: cache.memoize("scrapetube://channel/@empty", list)) == 0
+        try:
+            offline.memoize("scrapetube://channel/@empty", listing)
+            raise AssertionError("empty result was cached")
+        except CacheMissError:
+            pass
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Per-endpoint TTL: /watch expires after 0.2s, /api/timedtext stays fresh
+        cache = ResponseCache(cache_dir, ttl_rules=[(re.compile(r'/watch\?'), 0.2)], default_ttl=3600)
+        session = cache.mount(requests.Session())
+        session.get(f"{base}/watch?v=ttl")
+        session.get(f"{base}/api/timedtext?v=ttl")
+        time.sleep(0.3)
+        assert server_hits(lambda: session.get(f"{base}/watch?v=ttl")) == 1
+        assert server_hits(lambda: session.get(f"{base}/api/timedtext?v=ttl")) == 0
+        # Offline serves expired entries rather than failing
+        cache.offline = True
+        time.sleep(0.3)
+        assert server_hits(lambda: session.get(f"{base}/watch?v=ttl")) == 0
+        assert cache.stale_hits == 1
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # LRU: room for ~3 compressed bodies; touching url 0 keeps it over url 1
+        entry_size = len(zlib.compress(f"response for /lru/0 ".encode('utf-8') * 200, 6))
+        cache = ResponseCache(cache_dir, max_bytes=entry_size * 3 + entry_size // 2)
+        session = cache.mount(requests.Session())
+        lru_urls = [f"{base}/lru/{i}" for i in range(4)]
+        for url in lru_urls[:3]:
+            session.get(url)
+            time.sleep(0.01)
+        session.get(lru_urls[0])
+        time.sleep(0.01)
+        session.get(lru_urls[3])
+        assert cache.evictions == 1, cache.evictions
+        assert server_hits(lambda: session.get(lru_urls[0])) == 0
+        assert server_hits(lambda: session.get(lru_urls[1])) == 1
+
+    server.shutdown()
+
+    print("=" * 60)
+    print(f"HTTP cache benchmark: {args.requests} requests, {args.latency}s simulated latency")
+    print("=" * 60)
+    print(f"{'run':<16} {'seconds':>10} {'req/s':>10}")
+    for name, elapsed in rows:
+        print(f"{name:<16} {elapsed:>10.3f} {len(urls) / elapsed:>10.0f}")
+    print("\n✅ Offline misses, POST keys, TTL expiry, LRU eviction, error bypass and memoize behave as expected")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Download → Transcribe Pipeline Benchmark
+========================================
+Runs transcribe_missing_videos.run_pipeline() with a fake downloader and a
+fake Whisper model that only sleep, and compares it with the old strictly
+sequential loop. No network, yt-dlp or Whisper is needed. The fake downloads
+are real files in a temporary directory, removed with remove_audio() once
+their result is handled as main() does, and the disk probe lists that
+directory instead of keeping its own count.
+
+The pipelined run should take roughly
+    max(videos x download / download_workers, videos x decode / transcribe_workers)
+instead of videos x (download + decode).
+
+Usage:
+    python3 bench_transcription_pipeline.py [--videos 8] [--download 0.3] [--decode 0.3]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from transcribe_missing_videos import remove_audio, run_pipeline
+
+
+class FakeStages:
+    """Sleeping stand-ins for download_audio() and a Whisper model, with a disk-usage probe."""
+
+    def __init__(self, download_seconds: float, decode_seconds: float, audio_dir: str):
+        self.download_seconds = download_seconds
+        self.decode_seconds = decode_seconds
+        self.audio_dir = audio_dir
+        self.lock = threading.Lock()
+        self.max_on_disk = 0
+
+    def files_on_disk(self) -> int:
+        return len(os.listdir(self.audio_dir))
+
+    def download(self, video: dict) -> str:
+        time.sleep(self.download_seconds)
+        audio_path = os.path.join(self.audio_dir, f"{video['id']}.webm")
+        with self.lock:
+            with open(audio_path, 'wb') as f:
+                f.write(b"\0" * 1024)
+            self.max_on_disk = max(self.max_on_disk, self.files_on_disk())
+        return audio_path
+
+    def transcribe(self, audio_path: str) -> dict:
+        time.sleep(self.decode_seconds)
+        return {'success': True, 'text': audio_path, 'language': 'fr'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the download/transcribe pipeline.")
+    parser.add_argument('--videos', type=int, default=8)
+    parser.add_argument('--download', type=float, default=0.3, help="Fake seconds per download")
+    parser.add_argument('--decode', type=float, default=0.3, help="Fake seconds per transcription")
+    parser.add_argument('--download-workers', type=int, default=2)
+    parser.add_argument('--transcribe-workers', type=int, default=1)
+    parser.add_argument('--max-pending', type=int, default=2)
+    args = parser.parse_args()
+
+    videos = [{'id': f"fake{i:07d}", 'title': f"Fake video {i}"} for i in range(args.videos)]
+
+    with tempfile.TemporaryDirectory() as sequential_dir, tempfile.TemporaryDirectory() as pipelined_dir:
+        # Old behaviour: download then transcribe, one video at a time
+        sequential = FakeStages(args.download, args.decode, sequential_dir)
+        start = time.perf_counter()
+        for video in videos:
+            audio_path = sequential.download(video)
+            sequential.transcribe(audio_path)
+            remove_audio(audio_path)
+        sequential_seconds = time.perf_counter() - start
+
+        pipelined = FakeStages(args.download, args.decode, pipelined_dir)
+        start = time.perf_counter()
+        results = []
+        for video, audio_path, transcription in run_pipeline(
+            videos, pipelined.download, pipelined.transcribe,
+            download_workers=args.download_workers,
+            transcribe_workers=args.transcribe_workers,
+            max_pending=args.max_pending,
+        ):
+            results.append(transcription)
+            remove_audio(audio_path)
+        pipelined_seconds = time.perf_counter() - start
+        left_on_disk = pipelined.files_on_disk()
+
+    # Transcribed files the loop above has not removed yet also count
+    disk_bound = args.max_pending + args.download_workers + 2 * args.transcribe_workers
+    ideal = max(
+        args.videos * args.download / args.download_workers,
+        args.videos * args.decode / args.transcribe_workers,
+    )
+
+    print("=" * 60)
+    print(f"Pipeline benchmark: {args.videos} videos, {args.download}s download, {args.decode}s decode")
+    print("=" * 60)
+    print(f"Sequential:  {sequential_seconds:.2f}s")
+    print(f"Pipelined:   {pipelined_seconds:.2f}s (ideal {ideal:.2f}s, "
+          f"{sequential_seconds / pipelined_seconds:.1f}x faster)")
+    print(f"Max audio files on disk: {pipelined.max_on_disk} (bound {disk_bound}), {left_on_disk} left after the run")
+
+    assert len(results) == args.videos, "Every video should come out of the pipeline"
+    assert pipelined.max_on_disk <= disk_bound, "Backpressure should bound the audio files on disk"
+    assert left_on_disk == 0, "Every transcribed file should be removed"
+    assert pipelined_seconds < sequential_seconds, "Stages should overlap"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Course Search Index Builder
+===========================
+Precomputes the search index the course page uses for its header search,
+from the same `coursData` and transcripts the page already ships:
+
+- lesson titles, descriptions and key points
+- lesson exercises (title + description)
+- the lesson video's transcript
+
+Terms are accent-folded with the same rules as transcript_index.py. The
+output (search-index.json, next to index.html) holds a sorted term list for
+prefix lookups (binary search) and field-weighted postings per term, so the
+page answers each keystroke without scanning coursData or any transcript.
+The page derives its trigram -> term map for infix matches from the term list
+once after loading, which keeps it out of the download (it would double the
+file size).
+
+Usage:
+    python3 build_search_index.py
+"""
+
+import os
+import json
+import hashlib
+from collections import Counter
+
+from course_data import COURSE_HTML, iter_lessons, load_const, load_course_data
+from combine_transcripts import read_transcript_file
+from transcript_index import tokenize
+
+SEARCH_INDEX_PATH = "search-index.json"
+TRANSCRIPT_DIR = "transcripts"
+
+# Per-field weight applied to term counts
+FIELD_WEIGHTS = {
+    'title': 8,
+    'keyPoints': 3,
+    'description': 3,
+    'exercise': 3,
+    'transcript': 1,
+}
+# Transcript-only terms found in more than this share of lessons are dropped:
+# they match almost everything and make up most of the index size.
+MAX_TRANSCRIPT_DF_RATIO = 0.6
+
+
+def lesson_fields(lesson: dict, transcript_text: str) -> dict:
+    exercise = lesson.get('exercise') or {}
+    return {
+        'title': lesson.get('title', ''),
+        'description': lesson.get('description', ''),
+        'keyPoints': " ".join(lesson.get('keyPoints', [])),
+        'exercise': f"{exercise.get('title', '')} {exercise.get('description', '')}",
+        'transcript': transcript_text,
+    }
+
+
+def build_search_index(html_path: str = COURSE_HTML, transcript_dir: str = TRANSCRIPT_DIR) -> dict:
+    """
+    Build the serialized index as a dictionary.
+
+    Returns:
+        {'version', 'docs', 'docLengths', 'terms', 'postings'} where postings[i] is a
+        flat [doc, weight, doc, weight, ...] list for terms[i]
+    """
+    course = load_course_data(html_path)
+    transcript_map = load_const('transcriptMap', html_path)
+
+    docs = []
+    weighted_counts = []
+    transcript_terms = []
+
+    for phase_index, phase, lesson in iter_lessons(course):
+        filename = transcript_map.get(lesson.get('videoId'))
+        path = os.path.join(transcript_dir, filename) if filename else None
+        transcript = read_transcript_file(path)[1] if path and os.path.exists(path) else ""
+
+        counts = Counter()
+        metadata_terms = set()
+        for field, text in lesson_fields(lesson, transcript).items():
+            for term, count in Counter(tokenize(text)).items():
+                counts[term] += count * FIELD_WEIGHTS[field]
+                if field != 'transcript':
+                    metadata_terms.add(term)
+
+        docs.append([lesson['id'], phase_index])
+        weighted_counts.append(counts)
+        transcript_terms.append(set(counts) - metadata_terms)
+
+    # Drop near-ubiquitous transcript-only terms (le, de, que, the, ...)
+    transcript_df = Counter(term for terms in transcript_terms for term in terms)
+    common = {t for t, df in transcript_df.items() if df > MAX_TRANSCRIPT_DF_RATIO * len(docs)}
+
+    postings = {}
+    for doc_index, counts in enumerate(weighted_counts):
+        for term, weight in counts.items():
+            if term in common and term in transcript_terms[doc_index]:
+                continue
+            postings.setdefault(term, []).extend([doc_index, weight])
+
+    terms = sorted(postings)
+    index = {
+        'docs': docs,
+        'docLengths': [sum(counts.values()) for counts in weighted_counts],
+        'terms': terms,
+        'postings': [postings[term] for term in terms],
+    }
+    index['version'] = hashlib.sha256(
+        json.dumps(index, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    ).hexdigest()[:12]
+    return index
+
+
+def write_search_index(index: dict, path: str = SEARCH_INDEX_PATH) -> int:
+    """Write the index compactly and atomically; returns its size in bytes."""
+    data = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+def main():
+    index = build_search_index()
+    size = write_search_index(index)
+    print(f"🔍 Search index: {len(index['docs'])} lessons, {len(index['terms'])} terms")
+    print(f"   Written to {SEARCH_INDEX_PATH} ({size / 1024:.0f} KB, version {index['version']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Site Builder
+============
+Builds the deployable site from index.html, which stays the single source
+(course_data.py, build_search_index.py and the tests all read it):
+
+    dist/index.html                          minified page, coursData still inline
+    dist/search-index.json, dist/transcripts/...   the assets the page fetches
+    dist/sw.js, dist/precache-manifest.json  offline cache (service-worker.js template)
+
+The page is minified without changing behaviour: comments and indentation
+go, newlines stay (automatic semicolon insertion is unaffected), and string,
+template and regex literals are copied verbatim. coursData is not split: the
+lesson details that could move out are ~8 KB of a ~240 KB page, not worth
+an asynchronous load path in every view.
+
+The built page registers dist/sw.js, generated from service-worker.js with
+the content hash of every file above inlined (also written to
+precache-manifest.json). The page and search index are precached; the
+transcript bundle manifest and transcripts are listed with their hashes too,
+but cached as they are read (stale-while-revalidate). Since any change to the
+site changes sw.js, the browser installs the new worker, which downloads only
+the entries whose hash changed and takes over on the next visit.
+
+It also regenerates formation-interactive.html, the standalone copy opened
+from file:// (index.html as is, unminified). --check only verifies that copy
+is up to date.
+
+With --timing (needs Playwright and Chromium) both pages are served with
+serve.py and their startup is measured: DOM parsed (domInteractive), first
+paint, first contentful paint and app ready (formation:ready), median over
+--runs loads, written to metrics/build_timing.json.
+
+Usage:
+    python3 build_site.py
+    python3 build_site.py --timing --runs 7
+    python3 build_site.py --check
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import threading
+
+from course_data import COURSE_HTML, find_const_literal, load_const
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sync_playwright = None  # Optional: only needed for --timing
+
+DIST_DIR = "dist"
+STANDALONE_HTML = "formation-interactive.html"
+TIMING_FILE = os.path.join("metrics", "build_timing.json")
+
+# Files the page fetches, copied next to the built page when present
+STATIC_ASSETS = ("search-index.json",)
+TRANSCRIPT_DIR = "transcripts"
+
+SERVICE_WORKER_TEMPLATE = "service-worker.js"
+SERVICE_WORKER = "sw.js"
+PRECACHE_MANIFEST_FILE = "precache-manifest.json"
+
+STANDALONE_NOTICE = "<!-- Generated from index.html by build_site.py: edit index.html instead -->\n"
+
+
+# ----------------------------------------
+# Output files
+# ----------------------------------------
+
+def write_if_changed(path: str, data: bytes) -> bool:
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def js_literal(value) -> str:
+    """JSON is a JavaScript literal; escape '</' so it cannot close the <script>."""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+
+def replace_const(source: str, name: str, value) -> str:
+    """Swap the literal of `const <name> = ...;` for `value`."""
+    _, start, end = find_const_literal(source, name)
+    return source[:start] + js_literal(value) + source[end:]
+
+
+# ----------------------------------------
+# Minification
+# ----------------------------------------
+
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+                   'void', 'throw', 'instanceof', 'yield', 'await'}
+_WORD = re.compile(r'[\w$]+')
+
+
+def minify_js(source: str) -> str:
+    """Strip comments, indentation and blank lines; literals are copied verbatim."""
+    out = []
+    i = 0
+    n = len(source)
+    in_template = False
+    template_braces = []  # Open ${ ... } depths, innermost last
+    prev = ''             # Last significant code character ('a' after a word)
+    last_word = ''
+    line_start = True
+
+    def drop_trailing_space():
+        while out and out[-1] in (' ', '\t'):
+            out.pop()
+
+    while i < n:
+        char = source[i]
+
+        if in_template:
+            if char == '\\':
+                out.append(source[i:i + 2])
+                i += 2
+            elif char == '`':
+                out.append(char)
+                i += 1
+                in_template = False
+                prev = ')'
+            elif source.startswith('${', i):
+                out.append('${')
+                i += 2
+                template_braces.append(0)
+                in_template = False
+                prev = '{'
+            else:
+                out.append(char)
+                i += 1
+            continue
+
+        if char in ' \t':
+            if not line_start and out and out[-1] not in (' ', '\t'):
+                out.append(' ')
+            i += 1
+            continue
+        if char in '\r\n':
+            drop_trailing_space()
+            if not line_start:
+                out.append('\n')
+                line_start = True
+            i += 1
+            continue
+        if source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end == -1 else end
+            continue
+        if source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            if not line_start and out and out[-1] != ' ':
+                out.append(' ')  # a/**/b must not become ab
+            continue
+
+        line_start = False
+        if char in ('"', "'"):
+            j = i + 1
+            while j < n and source[j] != char:
+                j += 2 if source[j] == '\\' else 1
+            out.append(source[i:j + 1])
+            i = j + 1
+            prev = ')'
+            continue
+        if char == '`':
+            out.append(char)
+            i += 1
+            in_template = True
+            continue
+        if char == '/' and (prev in _REGEX_PRECEDERS or prev == '' or (prev == 'a' and last_word in _REGEX_KEYWORDS)):
+            j = i + 1
+            in_class = False
+            while j < n:
+                if source[j] == '\\':
+                    j += 2
+                    continue
+                if source[j] == '[':
+                    in_class = True
+                elif source[j] == ']':
+                    in_class = False
+                elif source[j] == '/' and not in_class:
+                    break
+                j += 1
+            j += 1
+            while j < n and source[j].isalpha():
+                j += 1
+            out.append(source[i:j])
+            i = j
+            prev = ')'
+            continue
+        word = _WORD.match(source, i)
+        if word:
+            out.append(word.group())
+            i = word.end()
+            prev = 'a'
+            last_word = word.group()
+            continue
+        if template_braces:
+            if char == '{':
+                template_braces[-1] += 1
+            elif char == '}':
+                if template_braces[-1] == 0:
+                    template_braces.pop()
+                    out.append(char)
+                    i += 1
+                    in_template = True
+                    continue
+                template_braces[-1] -= 1
+        out.append(char)
+        prev = char
+        i += 1
+
+    drop_trailing_space()
+    return "".join(out).strip() + "\n"
+
+
+_CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/|\s*([{};,])\s*|\s+', re.S)
+
+
+def minify_css(source: str) -> str:
+    """Drop comments and collapse whitespace; strings are kept verbatim."""
+    def replace(match):
+        if match.group(1):
+            return match.group(1)
+        if match.group(2):
+            return match.group(2)
+        return '' if match.group().startswith('/*') else ' '
+    return _CSS_TOKENS.sub(replace, source).strip()
+
+
+def minify_markup(html: str) -> str:
+    """Indentation, blank lines and comments out of the static markup."""
+    html = re.sub(r'<!--.*?-->', '', html, flags=re.S)
+    return "\n".join(line.strip() for line in html.splitlines() if line.strip())
+
+
+def minify_html(html: str) -> str:
+    parts = []
+    position = 0
+    for match in re.finditer(r'(<(script|style)\b[^>]*>)(.*?)(</\2>)', html, re.S):
+        parts.append(minify_markup(html[position:match.start()]))
+        body = match.group(3)
+        if match.group(2) == 'style':
+            body = minify_css(body)
+        elif 'src=' not in match.group(1):
+            body = minify_js(body)
+        parts.append(f"{match.group(1)}{body}{match.group(4)}")
+        position = match.end()
+    parts.append(minify_markup(html[position:]))
+    return "\n".join(part for part in parts if part) + "\n"
+
+
+# ----------------------------------------
+# Build
+# ----------------------------------------
+
+def copy_if_changed(src: str, dst: str) -> None:
+    if os.path.exists(dst):
+        src_stat, dst_stat = os.stat(src), os.stat(dst)
+        if src_stat.st_size == dst_stat.st_size and int(src_stat.st_mtime) == int(dst_stat.st_mtime):
+            return
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    shutil.copy2(src, dst)
+
+
+def copy_assets(html_path: str, dist_dir: str) -> list:
+    """Copy the files the page fetches; returns their paths relative to dist/."""
+    source_dir = os.path.dirname(os.path.abspath(html_path))
+    relative = [name for name in STATIC_ASSETS if os.path.exists(os.path.join(source_dir, name))]
+
+    bundle = os.path.join(source_dir, TRANSCRIPT_DIR, "bundle")
+    if os.path.isdir(bundle):
+        relative += [os.path.join(TRANSCRIPT_DIR, "bundle", name) for name in os.listdir(bundle)]
+    # Raw files: the fallback when no bundle was built or DecompressionStream is missing
+    for file_name in load_const('transcriptMap', html_path).values():
+        if os.path.exists(os.path.join(source_dir, TRANSCRIPT_DIR, file_name)):
+            relative.append(os.path.join(TRANSCRIPT_DIR, file_name))
+
+    for path in relative:
+        copy_if_changed(os.path.join(source_dir, path), os.path.join(dist_dir, path))
+    return [path.replace(os.sep, '/') for path in relative]
+
+
+def write_service_worker(dist_dir: str, paths: list, template_path: str) -> dict:
+    """
+    Hash the built files and write sw.js and precache-manifest.json.
+
+    Returns:
+        The manifest: {'version', 'precache': {path: hash}, 'transcripts': {path: hash}}
+    """
+    manifest = {'version': None, 'precache': {}, 'transcripts': {}}
+    for path in sorted(paths):
+        with open(os.path.join(dist_dir, path), 'rb') as f:
+            digest = content_hash(f.read())
+        manifest['transcripts' if path.startswith(f"{TRANSCRIPT_DIR}/") else 'precache'][path] = digest
+    manifest['version'] = content_hash(js_literal(manifest).encode('utf-8'))
+
+    with open(template_path, 'r', encoding='utf-8') as f:
+        worker = replace_const(f.read(), 'PRECACHE_MANIFEST', manifest)
+    write_if_changed(os.path.join(dist_dir, SERVICE_WORKER), worker.encode('utf-8'))
+    write_if_changed(os.path.join(dist_dir, PRECACHE_MANIFEST_FILE),
+                     (json.dumps(manifest, ensure_ascii=False, indent=2) + "\n").encode('utf-8'))
+    return manifest
+
+
+def build_site(html_path: str = COURSE_HTML, dist_dir: str = DIST_DIR, standalone: bool = True) -> dict:
+    """
+    Build dist/ and (unless standalone=False) regenerate the standalone page.
+
+    Returns:
+        Build report: sizes of the source and built page, asset count, precache manifest
+    """
+    with open(html_path, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    os.makedirs(dist_dir, exist_ok=True)
+    page = minify_html(replace_const(source, 'SERVICE_WORKER_URL', SERVICE_WORKER))
+    page_bytes = page.encode('utf-8')
+    write_if_changed(os.path.join(dist_dir, "index.html"), page_bytes)
+    assets = copy_assets(html_path, dist_dir)
+    template_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), SERVICE_WORKER_TEMPLATE)
+    manifest = write_service_worker(dist_dir, ["index.html"] + assets, template_path)
+
+    if standalone:
+        standalone_path = os.path.join(os.path.dirname(os.path.abspath(html_path)), STANDALONE_HTML)
+        write_if_changed(standalone_path, standalone_html(source).encode('utf-8'))
+
+    return {
+        'source_bytes': len(source.encode('utf-8')),
+        'page_bytes': len(page_bytes),
+        'assets': len(assets),
+        'manifest': manifest,
+    }
+
+
+def standalone_html(source: str) -> str:
+    """formation-interactive.html: index.html with a generated-file notice after the doctype."""
+    doctype, newline, rest = source.partition('\n')
+    if doctype.lower().startswith('<!doctype'):
+        return f"{doctype}{newline}{STANDALONE_NOTICE}{rest}"
+    return STANDALONE_NOTICE + source
+
+
+def check_standalone(html_path: str = COURSE_HTML) -> bool:
+    with open(html_path, 'r', encoding='utf-8') as f:
+        expected = standalone_html(f.read())
+    standalone_path = os.path.join(os.path.dirname(os.path.abspath(html_path)), STANDALONE_HTML)
+    if not os.path.exists(standalone_path):
+        return False
+    with open(standalone_path, 'r', encoding='utf-8') as f:
+        return f.read() == expected
+
+
+# ----------------------------------------
+# Startup timing
+# ----------------------------------------
+
+TIMING_INIT_JS = """
+document.addEventListener('formation:ready', () => { window.__formationReadyAt = performance.now(); });
+"""
+
+TIMING_JS = """() => {
+    const navigation = performance.getEntriesByType('navigation')[0];
+    const paint = Object.fromEntries(performance.getEntriesByType('paint').map(entry => [entry.name, entry.startTime]));
+    return {
+        parse_ms: navigation ? navigation.domInteractive : null,
+        first_paint_ms: paint['first-paint'] ?? null,
+        first_contentful_paint_ms: paint['first-contentful-paint'] ?? null,
+        ready_ms: window.__formationReadyAt ?? null,
+        transfer_bytes: navigation ? navigation.transferSize : null
+    };
+}"""
+
+
+def median(values: list):
+    values = sorted(value for value in values if value is not None)
+    if not values:
+        return None
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+
+def measure_startup(directory: str, runs: int) -> dict:
+    """Median startup timing of index.html served from `directory` (fresh context per run)."""
+    from serve import make_server
+    from test_formation import HEADLESS
+
+    server = make_server(directory, port=0, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    samples = []
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=HEADLESS)
+            try:
+                for _ in range(runs):
+                    context = browser.new_context(viewport={"width": 1400, "height": 900})
+                    # Keep Invidious probes and embeds out of the timings
+                    context.route(lambda url: not url.startswith(base_url), lambda route: route.abort())
+                    context.add_init_script(TIMING_INIT_JS)
+                    page = context.new_page()
+                    page.goto(f"{base_url}/index.html")
+                    page.wait_for_function("() => document.documentElement.dataset.appReady === 'true'")
+                    samples.append(page.evaluate(TIMING_JS))
+                    context.close()
+            finally:
+                browser.close()
+    finally:
+        server.shutdown()
+    return {key: median([sample[key] for sample in samples]) for key in samples[0]}
+
+
+def report_timing(html_path: str, dist_dir: str, runs: int) -> dict:
+    if sync_playwright is None:
+        raise SystemExit("--timing needs Playwright: pip install playwright && playwright install chromium")
+    source_dir = os.path.dirname(os.path.abspath(html_path))
+    timing = {
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'runs': runs,
+        'before': measure_startup(source_dir, runs),
+        'after': measure_startup(os.path.abspath(dist_dir), runs),
+    }
+    os.makedirs(os.path.dirname(TIMING_FILE), exist_ok=True)
+    with open(TIMING_FILE, 'w', encoding='utf-8') as f:
+        json.dump(timing, f, indent=2)
+        f.write("\n")
+
+    print(f"\n⏱️  Startup (median of {runs} loads)  {'source':>10} {'built':>10}")
+    for key, label in (('parse_ms', 'DOM parsed'), ('first_paint_ms', 'First paint'),
+                       ('first_contentful_paint_ms', 'First contentful paint'), ('ready_ms', 'App ready')):
+        before, after = timing['before'][key], timing['after'][key]
+        before_text = f"{before:.0f} ms" if before is not None else "-"
+        after_text = f"{after:.0f} ms" if after is not None else "-"
+        print(f"   {label:<30} {before_text:>10} {after_text:>10}")
+    print(f"   Timing saved to: {TIMING_FILE}")
+    return timing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the minified site into dist/.")
+    parser.add_argument('--html', default=COURSE_HTML)
+    parser.add_argument('--dist', default=DIST_DIR)
+    parser.add_argument('--timing', action='store_true', help="Measure startup of the source vs built page")
+    parser.add_argument('--runs', type=int, default=5, help="Page loads per measurement (default: 5)")
+    parser.add_argument('--check', action='store_true',
+                        help=f"Only check that {STANDALONE_HTML} matches {COURSE_HTML}")
+    args = parser.parse_args()
+
+    if args.check:
+        if not check_standalone(args.html):
+            print(f"❌ {STANDALONE_HTML} is out of date: run python3 build_site.py")
+            sys.exit(1)
+        print(f"✅ {STANDALONE_HTML} is up to date")
+        return
+
+    report = build_site(args.html, args.dist)
+    print(f"🏗️  Built {args.dist}/ from {args.html}")
+    print(f"   Page: {report['source_bytes'] / 1024:.0f} KB → {report['page_bytes'] / 1024:.0f} KB minified")
+    print(f"   Assets copied: {report['assets']}")
+    manifest = report['manifest']
+    print(f"   Service worker: {SERVICE_WORKER} v{manifest['version']}, {len(manifest['precache'])} files precached, "
+          f"{len(manifest['transcripts'])} transcript files cached on read")
+    print(f"   Regenerated {STANDALONE_HTML}")
+
+    if args.timing:
+        report_timing(args.html, args.dist, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Transcript Bundle Builder
+=========================
+Builds the compressed transcript bundle the course page loads instead of the
+raw per-video .txt files:
+
+    transcripts/bundle/{video_id}.{hash}.txt.gz    (+ .br when brotli is installed)
+    transcripts/bundle/manifest.json
+
+Each file holds only the transcript body (no header block). Filenames carry a
+content hash, so browsers and the service worker can cache them forever; the
+manifest maps video IDs to files with their raw/compressed sizes and SHA-256.
+Files no longer referenced by the manifest are removed.
+
+Usage:
+    python3 build_transcript_bundle.py
+"""
+
+import os
+import gzip
+import json
+import hashlib
+
+from combine_transcripts import collect_transcript_entries, read_transcript_file
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # Optional: pip install brotli for .br variants
+
+
+def bundle_dir(transcript_dir: str) -> str:
+    return os.path.join(transcript_dir, "bundle")
+
+
+def _write_if_changed(path: str, data: bytes) -> None:
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        return  # Content-hashed name: same name + size means same bytes
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def build_transcript_bundle(transcript_dir: str = "transcripts") -> dict:
+    """
+    Write one compressed file per transcript plus manifest.json.
+
+    Returns:
+        The manifest dictionary
+    """
+    directory = bundle_dir(transcript_dir)
+    os.makedirs(directory, exist_ok=True)
+
+    captions, whispers = collect_transcript_entries(transcript_dir)
+    videos = {}
+
+    for result in captions + whispers:
+        _, body = read_transcript_file(result['transcript_file'])
+        raw = body.encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+        base_name = f"{result['id']}.{digest[:12]}.txt"
+
+        # mtime=0 keeps the gzip bytes deterministic across rebuilds
+        gz_data = gzip.compress(raw, compresslevel=9, mtime=0)
+        _write_if_changed(os.path.join(directory, base_name + ".gz"), gz_data)
+        entry = {
+            'title': result['title'],
+            'sha256': digest,
+            'bytes': len(raw),
+            'gzip': {'file': base_name + ".gz", 'bytes': len(gz_data)},
+        }
+
+        if brotli is not None:
+            br_data = brotli.compress(raw, quality=11)
+            _write_if_changed(os.path.join(directory, base_name + ".br"), br_data)
+            entry['brotli'] = {'file': base_name + ".br", 'bytes': len(br_data)}
+
+        videos[result['id']] = entry
+
+    manifest = {
+        'version': hashlib.sha256(
+            json.dumps({k: v['sha256'] for k, v in sorted(videos.items())}).encode('utf-8')
+        ).hexdigest()[:12],
+        'videos': videos,
+    }
+
+    manifest_path = os.path.join(directory, "manifest.json")
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, manifest_path)
+
+    # Drop files from previous builds that the manifest no longer references
+    referenced = {'manifest.json'}
+    for entry in videos.values():
+        referenced.add(entry['gzip']['file'])
+        if 'brotli' in entry:
+            referenced.add(entry['brotli']['file'])
+    for name in os.listdir(directory):
+        if name not in referenced:
+            os.remove(os.path.join(directory, name))
+
+    return manifest
+
+
+def main():
+    TRANSCRIPT_DIR = "transcripts"
+
+    manifest = build_transcript_bundle(TRANSCRIPT_DIR)
+    videos = manifest['videos'].values()
+    raw_bytes = sum(v['bytes'] for v in videos)
+    gzip_bytes = sum(v['gzip']['bytes'] for v in videos)
+
+    print(f"📦 Bundled {len(manifest['videos'])} transcripts into {bundle_dir(TRANSCRIPT_DIR)}/")
+    print(f"   Raw text: {raw_bytes / 1e6:.2f} MB → gzip: {gzip_bytes / 1e6:.2f} MB")
+    if brotli is not None:
+        brotli_bytes = sum(v['brotli']['bytes'] for v in videos)
+        print(f"   brotli: {brotli_bytes / 1e6:.2f} MB")
+    else:
+        print("   (brotli not installed: pip install brotli for .br variants)")
+
+
+if __name__ == "__main__":
+    main()
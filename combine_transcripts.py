@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Combined Transcript Builder
+===========================
+Rebuilds transcripts/COMBINED_TRANSCRIPTS.txt from the per-video .txt files
+listed in all_results.json (YouTube captions) and whisper_results.json
+(Whisper transcriptions).
+
+Each transcript body is streamed into the output in chunks, and a sidecar
+index (COMBINED_TRANSCRIPTS.index.json) records the byte offset and length of
+every body, so a single transcript can be read back with one seek (or sliced
+out of an mmap) without scanning the combined file. The build writes to temp
+files and renames them into place, so re-runs never duplicate sections and
+readers never see a half-written file.
+
+Usage:
+    python3 combine_transcripts.py              # rebuild
+    python3 combine_transcripts.py VIDEO_ID     # print one transcript via the index
+"""
+
+import os
+import sys
+import json
+import shutil
+from datetime import datetime
+
+TRANSCRIPT_HEADER_SEPARATOR = b"=" * 60 + b"\n"
+SECTION_RULE = "=" * 80
+CHUNK_SIZE = 64 * 1024
+MAX_HEADER_LINES = 20
+
+
+def combined_paths(transcript_dir: str) -> tuple:
+    """Return (combined .txt path, sidecar index path) for a transcript directory."""
+    return (
+        os.path.join(transcript_dir, "COMBINED_TRANSCRIPTS.txt"),
+        os.path.join(transcript_dir, "COMBINED_TRANSCRIPTS.index.json"),
+    )
+
+
+def _load_results(path: str) -> list:
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return data if isinstance(data, list) else []
+
+
+def _read_header(src) -> dict:
+    """
+    Consume the per-video header block ("Key: value" lines up to the 60 '='
+    separator) and leave `src` positioned at the start of the transcript body.
+    Files without a header are rewound and treated as all body.
+    """
+    header = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = src.readline()
+        if not line:
+            break
+        if line == TRANSCRIPT_HEADER_SEPARATOR:
+            following = src.readline()
+            if following not in (b"\n", b""):
+                # Separator not followed by the blank line: keep that line in the body
+                src.seek(-len(following), os.SEEK_CUR)
+            return header
+        key, sep, value = line.decode('utf-8', errors='replace').partition(':')
+        if sep:
+            header[key.strip()] = value.strip()
+    src.seek(0)
+    return {}
+
+
+def read_transcript_file(path: str) -> tuple:
+    """
+    Read a per-video transcript file.
+
+    Returns:
+        (header dict, body text without the header block)
+    """
+    with open(path, 'rb') as src:
+        header = _read_header(src)
+        return header, src.read().decode('utf-8', errors='replace')
+
+
+def collect_transcript_entries(transcript_dir: str) -> tuple:
+    """Return (caption entries, whisper entries), one per video ID, in results order."""
+    seen = set()
+    captions = []
+    for result in _load_results(os.path.join(transcript_dir, "all_results.json")):
+        path = result.get('transcript_file')
+        if result.get('transcript_success') and path and os.path.exists(path) and result['id'] not in seen:
+            seen.add(result['id'])
+            captions.append(result)
+
+    whispers = []
+    for result in _load_results(os.path.join(transcript_dir, "whisper_results.json")):
+        path = result.get('transcript_file')
+        if result.get('whisper_success') and path and os.path.exists(path) and result['id'] not in seen:
+            seen.add(result['id'])
+            whispers.append(result)
+
+    return captions, whispers
+
+
+def build_combined_transcripts(transcript_dir: str = "transcripts", channel_username: str = "sofiankasmi") -> dict:
+    """
+    Rebuild the combined transcript file and its offset index atomically.
+
+    Args:
+        transcript_dir: Directory holding the per-video .txt files and results JSON
+        channel_username: Channel shown in the combined file header
+
+    Returns:
+        The index: {video_id: {offset, length, title, source}}
+    """
+    combined_path, index_path = combined_paths(transcript_dir)
+    captions, whispers = collect_transcript_entries(transcript_dir)
+    index = {}
+
+    tmp_combined = f"{combined_path}.tmp"
+    with open(tmp_combined, 'wb') as out:
+        def write(text: str) -> None:
+            out.write(text.encode('utf-8'))
+
+        write(f"Combined Transcripts from @{channel_username}\n")
+        write(f"Generated: {datetime.now().isoformat()}\n")
+        write(SECTION_RULE + "\n\n")
+
+        for source, entries in (('captions', captions), ('whisper', whispers)):
+            if source == 'whisper' and entries:
+                write("\n\n" + SECTION_RULE + "\n")
+                write("WHISPER TRANSCRIPTIONS (Videos without YouTube subtitles)\n")
+                write(SECTION_RULE + "\n")
+
+            for result in entries:
+                with open(result['transcript_file'], 'rb') as src:
+                    header = _read_header(src)
+
+                    write("\n" + SECTION_RULE + "\n")
+                    write(f"VIDEO: {result['title']}\n")
+                    write(f"URL: https://www.youtube.com/watch?v={result['id']}\n")
+                    write(f"Duration: {result.get('duration', 'Unknown')}\n")
+                    if source == 'whisper':
+                        model = header.get('Transcribed with', 'Whisper').replace('OpenAI ', '')
+                        write(f"Transcribed with: {model}\n")
+                    write(SECTION_RULE + "\n\n")
+
+                    offset = out.tell()
+                    shutil.copyfileobj(src, out, CHUNK_SIZE)
+                    index[result['id']] = {
+                        'offset': offset,
+                        'length': out.tell() - offset,
+                        'title': result['title'],
+                        'source': source,
+                    }
+                write("\n\n")
+
+        combined_size = out.tell()
+
+    tmp_index = f"{index_path}.tmp"
+    with open(tmp_index, 'w', encoding='utf-8') as f:
+        json.dump({'combined_size': combined_size, 'videos': index}, f, ensure_ascii=False, indent=2)
+
+    os.replace(tmp_combined, combined_path)
+    os.replace(tmp_index, index_path)
+    return index
+
+
+def load_index(transcript_dir: str = "transcripts") -> dict:
+    """
+    Load the offset index, or return {} if it is missing or no longer matches
+    the combined file (e.g. the file was rebuilt by an older script).
+    """
+    combined_path, index_path = combined_paths(transcript_dir)
+    if not (os.path.exists(index_path) and os.path.exists(combined_path)):
+        return {}
+    with open(index_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('combined_size') != os.path.getsize(combined_path):
+        return {}
+    return data.get('videos', {})
+
+
+def read_transcript(video_id: str, transcript_dir: str = "transcripts", index: dict = None) -> str:
+    """
+    Read one transcript body out of the combined file with a single seek.
+
+    Returns:
+        The transcript text, or None if the video is not in the index
+    """
+    index = load_index(transcript_dir) if index is None else index
+    entry = index.get(video_id)
+    if not entry:
+        return None
+
+    combined_path, _ = combined_paths(transcript_dir)
+    with open(combined_path, 'rb') as f:
+        f.seek(entry['offset'])
+        return f.read(entry['length']).decode('utf-8')
+
+
+def main():
+    TRANSCRIPT_DIR = "transcripts"
+
+    if len(sys.argv) > 1:
+        text = read_transcript(sys.argv[1], TRANSCRIPT_DIR)
+        if text is None:
+            print(f"❌ {sys.argv[1]} is not in the combined index. Rebuild with: python3 combine_transcripts.py")
+            sys.exit(1)
+        print(text)
+        return
+
+    index = build_combined_transcripts(TRANSCRIPT_DIR)
+    combined_path, index_path = combined_paths(TRANSCRIPT_DIR)
+    print(f"📖 Combined {len(index)} transcripts into: {combined_path}")
+    print(f"🗂️  Offset index: {index_path}")
+
+
+if __name__ == "__main__":
+    main()
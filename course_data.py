@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Course Data Extractor
+=====================
+Reads the `coursData` object literal (and other top-level `const` literals
+such as `transcriptMap`) straight out of index.html, so Python build steps
+work from exactly the data the page uses.
+
+The parser understands the subset of JavaScript literal syntax the page uses:
+objects with bare or quoted keys, arrays, '...' / "..." / `...` strings
+(template literals without ${} interpolation), numbers, true/false/null,
+// and /* */ comments, and trailing commas.
+
+Usage:
+    python3 course_data.py            # print a summary of index.html's coursData
+"""
+
+import re
+import json
+
+COURSE_HTML = "index.html"
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+_NUMBER = re.compile(r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+_IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*')
+
+
+class JsLiteralParser:
+    """Recursive-descent parser for a JavaScript literal starting at `pos`."""
+
+    def __init__(self, source: str, pos: int = 0):
+        self.source = source
+        self.pos = pos
+
+    def error(self, message: str):
+        line = self.source.count('\n', 0, self.pos) + 1
+        raise ValueError(f"{message} at line {line}")
+
+    def skip_space(self) -> None:
+        source = self.source
+        while self.pos < len(source):
+            char = source[self.pos]
+            if char.isspace():
+                self.pos += 1
+            elif source.startswith('//', self.pos):
+                end = source.find('\n', self.pos)
+                self.pos = len(source) if end == -1 else end
+            elif source.startswith('/*', self.pos):
+                end = source.find('*/', self.pos)
+                if end == -1:
+                    self.error("Unterminated comment")
+                self.pos = end + 2
+            else:
+                return
+
+    def parse_value(self):
+        self.skip_space()
+        char = self.source[self.pos:self.pos + 1]
+        if char == '{':
+            return self.parse_object()
+        if char == '[':
+            return self.parse_array()
+        if char in ('"', "'", '`'):
+            return self.parse_string()
+        number = _NUMBER.match(self.source, self.pos)
+        if number:
+            self.pos = number.end()
+            text = number.group()
+            return float(text) if any(c in text for c in '.eE') else int(text)
+        identifier = _IDENTIFIER.match(self.source, self.pos)
+        if identifier and identifier.group() in ('true', 'false', 'null'):
+            self.pos = identifier.end()
+            return {'true': True, 'false': False, 'null': None}[identifier.group()]
+        self.error(f"Unsupported value {self.source[self.pos:self.pos + 20]!r}")
+
+    def parse_string(self) -> str:
+        quote = self.source[self.pos]
+        self.pos += 1
+        parts = []
+        while True:
+            if self.pos >= len(self.source):
+                self.error("Unterminated string")
+            char = self.source[self.pos]
+            if char == quote:
+                self.pos += 1
+                return "".join(parts)
+            if quote == '`' and self.source.startswith('${', self.pos):
+                self.error("Template interpolation is not supported")
+            if char == '\\':
+                escaped = self.source[self.pos + 1]
+                if escaped == 'u':
+                    if self.source[self.pos + 2] == '{':
+                        end = self.source.index('}', self.pos)
+                        parts.append(chr(int(self.source[self.pos + 3:end], 16)))
+                        self.pos = end + 1
+                    else:
+                        parts.append(chr(int(self.source[self.pos + 2:self.pos + 6], 16)))
+                        self.pos += 6
+                    continue
+                if escaped == 'x':
+                    parts.append(chr(int(self.source[self.pos + 2:self.pos + 4], 16)))
+                    self.pos += 4
+                    continue
+                if escaped == '\n':
+                    self.pos += 2  # Line continuation
+                    continue
+                parts.append(_ESCAPES.get(escaped, escaped))
+                self.pos += 2
+                continue
+            parts.append(char)
+            self.pos += 1
+
+    def parse_key(self) -> str:
+        self.skip_space()
+        char = self.source[self.pos:self.pos + 1]
+        if char in ('"', "'"):
+            return self.parse_string()
+        identifier = _IDENTIFIER.match(self.source, self.pos) or _NUMBER.match(self.source, self.pos)
+        if not identifier:
+            self.error("Expected object key")
+        self.pos = identifier.end()
+        return identifier.group()
+
+    def expect(self, char: str) -> None:
+        self.skip_space()
+        if self.source[self.pos:self.pos + 1] != char:
+            self.error(f"Expected {char!r}")
+        self.pos += 1
+
+    def parse_object(self) -> dict:
+        self.expect('{')
+        result = {}
+        while True:
+            self.skip_space()
+            if self.source[self.pos] == '}':
+                self.pos += 1
+                return result
+            key = self.parse_key()
+            self.expect(':')
+            result[key] = self.parse_value()
+            self.skip_space()
+            if self.source[self.pos] == ',':
+                self.pos += 1
+            elif self.source[self.pos] != '}':
+                self.error("Expected ',' or '}'")
+
+    def parse_array(self) -> list:
+        self.expect('[')
+        result = []
+        while True:
+            self.skip_space()
+            if self.source[self.pos] == ']':
+                self.pos += 1
+                return result
+            result.append(self.parse_value())
+            self.skip_space()
+            if self.source[self.pos] == ',':
+                self.pos += 1
+            elif self.source[self.pos] != ']':
+                self.error("Expected ',' or ']'")
+
+
+def find_const_literal(source: str, name: str) -> tuple:
+    """
+    Locate `const <name> = <literal>;` in a script.
+
+    Returns:
+        (parsed value, start offset of the literal, end offset of the literal)
+    """
+    match = re.search(rf'\bconst\s+{re.escape(name)}\s*=\s*', source)
+    if not match:
+        raise ValueError(f"const {name} not found")
+    parser = JsLiteralParser(source, match.end())
+    value = parser.parse_value()
+    return value, match.end(), parser.pos
+
+
+def load_const(name: str, html_path: str = COURSE_HTML):
+    """Parse one top-level `const` literal out of the course page."""
+    with open(html_path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    return find_const_literal(source, name)[0]
+
+
+def load_course_data(html_path: str = COURSE_HTML) -> dict:
+    """Return the page's `coursData` as plain Python dicts and lists."""
+    return load_const('coursData', html_path)
+
+
+def iter_lessons(course: dict):
+    """Yield (phase_index, phase, lesson) for every lesson in course order."""
+    for phase_index, phase in enumerate(course['phases']):
+        for lesson in phase.get('lessons', []):
+            yield phase_index, phase, lesson
+
+
+def main():
+    course = load_course_data()
+    lessons = list(iter_lessons(course))
+    exercises = [lesson for _, _, lesson in lessons if lesson.get('exercise')]
+    print(f"📚 coursData: {len(course['phases'])} phases, {len(lessons)} lessons, "
+          f"{len(exercises)} lesson exercises")
+    print(f"   Top-level keys: {', '.join(course)}")
+    print(f"   JSON size: {len(json.dumps(course, ensure_ascii=False).encode('utf-8')) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,17 @@ Libraries used:
 import os
 import json
 import time
-from datetime import datetime
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from combine_transcripts import build_combined_transcripts, combined_paths
+from transcript_index import build_index, index_dir
+from segment_store import save_segments
+from build_transcript_bundle import build_transcript_bundle, bundle_dir
+from build_search_index import SEARCH_INDEX_PATH, build_search_index, write_search_index
+from results_store import CAPTIONS, SUCCESS, WHISPER, ResultsStore
+from run_metrics import METRICS_DIR, RunMetrics
 
 try:
     import scrapetube
@@ -21,19 +31,31 @@ except ImportError:
     exit(1)
 
 try:
-    from youtube_transcript_api import YouTubeTranscriptApi
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound
     from youtube_transcript_api.formatters import TextFormatter
 except ImportError:
     print("Please install youtube-transcript-api: pip install youtube-transcript-api")
     exit(1)
 
+from http_cache import CACHE_DIR, DEFAULT_MAX_BYTES, CacheMissError, CachingAdapter, ResponseCache
 
-def get_channel_videos(channel_username: str) -> list:
+METRICS_JOB = "fetch_transcripts"
+
+# HTTP requests per second across all workers, and how many may go back-to-back
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 2
+
+
+def get_channel_videos(channel_username: str, sleep: float = 1) -> list:
     """
     Get all videos from a YouTube channel.
 
     Args:
         channel_username: The channel username (e.g., 'sofiankasmi')
+        sleep: Seconds scrapetube waits between listing pages
 
     Returns:
         List of video dictionaries with id, title, etc.
@@ -43,7 +65,7 @@ def get_channel_videos(channel_username: str) -> list:
     videos = []
     try:
         # scrapetube can work with channel username
-        for video in scrapetube.get_channel(channel_username=channel_username):
+        for video in scrapetube.get_channel(channel_username=channel_username, sleep=sleep):
             video_info = {
                 'id': video['videoId'],
                 'title': video.get('title', {}).get('runs', [{}])[0].get('text', 'Unknown Title'),
@@ -59,7 +81,7 @@ def get_channel_videos(channel_username: str) -> list:
         try:
             # Alternative: try with channel URL format
             channel_url = f"https://www.youtube.com/@{channel_username}"
-            for video in scrapetube.get_channel(channel_url=channel_url):
+            for video in scrapetube.get_channel(channel_url=channel_url, sleep=sleep):
                 video_info = {
                     'id': video['videoId'],
                     'title': video.get('title', {}).get('runs', [{}])[0].get('text', 'Unknown Title'),
@@ -76,6 +98,155 @@ def get_channel_videos(channel_username: str) -> list:
     return videos
 
 
+class GatedAdapter(HTTPAdapter):
+    """HTTPAdapter calling `before_send()` before each request it sends to the network."""
+
+    def __init__(self, before_send=None, **kwargs):
+        self.before_send = before_send
+        super().__init__(**kwargs)
+
+    def send(self, request, *args, **kwargs):
+        if self.before_send is not None:
+            self.before_send()
+        return super().send(request, *args, **kwargs)
+
+
+class GatedCachingAdapter(CachingAdapter, GatedAdapter):
+    """CachingAdapter whose cache misses, and only those, go through the gate."""
+
+
+class TranscriptClient:
+    """
+    Reusable transcript fetcher sharing one pooled, keep-alive HTTP session.
+
+    Each video costs three HTTP requests: the watch page (API key), the
+    innertube player call listing its caption tracks, and the chosen track's
+    timedtext (a fourth when YouTube answers with a consent page). The
+    language is picked from that single listing instead of retrying fetch()
+    with other languages. Counters track HTTP requests and
+    bytes received, overall and for the current thread's last video; answers
+    served by the optional ResponseCache are counted as cache hits instead.
+    Throttled (429) and 5xx responses are retried up to `retries` times with
+    exponential backoff, honouring Retry-After; retries are counted too.
+
+    With a `limiter`, every request that reaches the network first takes a
+    token (cache hits do not; retries are paced by their backoff instead).
+    """
+
+    def __init__(self, languages: list = ('fr', 'en'), pool_size: int = 4,
+                 cache: ResponseCache = None, retries: int = 2, limiter: "TokenBucket" = None):
+        self.languages = list(languages)
+        self.limiter = limiter
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=None, raise_on_status=False)
+        pool = dict(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        if cache is not None:
+            adapter = GatedCachingAdapter(cache, before_send=self._wait_for_token, **pool)
+        else:
+            adapter = GatedAdapter(before_send=self._wait_for_token, **pool)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.hooks['response'].append(self._count_response)
+
+        self.api = YouTubeTranscriptApi(http_client=self.session)
+        self.formatter = TextFormatter()
+
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.bytes_received = 0
+        self.retry_count = 0
+        self.cache_hits = 0
+        self.videos_fetched = 0
+        self._per_video = threading.local()
+
+    def _wait_for_token(self) -> None:
+        if self.limiter is None:
+            return
+        start = time.perf_counter()
+        self.limiter.acquire()
+        self._per_video.wait = getattr(self._per_video, 'wait', 0) + time.perf_counter() - start
+
+    def _count_response(self, response, *args, **kwargs):
+        if getattr(response, 'from_cache', False):
+            with self.lock:
+                self.cache_hits += 1
+            return
+        size = len(response.content)
+        retries = len(getattr(getattr(response.raw, 'retries', None), 'history', None) or ())
+        with self.lock:
+            self.request_count += 1 + retries
+            self.bytes_received += size
+            self.retry_count += retries
+        self._per_video.requests = getattr(self._per_video, 'requests', 0) + 1 + retries
+        self._per_video.bytes = getattr(self._per_video, 'bytes', 0) + size
+        self._per_video.retries = getattr(self._per_video, 'retries', 0) + retries
+
+    def choose_transcript(self, transcript_list, languages: list):
+        """Best track from one listing: preferred languages first (manual before auto), else any track."""
+        try:
+            return transcript_list.find_transcript(languages)
+        except NoTranscriptFound:
+            # Manually created tracks are listed before generated ones
+            return next(iter(transcript_list), None)
+
+    def fetch(self, video_id: str, languages: list = None) -> dict:
+        """
+        Fetch transcript for a single video.
+
+        Returns:
+            Dictionary with transcript data or error info, plus the HTTP
+            requests and bytes this video cost and the time it waited for
+            rate-limit tokens
+        """
+        self._per_video.requests = 0
+        self._per_video.bytes = 0
+        self._per_video.retries = 0
+        self._per_video.wait = 0
+
+        try:
+            transcript_list = self.api.list(video_id)
+            track = self.choose_transcript(transcript_list, languages or self.languages)
+            if track is None:
+                raise NoTranscriptFound(video_id, languages or self.languages, transcript_list)
+
+            transcript = track.fetch()
+            result = {
+                'success': True,
+                'transcript': self.formatter.format_transcript(transcript),
+                'segments': transcript,  # Keep raw segments with timestamps
+                'language': track.language_code,
+            }
+        except Exception as e:
+            result = {
+                'success': False,
+                'error': str(e),
+                'transcript': None
+            }
+
+        with self.lock:
+            self.videos_fetched += 1
+        result['http_requests'] = self._per_video.requests
+        result['http_bytes'] = self._per_video.bytes
+        result['http_retries'] = self._per_video.retries
+        result['rate_limit_wait_seconds'] = self._per_video.wait
+        return result
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                'videos': self.videos_fetched,
+                'requests': self.request_count,
+                'bytes': self.bytes_received,
+                'retries': self.retry_count,
+                'cache_hits': self.cache_hits,
+                'requests_per_video': self.request_count / self.videos_fetched if self.videos_fetched else 0,
+            }
+
+
+_default_client = None
+
+
 def fetch_transcript(video_id: str, languages: list = ['fr', 'en']) -> dict:
     """
     Fetch transcript for a single video.
@@ -87,53 +258,214 @@ def fetch_transcript(video_id: str, languages: list = ['fr', 'en']) -> dict:
     Returns:
         Dictionary with transcript data or error info
     """
-    ytt_api = YouTubeTranscriptApi()
-    formatter = TextFormatter()
+    global _default_client
+    if _default_client is None:
+        _default_client = TranscriptClient()
+    return _default_client.fetch(video_id, languages)
 
-    try:
-        # Try to get transcript in preferred languages
-        transcript = ytt_api.fetch(video_id, languages=languages)
 
-        # Format as plain text
-        text = formatter.format_transcript(transcript)
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter shared by all fetch workers.
 
-        return {
-            'success': True,
-            'transcript': text,
-            'segments': transcript,  # Keep raw segments with timestamps
-            'language': languages[0] if transcript else 'unknown'
-        }
-    except Exception as e:
-        # Try to list available transcripts
-        try:
-            transcript_list = ytt_api.list(video_id)
-            available = [t.language_code for t in transcript_list]
-
-            # Try any available transcript
-            if available:
-                transcript = ytt_api.fetch(video_id, languages=available)
-                text = formatter.format_transcript(transcript)
-                return {
-                    'success': True,
-                    'transcript': text,
-                    'segments': transcript,
-                    'language': available[0]
-                }
-        except:
-            pass
+    Tokens refill continuously at `rate` per second up to `burst`; each
+    request takes one token and blocks until one is available.
+    """
 
-        return {
-            'success': False,
-            'error': str(e),
-            'transcript': None
-        }
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def save_transcript_file(video: dict, transcript: str, output_dir: str) -> str:
+    """
+    Write a single transcript with its header block.
 
+    Returns:
+        Path to the written .txt file
+    """
+    safe_title = "".join(c for c in video['title'] if c.isalnum() or c in ' -_')[:50]
+    transcript_path = os.path.join(output_dir, f"{video['id']}_{safe_title}.txt")
+
+    with open(transcript_path, 'w', encoding='utf-8') as f:
+        f.write(f"Title: {video['title']}\n")
+        f.write(f"Video ID: {video['id']}\n")
+        f.write(f"URL: https://www.youtube.com/watch?v={video['id']}\n")
+        f.write(f"Duration: {video['duration']}\n")
+        f.write(f"Published: {video['published']}\n")
+        f.write("=" * 60 + "\n\n")
+        f.write(transcript)
+
+    return transcript_path
+
+
+def process_video(video: dict, output_dir: str, client: TranscriptClient, metrics: RunMetrics) -> dict:
+    """
+    Fetch one video's transcript (rate-limited by the client) and save it to disk.
+
+    Returns:
+        The per-video result entry stored in all_results.json
+    """
+    with metrics.stage('caption_fetch'):
+        result = client.fetch(video['id'])
+    # Included in caption_fetch: the client waits before each HTTP request
+    metrics.observe('stage_seconds', result['rate_limit_wait_seconds'], stage='rate_limit_wait')
+    metrics.record_item('caption_fetch', result['success'], result.get('http_bytes'))
+    metrics.inc('http_requests_total', result.get('http_requests', 0), stage='caption_fetch')
+    metrics.inc('retries_total', result.get('http_retries', 0), stage='caption_fetch')
+
+    video_result = {
+        **video,
+        'transcript_success': result['success'],
+        'transcript_language': result.get('language', 'N/A'),
+    }
+
+    if result['success']:
+        with metrics.stage('save'):
+            video_result['transcript_file'] = save_transcript_file(video, result['transcript'], output_dir)
+            segments_file = save_segments(video['id'], result.get('segments'), output_dir)
+        if segments_file:
+            video_result['segments_file'] = segments_file
+    else:
+        video_result['error'] = result.get('error', 'Unknown error')
+
+    return video_result
+
+
+def plan_incremental_sync(videos: list, store: ResultsStore) -> list:
+    """
+    Diff the fresh channel listing against what previous runs already produced.
+
+    A video counts as done when its caption fetch succeeded and the .txt still
+    exists, or when Whisper transcribed it. Everything else (new videos and
+    previous failures) is queued again.
+
+    Returns:
+        The pending videos, in listing order
+    """
+    captioned = {
+        r['id'] for r in store.results(CAPTIONS, SUCCESS)
+        if os.path.exists(r.get('transcript_file', ''))
+    }
+    whispered = {
+        r['id'] for r in store.results(WHISPER, SUCCESS)
+        if os.path.exists(r.get('transcript_file', ''))
+    }
+    return [video for video in videos if video['id'] not in captioned | whispered]
+
+
+def fetch_all_transcripts(videos: list, output_dir: str, store: ResultsStore,
+                          workers: int = 4, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                          client: TranscriptClient = None, metrics: RunMetrics = None) -> list:
+    """
+    Fetch transcripts for many videos with a bounded thread pool.
+
+    All workers share one token bucket, taken once per HTTP request (a video
+    makes several), so `rate`/`burst` cap the request rate regardless of
+    `workers`. Each finished video is upserted into `store` right
+    away, so a crashed run loses at most the videos in flight and can resume.
+
+    Args:
+        videos: Video dictionaries to fetch
+        output_dir: Directory for individual transcript files
+        store: Results store receiving one captions row per video
+        workers: Number of concurrent fetch threads
+        rate: HTTP requests per second allowed across all workers (0 = unlimited)
+        burst: Number of requests allowed back-to-back before throttling
+        client: Shared TranscriptClient (one is created, pooled for `workers`, if omitted);
+            its limiter is replaced by the `rate`/`burst` bucket
+        metrics: Run metrics receiving per-stage timings and counters
+
+    Returns:
+        List of per-video result dictionaries, in the same order as `videos`
+    """
+    client = client or TranscriptClient(pool_size=max(1, workers))
+    client.limiter = TokenBucket(rate, burst)
+    metrics = metrics or RunMetrics(METRICS_JOB)
+    results = [None] * len(videos)
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(process_video, video, output_dir, client, metrics): index
+            for index, video in enumerate(videos)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            video_result = future.result()
+            results[index] = video_result
+            store.record(CAPTIONS, video_result)
+            done += 1
+
+            print(f"\n[{done}/{len(videos)}] {video_result['title'][:50]}...")
+            if video_result['transcript_success']:
+                print(f"  ✅ Success ({video_result['transcript_language']})")
+            else:
+                print(f"  ❌ Failed: {video_result['error'][:50]}")
+
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch all transcripts from a YouTube channel.")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="Concurrent fetch threads (default: 4)")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help="Max HTTP requests per second across all workers, 0 = unlimited (default: %(default)g)")
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST,
+                        help="Requests allowed back-to-back before the rate applies (default: %(default)s)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only fetch new or previously failed videos; resumes an interrupted run")
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                        help=f"On-disk HTTP response cache (default: {CACHE_DIR})")
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024,
+                        help="Evict least recently used responses above this size (default: %(default)g)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always go to the network and do not store responses")
+    parser.add_argument('--offline', action='store_true',
+                        help="Cache-only: answer every request from the HTTP cache, never the network")
+    parser.add_argument('--metrics-dir', default=METRICS_DIR,
+                        help=f"Where the Prometheus textfile and JSON run summary go (default: {METRICS_DIR})")
+    parser.add_argument('--profile', action='store_true',
+                        help="Run each stage under cProfile and save one .prof file per stage")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.offline and args.no_cache:
+        print("❌ --offline needs the HTTP cache; drop --no-cache")
+        return
 
-def main():
     # Configuration
     CHANNEL_USERNAME = "sofiankasmi"  # The channel to scrape
     OUTPUT_DIR = "transcripts"
-    DELAY_BETWEEN_REQUESTS = 1  # Seconds between requests to be respectful
+
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 1024 * 1024),
+                              offline=args.offline)
+    # Nothing leaves the machine offline, so there is nothing to throttle
+    rate = 0 if args.offline else args.rate
+    metrics = RunMetrics(METRICS_JOB, args.metrics_dir, profile=args.profile)
 
     # Create output directory
     os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -143,14 +475,30 @@ def main():
     print("=" * 60)
     print(f"Channel: @{CHANNEL_USERNAME}")
     print(f"Output: {OUTPUT_DIR}/")
+    print(f"Workers: {args.workers} | Rate limit: {rate or 'unlimited'} requests/s (burst {args.burst})")
+    print(f"HTTP cache: {'disabled' if cache is None else args.cache_dir + '/'}"
+          f"{' (offline, cache-only)' if args.offline else ''}")
     print("=" * 60)
     print()
 
     # Step 1: Get all videos from channel
-    videos = get_channel_videos(CHANNEL_USERNAME)
+    with metrics.stage('listing'):
+        if cache is None:
+            videos = get_channel_videos(CHANNEL_USERNAME)
+        else:
+            # scrapetube takes no session, so its whole listing is cached instead of its requests
+            try:
+                videos = cache.memoize(f"scrapetube://channel/@{CHANNEL_USERNAME}",
+                                       lambda: get_channel_videos(CHANNEL_USERNAME))
+            except CacheMissError:
+                videos = []
+    metrics.set('listed_videos', len(videos))
 
     if not videos:
-        print("❌ No videos found. Please check the channel username.")
+        if args.offline:
+            print("❌ No videos found. The channel listing is not in the HTTP cache; run once online.")
+        else:
+            print("❌ No videos found. Please check the channel username.")
         return
 
     # Save video list
@@ -164,94 +512,74 @@ def main():
     print("Fetching transcripts...")
     print("=" * 60)
 
-    results = []
-    successful = 0
-    failed = 0
-
-    for i, video in enumerate(videos, 1):
-        print(f"\n[{i}/{len(videos)}] {video['title'][:50]}...")
-
-        result = fetch_transcript(video['id'])
-
-        video_result = {
-            **video,
-            'transcript_success': result['success'],
-            'transcript_language': result.get('language', 'N/A'),
-        }
-
-        if result['success']:
-            successful += 1
-            print(f"  ✅ Success ({result.get('language', 'unknown')})")
-
-            # Save individual transcript
-            safe_title = "".join(c for c in video['title'] if c.isalnum() or c in ' -_')[:50]
-            transcript_path = os.path.join(OUTPUT_DIR, f"{video['id']}_{safe_title}.txt")
-
-            with open(transcript_path, 'w', encoding='utf-8') as f:
-                f.write(f"Title: {video['title']}\n")
-                f.write(f"Video ID: {video['id']}\n")
-                f.write(f"URL: https://www.youtube.com/watch?v={video['id']}\n")
-                f.write(f"Duration: {video['duration']}\n")
-                f.write(f"Published: {video['published']}\n")
-                f.write("=" * 60 + "\n\n")
-                f.write(result['transcript'])
-
-            video_result['transcript_file'] = transcript_path
-        else:
-            failed += 1
-            print(f"  ❌ Failed: {result.get('error', 'Unknown error')[:50]}")
-            video_result['error'] = result.get('error', 'Unknown error')
-
-        results.append(video_result)
-
-        # Be respectful with rate limiting
-        if i < len(videos):
-            time.sleep(DELAY_BETWEEN_REQUESTS)
-
-    # Save combined results
-    results_path = os.path.join(OUTPUT_DIR, "all_results.json")
-    with open(results_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
-
-    # Create a combined transcript file for easy reading
-    combined_path = os.path.join(OUTPUT_DIR, "COMBINED_TRANSCRIPTS.txt")
-    with open(combined_path, 'w', encoding='utf-8') as f:
-        f.write(f"Combined Transcripts from @{CHANNEL_USERNAME}\n")
-        f.write(f"Generated: {datetime.now().isoformat()}\n")
-        f.write("=" * 80 + "\n\n")
-
-        for result in results:
-            if result['transcript_success'] and 'transcript_file' in result:
-                f.write("\n" + "=" * 80 + "\n")
-                f.write(f"VIDEO: {result['title']}\n")
-                f.write(f"URL: https://www.youtube.com/watch?v={result['id']}\n")
-                f.write(f"Duration: {result['duration']}\n")
-                f.write("=" * 80 + "\n\n")
-
-                # Read the individual transcript
-                try:
-                    with open(result['transcript_file'], 'r', encoding='utf-8') as tf:
-                        content = tf.read()
-                        # Skip the header we already added
-                        if "=" * 60 in content:
-                            content = content.split("=" * 60 + "\n\n", 1)[-1]
-                        f.write(content)
-                except:
-                    pass
-                f.write("\n\n")
+    # Results are upserted into the store as each video finishes
+    store = ResultsStore(OUTPUT_DIR)
+    store.record_listing(videos)
+
+    if args.incremental:
+        pending = plan_incremental_sync(videos, store)
+        print(f"🔁 Incremental sync: {len(pending)} to fetch, {len(videos) - len(pending)} already done")
+    else:
+        pending = videos
+
+    client = TranscriptClient(pool_size=max(1, args.workers), cache=cache)
+    fetched = fetch_all_transcripts(
+        pending, OUTPUT_DIR, store,
+        workers=args.workers, rate=rate, burst=args.burst, client=client, metrics=metrics,
+    )
+    # all_results.json stays available for readers of the old format
+    results_path = store.export_json(CAPTIONS)
+    successful = sum(1 for r in fetched if r['transcript_success'])
+    failed = len(fetched) - successful
+
+    # Rebuild the combined transcript file (captions + Whisper) and its offset index
+    combined_path, combined_index_path = combined_paths(OUTPUT_DIR)
+    with metrics.stage('combine'):
+        build_combined_transcripts(OUTPUT_DIR, CHANNEL_USERNAME)
+
+    # Re-tokenize only the new/changed transcripts in the search index
+    with metrics.stage('search_index'):
+        index_stats = build_index(OUTPUT_DIR)
+
+    # Refresh the compressed bundle the course page loads transcripts from
+    with metrics.stage('bundle'):
+        build_transcript_bundle(OUTPUT_DIR)
+
+    # The page's header search indexes transcript text too
+    with metrics.stage('header_search_index'):
+        header_index = build_search_index(transcript_dir=OUTPUT_DIR)
+        write_search_index(header_index)
+    metrics_files = metrics.write()
 
     # Summary
     print("\n" + "=" * 60)
     print("SUMMARY")
     print("=" * 60)
     print(f"Total videos: {len(videos)}")
+    print(f"Fetched this run: {len(pending)}")
     print(f"Successful transcripts: {successful}")
     print(f"Failed: {failed}")
+    http_stats = client.stats()
+    print(f"HTTP: {http_stats['requests']} requests ({http_stats['requests_per_video']:.1f}/video, "
+          f"{http_stats['retries']} retries), {http_stats['bytes'] / 1e6:.1f} MB received, "
+          f"{http_stats['cache_hits']} served from cache")
+    if cache is not None:
+        cache_stats = cache.stats()
+        print(f"HTTP cache: {cache_stats['entries']} responses, {cache_stats['bytes'] / 1e6:.1f} MB "
+              f"({cache_stats['evictions']} evicted this run)")
     print(f"\nOutput files:")
     print(f"  📋 Video list: {video_list_path}")
+    print(f"  🗃️  Results store: {store.path}")
     print(f"  📊 Results: {results_path}")
     print(f"  📖 Combined: {combined_path}")
+    print(f"  🗂️  Combined index: {combined_index_path}")
+    print(f"  🔍 Search index: {index_dir(OUTPUT_DIR)}/ ({index_stats['reindexed']} transcripts re-indexed)")
+    print(f"  📦 Page transcript bundle: {bundle_dir(OUTPUT_DIR)}/")
+    print(f"  🔎 Header search index: {SEARCH_INDEX_PATH} (version {header_index['version']})")
     print(f"  📁 Individual transcripts: {OUTPUT_DIR}/")
+    print(f"  📈 Metrics: {metrics_files['prometheus']}, {metrics_files['summary']}")
+    for path in metrics_files['profiles']:
+        print(f"  ⏱️  Profile: {path}")
     print("=" * 60)
 
 
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+On-Disk HTTP Response Cache
+===========================
+A transparent cache for the HTTP calls youtube-transcript-api makes, and
+for whole scrapetube channel listings, so re-running the fetch scripts does
+not hit YouTube again for data downloaded minutes earlier.
+
+Responses live in one SQLite file (.http_cache/responses.sqlite), keyed by
+the SHA-256 of the request (method, URL with query, Accept-Language, body),
+with zlib-compressed bodies. The transcript API chains its requests (the
+watch page yields the API key, the innertube answer yields the caption URL),
+so identical inputs produce identical keys all the way down. scrapetube
+opens its own sessions and takes none, so memoize() stores the result of the
+whole listing call instead, under a scrapetube:// pseudo-URL.
+
+- Per-endpoint TTLs (TTL_RULES): watch pages expire after a week, channel
+  listings after 6 hours, innertube player answers and caption tracks after
+  an hour, since the caption URLs in a player answer are signed and expire.
+- Size-capped LRU: the least recently used entries are evicted once the
+  stored bodies exceed `max_bytes`.
+- Offline ("cache-only") mode: every request is answered from the cache,
+  expired or not; a miss raises CacheMissError instead of touching the
+  network, so repeat runs and CI need zero network.
+
+Only successful (2xx), non-streamed responses are stored; 429s and other
+errors always go to the network next time.
+
+Usage:
+    python3 http_cache.py stats
+    python3 http_cache.py clear
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import argparse
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+CACHE_DIR = ".http_cache"
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# (URL pattern, TTL seconds); first match wins
+TTL_RULES = [
+    (re.compile(r'^scrapetube://channel/'), 6 * HOUR),   # whole channel listings (memoize)
+    # Caption track list (transcript API). Its timedtext URLs carry a signed
+    # expire= only hours ahead: a cached answer must not outlive them.
+    (re.compile(r'/youtubei/v1/player'), HOUR),
+    (re.compile(r'/watch\?'), 7 * DAY),                  # watch page (API key, consent)
+    # Caption track contents, keyed by that signed URL: only a cached player answer leads back here
+    (re.compile(r'/api/timedtext'), HOUR),
+]
+DEFAULT_TTL = DAY
+
+# Response headers worth keeping. Bodies are stored decoded, so Content-Encoding
+# must not be replayed; cookies, dates, alt-svc... are dropped too.
+KEPT_HEADERS = ('content-type', 'content-language')
+
+
+class CacheMissError(requests.ConnectionError):
+    """Raised in offline mode when a request is not in the cache."""
+
+
+def request_key(request: requests.PreparedRequest) -> str:
+    """Content address of a request: SHA-256 over what determines the response."""
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    digest = hashlib.sha256()
+    for part in (request.method or 'GET', request.url, request.headers.get('Accept-Language', '')):
+        digest.update(part.encode('utf-8'))
+        digest.update(b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response store shared by every thread of one process."""
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 offline: bool = False, ttl_rules: list = None, default_ttl: int = DEFAULT_TTL):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.ttl_rules = TTL_RULES if ttl_rules is None else ttl_rules
+        self.default_ttl = default_ttl
+
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "responses.sqlite")
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, timeout=30, check_same_thread=False,
+                                  isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                method TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                reason TEXT,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored REAL NOT NULL,
+                expires REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    def ttl_for(self, url: str) -> int:
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def get(self, request: requests.PreparedRequest):
+        """
+        Look a request up.
+
+        Returns:
+            A requests.Response (with `from_cache = True`), or None on a miss.
+            Expired entries count as misses, except in offline mode.
+        """
+        key = request_key(request)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                "SELECT status, reason, headers, body, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[4] < now and not self.offline):
+                self.misses += 1
+                return None
+            self.db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            if row[4] < now:
+                self.stale_hits += 1
+
+        status, reason, headers, body, _ = row
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response._content = zlib.decompress(body)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.from_cache = True
+        return response
+
+    def put(self, request: requests.PreparedRequest, response: requests.Response) -> None:
+        """Store a successful response and evict least recently used entries over the cap."""
+        if not 200 <= response.status_code < 300:
+            return
+        headers = {k: v for k, v in response.headers.items() if k.lower() in KEPT_HEADERS}
+        body = zlib.compress(response.content, 6)
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, method, url, status, reason, headers, body, size, stored, expires, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (request_key(request), request.method, request.url, response.status_code,
+                 response.reason, json.dumps(headers), body, len(body), now,
+                 now + self.ttl_for(request.url), now),
+            )
+            self._evict()
+
+    def memoize(self, url: str, compute):
+        """
+        Cache the JSON-serializable result of `compute()` as the answer to GET `url`.
+
+        For calls whose HTTP session cannot be passed in (scrapetube). Empty
+        results are not stored; offline, a miss raises CacheMissError.
+        """
+        request = requests.Request('GET', url).prepare()
+        cached = self.get(request)
+        if cached is not None:
+            return cached.json()
+        if self.offline:
+            raise CacheMissError(f"Not in the HTTP cache (offline): {url}", request=request)
+
+        value = compute()
+        if value:
+            response = requests.Response()
+            response.status_code = 200
+            response.headers = CaseInsensitiveDict({'Content-Type': 'application/json; charset=utf-8'})
+            response._content = json.dumps(value, ensure_ascii=False).encode('utf-8')
+            self.put(request, response)
+        return value
+
+    def _evict(self) -> None:
+        (total,) = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self.db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self.db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.db.execute("DELETE FROM responses")
+            self.db.execute("VACUUM")
+
+    def stats(self) -> dict:
+        with self.lock:
+            entries, size = self.db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            (expired,) = self.db.execute(
+                "SELECT COUNT(*) FROM responses WHERE expires < ?", (time.time(),)
+            ).fetchone()
+        return {
+            'entries': entries,
+            'bytes': size,
+            'expired': expired,
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale_hits': self.stale_hits,
+            'evictions': self.evictions,
+        }
+
+    def adapter(self, pool_size: int = 10, max_retries=0) -> "CachingAdapter":
+        return CachingAdapter(self, pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=max_retries)
+
+    def mount(self, session: requests.Session, pool_size: int = 10, max_retries=0) -> requests.Session:
+        """Route all of a session's http(s) requests through this cache."""
+        adapter = self.adapter(pool_size, max_retries)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter that answers from a ResponseCache and stores what it downloads."""
+
+    def __init__(self, cache: ResponseCache, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, **kwargs):
+        if stream:
+            if self.cache.offline:
+                raise CacheMissError(f"Streamed request not cached (offline): {request.url}", request=request)
+            return super().send(request, stream=stream, **kwargs)
+
+        cached = self.cache.get(request)
+        if cached is not None:
+            return cached
+        if self.cache.offline:
+            raise CacheMissError(f"Not in the HTTP cache (offline): {request.method} {request.url}",
+                                 request=request)
+
+        response = super().send(request, stream=stream, **kwargs)
+        response.from_cache = False
+        self.cache.put(request, response)
+        return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the on-disk HTTP response cache.")
+    parser.add_argument('command', choices=['stats', 'clear'])
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.cache_dir, "responses.sqlite")):
+        print(f"❌ No HTTP cache in {args.cache_dir}/")
+        sys.exit(1)
+
+    cache = ResponseCache(args.cache_dir)
+    if args.command == 'clear':
+        cache.clear()
+        print(f"🗑️  Cleared {args.cache_dir}/")
+        return
+
+    stats = cache.stats()
+    print(f"📦 HTTP cache: {stats['entries']} responses, {stats['bytes'] / 1e6:.1f} MB "
+          f"({stats['expired']} expired) in {cache.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Per-Video Results Store
+=======================
+One SQLite database (transcripts/results.sqlite, WAL mode) records what each
+pipeline stage did for each video, one upserted row per (video, stage):
+
+    listing    the channel listing entry (id, title, published, views, duration)
+    captions   the caption fetch result  (fetch_transcripts.py)
+    whisper    the Whisper result        (transcribe_missing_videos.py)
+
+Rows are written as each video finishes, so a crash loses at most the video
+in flight, and an indexed (stage, status) column answers "which videos are
+pending / failed" without reading every result. Both scripts can write at the
+same time: WAL lets readers run alongside the single writer, and each write
+is one short transaction.
+
+all_results.json and whisper_results.json are still produced, as exports in
+the same format as before; a new database imports them on first open.
+
+Usage:
+    python3 results_store.py              # counts per stage and status
+    python3 results_store.py --export     # rewrite the JSON files from the store
+"""
+
+import os
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from contextlib import contextmanager
+
+LISTING = 'listing'
+CAPTIONS = 'captions'
+WHISPER = 'whisper'
+
+SUCCESS = 'success'
+FAILED = 'failed'
+LISTED = 'listed'
+
+# JSON export file and success flag per result stage
+STAGE_FILES = {
+    CAPTIONS: ("all_results.json", 'transcript_success'),
+    WHISPER: ("whisper_results.json", 'whisper_success'),
+}
+
+
+def store_path(transcript_dir: str) -> str:
+    return os.path.join(transcript_dir, "results.sqlite")
+
+
+def _load_json_list(path: str) -> list:
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return data if isinstance(data, list) else []
+
+
+class ResultsStore:
+    """Thread-safe handle on the results database; open one per process."""
+
+    def __init__(self, transcript_dir: str = "transcripts"):
+        self.transcript_dir = transcript_dir
+        os.makedirs(transcript_dir, exist_ok=True)
+        self.path = store_path(transcript_dir)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, timeout=30, check_same_thread=False,
+                                  isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.transaction():
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    video_id TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    position INTEGER,
+                    updated REAL NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (video_id, stage)
+                )
+            """)
+            self.db.execute("CREATE INDEX IF NOT EXISTS results_stage_status ON results (stage, status)")
+            (rows,) = self.db.execute("SELECT COUNT(*) FROM results").fetchone()
+            if rows == 0:
+                self._import_json()
+
+    @contextmanager
+    def transaction(self):
+        """Serialize writers: the lock within this process, BEGIN IMMEDIATE across processes."""
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+
+    def _import_json(self) -> None:
+        """Seed a new database from the JSON files of earlier runs."""
+        listing = _load_json_list(os.path.join(self.transcript_dir, "video_list.json"))
+        captions = _load_json_list(os.path.join(self.transcript_dir, STAGE_FILES[CAPTIONS][0]))
+        whispers = _load_json_list(os.path.join(self.transcript_dir, STAGE_FILES[WHISPER][0]))
+        if not listing:
+            listing = captions
+        self._upsert_listing(listing)
+        for stage, results in ((CAPTIONS, captions), (WHISPER, whispers)):
+            for result in results:
+                if 'id' in result:
+                    self._upsert(stage, result)
+
+    def _upsert(self, stage: str, result: dict, status: str = None, position: int = None) -> None:
+        if status is None:
+            status = SUCCESS if result.get(STAGE_FILES[stage][1]) else FAILED
+        self.db.execute(
+            "INSERT INTO results (video_id, stage, status, position, updated, data) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (video_id, stage) DO UPDATE SET "
+            "status = excluded.status, position = COALESCE(excluded.position, results.position), "
+            "updated = excluded.updated, data = excluded.data",
+            (result['id'], stage, status, position, time.time(), json.dumps(result, ensure_ascii=False)),
+        )
+
+    def _upsert_listing(self, videos: list) -> None:
+        for position, video in enumerate(videos):
+            if 'id' in video:
+                listing = {key: video[key] for key in ('id', 'title', 'published', 'views', 'duration')
+                           if key in video}
+                self._upsert(LISTING, listing, status=LISTED, position=position)
+
+    def record_listing(self, videos: list) -> None:
+        """Upsert the channel listing; positions give the export order."""
+        with self.transaction():
+            self._upsert_listing(videos)
+
+    def record(self, stage: str, result: dict) -> None:
+        """Upsert one video's result for `stage` (CAPTIONS or WHISPER)."""
+        with self.transaction():
+            self._upsert(stage, result)
+
+    def results(self, stage: str, status: str = None) -> list:
+        """
+        Results of one stage, optionally filtered by status, in channel order.
+
+        Listing metadata (title, views, ...) is refreshed from the latest
+        listing, as the JSON checkpoints used to do.
+        """
+        query = (
+            "SELECT r.data, l.data FROM results r "
+            "LEFT JOIN results l ON l.video_id = r.video_id AND l.stage = ? "
+            "WHERE r.stage = ?"
+        )
+        params = [LISTING, stage]
+        if status is not None:
+            query += " AND r.status = ?"
+            params.append(status)
+        query += " ORDER BY l.position IS NULL, l.position, r.updated"
+        with self.lock:
+            rows = self.db.execute(query, params).fetchall()
+        return [{**json.loads(data), **json.loads(listing or '{}')} for data, listing in rows]
+
+    def get(self, stage: str, video_id: str) -> dict:
+        with self.lock:
+            row = self.db.execute(
+                "SELECT data FROM results WHERE stage = ? AND video_id = ?", (stage, video_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def ids(self, stage: str, status: str) -> set:
+        with self.lock:
+            return {video_id for (video_id,) in self.db.execute(
+                "SELECT video_id FROM results WHERE stage = ? AND status = ?", (stage, status)
+            )}
+
+    def failed_captions(self) -> list:
+        """Videos whose caption fetch failed and that Whisper has not transcribed yet."""
+        whispered = {
+            r['id'] for r in self.results(WHISPER, SUCCESS)
+            if os.path.exists(r.get('transcript_file', ''))
+        }
+        return [r for r in self.results(CAPTIONS, FAILED) if r['id'] not in whispered]
+
+    def counts(self) -> dict:
+        """{stage: {status: count}}"""
+        counts = {}
+        with self.lock:
+            for stage, status, count in self.db.execute(
+                "SELECT stage, status, COUNT(*) FROM results GROUP BY stage, status"
+            ):
+                counts.setdefault(stage, {})[status] = count
+        return counts
+
+    def export_json(self, stage: str, path: str = None) -> str:
+        """Write a stage's results as all_results.json / whisper_results.json (atomically)."""
+        path = path or os.path.join(self.transcript_dir, STAGE_FILES[stage][0])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.results(stage), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
+
+
+def main():
+    TRANSCRIPT_DIR = "transcripts"
+
+    parser = argparse.ArgumentParser(description="Inspect the per-video results store.")
+    parser.add_argument('--export', action='store_true',
+                        help="Rewrite all_results.json and whisper_results.json from the store")
+    args = parser.parse_args()
+
+    store = ResultsStore(TRANSCRIPT_DIR)
+    print(f"🗃️  Results store: {store.path}")
+    for stage, statuses in sorted(store.counts().items()):
+        print(f"   {stage:<9} " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items())))
+    if args.export:
+        for stage in STAGE_FILES:
+            print(f"   Exported {store.export_json(stage)}")
+
+
+if __name__ == "__main__":
+    main()
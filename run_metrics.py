@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Pipeline Run Metrics
+====================
+Per-stage instrumentation shared by fetch_transcripts.py and
+transcribe_missing_videos.py:
+
+- histograms: stage latency, bytes per item, Whisper real-time factor
+- counters: items, failed items, stage errors, retries, bytes, audio seconds
+  vs wall seconds
+
+At the end of a run the metrics are written twice:
+
+    metrics/{job}.prom            Prometheus text format, for node_exporter's
+                                  textfile collector (point --metrics-dir at it)
+    metrics/{job}_summary.json    Run summary: per-stage count, total, p50/p95/max
+
+With profiling enabled, every stage() block also runs under cProfile and each
+stage's profile is saved as metrics/profile/{job}-{stage}.prof (open with
+`python -m pstats` or snakeviz). Stages that run in worker processes dump
+per-process partial files that are merged into the same per-stage file.
+"""
+
+import os
+import json
+import time
+import pstats
+import cProfile
+import threading
+from contextlib import contextmanager
+
+METRICS_DIR = "metrics"
+PREFIX = "transcripts"
+
+SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9)
+RATIO_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 5)
+
+HELP = {
+    'stage_seconds': "Wall time of one call of a pipeline stage",
+    'item_bytes': "Bytes received or stored per item and stage",
+    'whisper_rtf': "Whisper real-time factor (wall seconds / audio seconds) per file",
+    'items_total': "Items processed per stage and status",
+    'failures_total': "Failed items per stage",
+    'stage_errors_total': "Stage calls that raised, per stage",
+    'retries_total': "Retried requests per stage",
+    'bytes_total': "Bytes received or stored per stage",
+    'http_requests_total': "HTTP requests sent per stage",
+    'audio_seconds_total': "Seconds of audio transcribed",
+    'wall_seconds_total': "Wall seconds spent transcribing audio",
+    'listed_videos': "Videos in the channel listing",
+    'run_duration_seconds': "Wall time of the whole run",
+    'run_last_success_timestamp_seconds': "Unix time the last run finished",
+}
+
+
+def profile_dir(metrics_dir: str) -> str:
+    return os.path.join(metrics_dir, "profile")
+
+
+def partial_profile_path(metrics_dir: str, job: str, stage: str) -> str:
+    """Per-process profile file for a stage that runs in worker processes."""
+    return os.path.join(profile_dir(metrics_dir), f"{job}-{stage}.{os.getpid()}.prof")
+
+
+def _number(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _quantile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    position = q * (len(sorted_values) - 1)
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+class Histogram:
+    """Cumulative-bucket histogram that also keeps raw values for the JSON summary."""
+
+    def __init__(self, buckets: tuple = SECONDS_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.values = []
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.values.append(value)
+
+    def summary(self) -> dict:
+        values = sorted(self.values)
+        return {
+            'count': len(values),
+            'sum': round(sum(values), 6),
+            'p50': round(_quantile(values, 0.5), 6),
+            'p95': round(_quantile(values, 0.95), 6),
+            'max': round(values[-1], 6) if values else 0.0,
+        }
+
+
+class RunMetrics:
+    """Thread-safe metrics registry for one pipeline run."""
+
+    def __init__(self, job: str, metrics_dir: str = METRICS_DIR, profile: bool = False):
+        self.job = job
+        self.metrics_dir = metrics_dir
+        self.profile = profile
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self.profiles = {}
+        self.started = time.time()
+
+    @staticmethod
+    def _key(name: str, labels: dict) -> tuple:
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = self._key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self.lock:
+            self.gauges[self._key(name, labels)] = value
+
+    def value(self, name: str, **labels) -> float:
+        """Current value of a counter or gauge (0 if never set)."""
+        key = self._key(name, labels)
+        with self.lock:
+            return self.counters.get(key, self.gauges.get(key, 0))
+
+    def observe(self, name: str, value: float, buckets: tuple = SECONDS_BUCKETS, **labels) -> None:
+        key = self._key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def stage(self, stage: str):
+        """
+        Time a block as one call of `stage` (and profile it when enabled).
+
+        An exception escaping the block counts as a stage error. Failed items
+        are only counted by record_item(), so an item whose stage raised is not
+        counted twice.
+        """
+        profiler = None
+        if self.profile:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                profiler = None  # Another profiler is active (Python 3.12+ allows one per process)
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.inc('stage_errors_total', stage=stage)
+            raise
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - start, stage=stage)
+            if profiler is not None:
+                profiler.disable()
+                with self.lock:
+                    self.profiles.setdefault(stage, []).append(profiler)
+
+    def record_item(self, stage: str, success: bool, nbytes: int = None) -> None:
+        """Count one processed item, and its size when known."""
+        self.inc('items_total', stage=stage, status='success' if success else 'failed')
+        if not success:
+            self.inc('failures_total', stage=stage)
+        if nbytes:
+            self.inc('bytes_total', nbytes, stage=stage)
+            self.observe('item_bytes', nbytes, buckets=BYTES_BUCKETS, stage=stage)
+
+    def _labels(self, labels: tuple, extra: dict = None) -> str:
+        pairs = [('pipeline', self.job), *labels, *(extra or {}).items()]
+        escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+    def prometheus_text(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            families = {}
+            for (name, labels), value in self.counters.items():
+                families.setdefault((name, 'counter'), []).append((labels, value))
+            for (name, labels), value in self.gauges.items():
+                families.setdefault((name, 'gauge'), []).append((labels, value))
+            for (name, labels), histogram in self.histograms.items():
+                families.setdefault((name, 'histogram'), []).append((labels, histogram))
+
+            for (name, kind), series in sorted(families.items()):
+                metric = f"{PREFIX}_{name}"
+                lines.append(f"# HELP {metric} {HELP.get(name, name.replace('_', ' '))}")
+                lines.append(f"# TYPE {metric} {kind}")
+                for labels, value in sorted(series, key=lambda item: item[0]):
+                    if kind != 'histogram':
+                        lines.append(f"{metric}{self._labels(labels)} {_number(value)}")
+                        continue
+                    for bound, count in zip(value.buckets, value.counts):
+                        lines.append(f"{metric}_bucket{self._labels(labels, {'le': f'{bound:g}'})} {count}")
+                    lines.append(f"{metric}_bucket{self._labels(labels, {'le': '+Inf'})} {len(value.values)}")
+                    lines.append(f"{metric}_sum{self._labels(labels)} {_number(sum(value.values))}")
+                    lines.append(f"{metric}_count{self._labels(labels)} {len(value.values)}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict:
+        """JSON-friendly run summary."""
+        with self.lock:
+            def label_text(labels):
+                return ",".join(f"{k}={v}" for k, v in labels) or "_"
+
+            summary = {'job': self.job, 'started': self.started, 'finished': time.time()}
+            for (name, labels), value in sorted(self.counters.items()):
+                summary.setdefault('counters', {}).setdefault(name, {})[label_text(labels)] = value
+            for (name, labels), value in sorted(self.gauges.items()):
+                summary.setdefault('gauges', {}).setdefault(name, {})[label_text(labels)] = value
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                summary.setdefault('histograms', {}).setdefault(name, {})[label_text(labels)] = histogram.summary()
+        return summary
+
+    def _write_atomic(self, path: str, text: str) -> None:
+        # node_exporter may read the file at any moment: never expose a partial write
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def write_profiles(self) -> list:
+        """Merge and save one .prof file per stage; returns the written paths."""
+        directory = profile_dir(self.metrics_dir)
+        partial_prefix = f"{self.job}-"
+        stages = {}
+        with self.lock:
+            for stage, profilers in self.profiles.items():
+                stages.setdefault(stage, []).extend(profilers)
+        if os.path.isdir(directory):
+            # Partial dumps from worker processes: {job}-{stage}.{pid}.prof
+            for name in os.listdir(directory):
+                if name.startswith(partial_prefix) and name.count('.') == 2 and name.endswith('.prof'):
+                    stage = name[len(partial_prefix):].split('.')[0]
+                    stages.setdefault(stage, []).append(os.path.join(directory, name))
+
+        written = []
+        for stage, sources in sorted(stages.items()):
+            os.makedirs(directory, exist_ok=True)
+            stats = pstats.Stats(sources[0])
+            for source in sources[1:]:
+                stats.add(source)
+            path = os.path.join(directory, f"{self.job}-{stage}.prof")
+            stats.dump_stats(path)
+            written.append(path)
+            for source in sources:
+                if isinstance(source, str):
+                    os.remove(source)
+        return written
+
+    def write(self) -> dict:
+        """
+        Finish the run: write the Prometheus textfile, the JSON summary and
+        (when profiling) the per-stage profiles.
+
+        Returns:
+            {'prometheus': path, 'summary': path, 'profiles': [paths]}
+        """
+        os.makedirs(self.metrics_dir, exist_ok=True)
+        self.set('run_duration_seconds', time.time() - self.started)
+        self.set('run_last_success_timestamp_seconds', time.time())
+
+        prom_path = os.path.join(self.metrics_dir, f"{self.job}.prom")
+        self._write_atomic(prom_path, self.prometheus_text())
+        summary_path = os.path.join(self.metrics_dir, f"{self.job}_summary.json")
+        self._write_atomic(summary_path, json.dumps(self.summary(), indent=2))
+
+        return {
+            'prometheus': prom_path,
+            'summary': summary_path,
+            'profiles': self.write_profiles() if self.profile else [],
+        }
+
+
+@contextmanager
+def profile_to_file(path: str):
+    """
+    Profile a block into a per-process partial .prof file, accumulating over
+    calls; used inside worker processes, merged later by RunMetrics.write().
+    """
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        profiler = None
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            stats = pstats.Stats(profiler)
+            if os.path.exists(path):
+                stats.add(path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            stats.dump_stats(path)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Time-Aligned Segment Store
+==========================
+Keeps the timestamped segments that youtube-transcript-api and Whisper return
+(and that the .txt transcripts flatten away), one compact columnar file per
+video in transcripts/segments/{video_id}.seg:
+
+    b"SEG1" | uint32 count
+    float32 starts[count]       (seconds, ascending)
+    float32 durations[count]    (seconds)
+    uint32  offsets[count + 1]  (character offsets of each segment in the text)
+    utf-8   text                (segment texts joined with "\\n")
+
+Both lookups are binary searches over the parallel arrays:
+- what is being said at t seconds  -> bisect on `starts`
+- at which second a phrase starts  -> str.find on the text, bisect on `offsets`
+
+Usage:
+    python3 segment_store.py VIDEO_ID --at 1234
+    python3 segment_store.py VIDEO_ID --find "page produit"
+"""
+
+import os
+import sys
+import struct
+import argparse
+from array import array
+from bisect import bisect_right
+
+MAGIC = b"SEG1"
+
+
+def segments_dir(transcript_dir: str) -> str:
+    return os.path.join(transcript_dir, "segments")
+
+
+def segment_path(transcript_dir: str, video_id: str) -> str:
+    return os.path.join(segments_dir(transcript_dir), f"{video_id}.seg")
+
+
+def normalize_segments(segments) -> list:
+    """
+    Convert caption snippets (objects or dicts with start/duration/text) or
+    Whisper segments (dicts with start/end/text) into (start, duration, text).
+    """
+    normalized = []
+    for segment in segments:
+        if isinstance(segment, dict):
+            start = float(segment.get('start', 0))
+            if 'duration' in segment:
+                duration = float(segment['duration'])
+            else:
+                duration = float(segment.get('end', start)) - start
+            text = segment.get('text', '')
+        else:
+            start, duration, text = float(segment.start), float(segment.duration), segment.text
+        normalized.append((start, max(0.0, duration), text.strip().replace("\n", " ")))
+    normalized.sort(key=lambda item: item[0])
+    return normalized
+
+
+def save_segments(video_id: str, segments, transcript_dir: str = "transcripts") -> str:
+    """
+    Write one video's segments to its columnar .seg file.
+
+    Returns:
+        Path of the written file, or None when there are no segments
+    """
+    normalized = normalize_segments(segments or [])
+    if not normalized:
+        return None
+
+    starts = array('f', (start for start, _, _ in normalized))
+    durations = array('f', (duration for _, duration, _ in normalized))
+    offsets = array('I', [0])
+    for _, _, text in normalized:
+        offsets.append(offsets[-1] + len(text) + 1)
+    blob = "\n".join(text for _, _, text in normalized)
+
+    os.makedirs(segments_dir(transcript_dir), exist_ok=True)
+    path = segment_path(transcript_dir, video_id)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(normalized)))
+        for column in (starts, durations, offsets):
+            if sys.byteorder != 'little':
+                column.byteswap()
+            column.tofile(f)
+        f.write(blob.encode('utf-8'))
+    os.replace(tmp_path, path)
+    return path
+
+
+class SegmentStore:
+    """Read-only, in-memory view of one video's .seg file."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            if f.read(4) != MAGIC:
+                raise ValueError(f"{path} is not a segment store file")
+            (count,) = struct.unpack('<I', f.read(4))
+            self.starts = array('f')
+            self.durations = array('f')
+            self.offsets = array('I')
+            self.starts.fromfile(f, count)
+            self.durations.fromfile(f, count)
+            self.offsets.fromfile(f, count + 1)
+            if sys.byteorder != 'little':
+                for column in (self.starts, self.durations, self.offsets):
+                    column.byteswap()
+            self.text = f.read().decode('utf-8')
+        self._folded = None
+
+    @classmethod
+    def for_video(cls, video_id: str, transcript_dir: str = "transcripts"):
+        """Open a video's store, or return None if it has no segments on disk."""
+        path = segment_path(transcript_dir, video_id)
+        return cls(path) if os.path.exists(path) else None
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def segment(self, index: int) -> dict:
+        return {
+            'start': self.starts[index],
+            'duration': self.durations[index],
+            'text': self.text[self.offsets[index]:self.offsets[index + 1] - 1],
+        }
+
+    def index_at(self, seconds: float) -> int:
+        """Index of the segment being spoken at `seconds` (the last one starting before it)."""
+        return max(0, bisect_right(self.starts, seconds) - 1)
+
+    def at(self, seconds: float) -> dict:
+        """The segment being spoken at `seconds`."""
+        return self.segment(self.index_at(seconds))
+
+    def index_of_offset(self, char_offset: int) -> int:
+        """Index of the segment containing a character offset of `text`."""
+        return max(0, bisect_right(self.offsets, char_offset) - 1)
+
+    def find(self, phrase: str, limit: int = None) -> list:
+        """
+        Case-insensitive phrase search.
+
+        Returns:
+            Start times (seconds) of the segments where each match begins
+        """
+        if self._folded is None:
+            # Segment boundaries are newlines; let a phrase span two segments
+            self._folded = self.text.lower().replace("\n", " ")
+        needle = " ".join(phrase.lower().split())
+        haystack = self._folded
+
+        times = []
+        position = haystack.find(needle)
+        while position != -1 and needle and (limit is None or len(times) < limit):
+            times.append(self.starts[self.index_of_offset(position)])
+            position = haystack.find(needle, position + 1)
+        return times
+
+
+def format_timestamp(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def main():
+    TRANSCRIPT_DIR = "transcripts"
+
+    parser = argparse.ArgumentParser(description="Look up timestamped transcript segments.")
+    parser.add_argument('video_id')
+    parser.add_argument('--at', type=float, help="Show what is said at this second")
+    parser.add_argument('--find', help="Show the seconds where this phrase starts")
+    args = parser.parse_args()
+
+    store = SegmentStore.for_video(args.video_id, TRANSCRIPT_DIR)
+    if store is None:
+        print(f"❌ No segments stored for {args.video_id}. Re-fetch or re-transcribe it first.")
+        sys.exit(1)
+
+    if args.at is not None:
+        segment = store.at(args.at)
+        print(f"[{format_timestamp(segment['start'])}] {segment['text']}")
+
+    if args.find:
+        for seconds in store.find(args.find):
+            print(f"[{format_timestamp(seconds)}] https://www.youtube.com/watch?v={args.video_id}&t={int(seconds)}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Local Course Server
+===================
+Serves the course (index.html, transcripts, search index) for local study and
+for the Playwright suites, instead of `python3 -m http.server`:
+
+- Precompressed responses: brotli (when the brotli package is installed) or
+  gzip, negotiated from Accept-Encoding. Variants are built once per file
+  version, in .serve_cache/ (sibling .br/.gz files are used as-is when they
+  are up to date), so index.html is not recompressed on every request.
+- Strong ETags (content SHA-256, one per encoding) and If-None-Match /
+  If-Modified-Since revalidation with 304 responses.
+- Cache-Control: content-hashed files (name.{hash}.ext, e.g. the transcript
+  bundle) are `immutable` for a year; everything else is `no-cache`
+  (always revalidated, so edits show up on reload).
+- HTTP Range (single byte range, with If-Range) on the identity encoding.
+- Threaded: every connection gets its own thread, with HTTP/1.1 keep-alive.
+
+Dotfiles and dot-directories (.git, .serve_cache, ...) are never served.
+
+Usage:
+    python3 serve.py                       # http://127.0.0.1:8000/
+    python3 serve.py --port 8080 --bind 0.0.0.0
+    python3 serve.py --no-precompress      # compress lazily on first request
+"""
+
+import os
+import re
+import gzip
+import hashlib
+import argparse
+import mimetypes
+import threading
+import email.utils
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # Optional: pip install brotli for .br variants
+
+CACHE_DIR = ".serve_cache"
+DEFAULT_PORT = 8000
+
+# Compressing tiny or already compressed bodies is not worth it
+MIN_COMPRESS_BYTES = 1024
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json',
+                      'application/xml', 'image/svg+xml')
+# A variant must save at least this fraction to be served
+MIN_COMPRESS_SAVING = 0.1
+
+# name.{8+ hex chars}.ext: the content hash changes with the content
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8,64}\.[^/]+$')
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+COPY_CHUNK = 64 * 1024
+
+# Already-compressed files are served as themselves, never as Content-Encoding
+ARCHIVE_TYPES = {
+    '.gz': 'application/gzip',
+    '.br': 'application/x-brotli',
+    '.bz2': 'application/x-bzip2',
+    '.xz': 'application/x-xz',
+}
+
+
+def guess_type(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ARCHIVE_TYPES:
+        return ARCHIVE_TYPES[ext]
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if content_type.startswith('text/') or content_type == 'application/json':
+        content_type += '; charset=utf-8'
+    return content_type
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """{coding: q} from an Accept-Encoding header."""
+    accepted = {}
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if not coding:
+            continue
+        q = 1.0
+        match = re.search(r'q=([0-9.]+)', params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def parse_range(header: str, size: int):
+    """
+    Parse a single-range `bytes=` header.
+
+    Returns:
+        (start, end) inclusive, None when the header should be ignored
+        (malformed or multiple ranges: send the full body), or False when
+        the range cannot be satisfied.
+    """
+    match = re.fullmatch(r'\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*', header or '')
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+class AssetStore:
+    """
+    Content hashes and compressed variants, keyed by file version
+    (path, mtime, size); shared by every request thread.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        self.hashes = {}
+        self.variants = {}
+        self.encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+
+    @staticmethod
+    def _version(path: str, stat: os.stat_result) -> tuple:
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def content_hash(self, path: str, stat: os.stat_result) -> str:
+        version = self._version(path, stat)
+        digest = self.hashes.get(version)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(COPY_CHUNK), b''):
+                    sha.update(chunk)
+            digest = sha.hexdigest()[:32]
+            self.hashes[version] = digest
+        return digest
+
+    def variant(self, path: str, stat: os.stat_result, encoding: str):
+        """Path of the compressed file for `encoding`, building it on first use; None if not worth it."""
+        version = self._version(path, stat)
+        key = (version, encoding)
+        if key in self.variants:
+            return self.variants[key]
+
+        suffix = ENCODING_SUFFIXES[encoding]
+        sibling = path + suffix
+        if os.path.exists(sibling) and os.stat(sibling).st_mtime_ns >= stat.st_mtime_ns:
+            self.variants[key] = sibling
+            return sibling
+        if encoding == 'br' and brotli is None:
+            return None
+
+        digest = self.content_hash(path, stat)
+        cached = os.path.join(self.cache_dir, digest + suffix)
+        # One compression at a time: concurrent first requests wait for it instead of repeating it
+        with self.lock:
+            if key in self.variants:
+                return self.variants[key]
+            if not os.path.exists(cached):
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                if encoding == 'br':
+                    data = brotli.compress(raw, quality=11)
+                else:
+                    # mtime=0 keeps the bytes (and so the ETag) deterministic
+                    data = gzip.compress(raw, compresslevel=9, mtime=0)
+                if len(data) > len(raw) * (1 - MIN_COMPRESS_SAVING):
+                    self.variants[key] = None
+                    return None
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = f"{cached}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, cached)
+            self.variants[key] = cached
+        return cached
+
+    def precompress(self, root: str) -> int:
+        """Build every variant under `root` ahead of the first request; returns files compressed."""
+        count = 0
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for name in filenames:
+                path = os.path.join(directory, name)
+                if name.startswith('.') or not is_compressible(guess_type(path)):
+                    continue
+                stat = os.stat(path)
+                if stat.st_size < MIN_COMPRESS_BYTES:
+                    continue
+                for encoding in self.encodings:
+                    self.variant(path, stat, encoding)
+                count += 1
+        return count
+
+
+class CourseRequestHandler(SimpleHTTPRequestHandler):
+    """SimpleHTTPRequestHandler with compression, ETags, cache headers and ranges."""
+
+    protocol_version = "HTTP/1.1"
+
+    def __init__(self, *args, store: AssetStore = None, **kwargs):
+        self.store = store or AssetStore()
+        self.range = None
+        super().__init__(*args, **kwargs)
+
+    def guess_type(self, path):
+        return guess_type(path)
+
+    def log_message(self, format, *args):
+        if not getattr(self.server, 'quiet', False):
+            super().log_message(format, *args)
+
+    def _negotiate_encoding(self, content_type: str, size: int):
+        if size < MIN_COMPRESS_BYTES or not is_compressible(content_type):
+            return None
+        accepted = parse_accept_encoding(self.headers.get('Accept-Encoding'))
+        for encoding in self.store.encodings:
+            if accepted.get(encoding, accepted.get('*', 0)) > 0:
+                return encoding
+        return None
+
+    def _etag_matches(self, header: str, etag: str) -> bool:
+        # Weak comparison, as If-None-Match requires
+        tags = [tag.strip() for tag in header.split(',')]
+        return '*' in tags or any(tag.removeprefix('W/') == etag for tag in tags)
+
+    def _not_modified(self, etag: str, stat: os.stat_result) -> bool:
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return self._etag_matches(if_none_match, etag)
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            return int(stat.st_mtime) <= since
+        return False
+
+    def send_head(self):
+        self.range = None
+        path = self.translate_path(self.path)
+        relative = os.path.relpath(path, self.directory)
+        if any(part.startswith('.') and part not in ('.', '..') for part in relative.split(os.sep)):
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        if os.path.isdir(path):
+            # Redirects and directory listings stay with the base class
+            index = os.path.join(path, 'index.html')
+            if not self.path.split('?', 1)[0].endswith('/') or not os.path.isfile(index):
+                return super().send_head()
+            path = index
+
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        try:
+            stat = os.fstat(f.fileno())
+            content_type = self.guess_type(path)
+            digest = self.store.content_hash(path, stat)
+            cache_control = IMMUTABLE_CACHE if HASHED_NAME.search(os.path.basename(path)) else REVALIDATE_CACHE
+            compressible = stat.st_size >= MIN_COMPRESS_BYTES and is_compressible(content_type)
+
+            # Ranges address the identity bytes, so a Range request is never compressed
+            encoding = None if 'Range' in self.headers else self._negotiate_encoding(content_type, stat.st_size)
+            variant = self.store.variant(path, stat, encoding) if encoding else None
+            if variant is None:
+                encoding = None
+                etag = f'"{digest}"'
+                size = stat.st_size
+            else:
+                f.close()
+                f = open(variant, 'rb')
+                etag = f'"{digest}-{encoding}"'
+                size = os.fstat(f.fileno()).st_size
+
+            if self._not_modified(etag, stat):
+                f.close()
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self._send_cache_headers(etag, stat, cache_control, compressible)
+                self.end_headers()
+                return None
+
+            status = HTTPStatus.OK
+            byte_range = None
+            if_range = self.headers.get('If-Range')
+            if 'Range' in self.headers and (if_range is None or if_range.strip() == etag):
+                byte_range = parse_range(self.headers['Range'], size)
+                if byte_range is False:
+                    f.close()
+                    self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return None
+                if byte_range is not None:
+                    status = HTTPStatus.PARTIAL_CONTENT
+
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            if byte_range:
+                start, end = byte_range
+                self.range = (start, end - start + 1)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+                self.send_header("Content-Length", str(end - start + 1))
+            else:
+                self.send_header("Content-Length", str(size))
+            self.send_header("Accept-Ranges", "bytes")
+            self._send_cache_headers(etag, stat, cache_control, compressible)
+            self.end_headers()
+            return f
+        except Exception:
+            f.close()
+            raise
+
+    def _send_cache_headers(self, etag: str, stat: os.stat_result, cache_control: str, compressible: bool):
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.date_time_string(stat.st_mtime))
+        self.send_header("Cache-Control", cache_control)
+        if compressible:
+            self.send_header("Vary", "Accept-Encoding")
+
+    def copyfile(self, source, outputfile):
+        if self.range is None:
+            super().copyfile(source, outputfile)
+            return
+        start, remaining = self.range
+        source.seek(start)
+        while remaining > 0:
+            chunk = source.read(min(COPY_CHUNK, remaining))
+            if not chunk:
+                break
+            outputfile.write(chunk)
+            remaining -= len(chunk)
+
+
+class CourseServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    quiet = False
+
+
+def make_server(directory: str = ".", bind: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                cache_dir: str = None, quiet: bool = False) -> CourseServer:
+    """Build (not start) a threaded server for `directory`; port 0 picks a free one."""
+    directory = os.path.abspath(directory)
+    store = AssetStore(cache_dir or os.path.join(directory, CACHE_DIR))
+    server = CourseServer((bind, port), partial(CourseRequestHandler, directory=directory, store=store))
+    server.store = store
+    server.directory = directory
+    server.quiet = quiet
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the course locally with compression and caching.")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--bind', default="127.0.0.1", help="Address to listen on (0.0.0.0 for the LAN)")
+    parser.add_argument('--directory', default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument('--cache-dir', default=None, help=f"Compressed variants (default: <directory>/{CACHE_DIR})")
+    parser.add_argument('--no-precompress', action='store_true',
+                        help="Compress each file on its first request instead of at startup")
+    parser.add_argument('--quiet', action='store_true', help="Do not log requests")
+    args = parser.parse_args()
+
+    server = make_server(args.directory, args.bind, args.port, args.cache_dir, args.quiet)
+    if not args.no_precompress:
+        count = server.store.precompress(server.directory)
+        print(f"🗜️  Precompressed {count} files ({', '.join(server.store.encodings)}) into {server.store.cache_dir}/")
+    if brotli is None:
+        print("   (brotli not installed: pip install brotli for .br responses)")
+
+    host, port = server.server_address[:2]
+    print(f"📚 Serving {server.directory} at http://{host}:{port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+/*
+ * Offline cache for the built site
+ * ================================
+ * Template for dist/sw.js: build_site.py fills PRECACHE_MANIFEST with the
+ * content hash of every file it wrote, so any change to the site changes the
+ * worker's bytes and the browser installs the new version.
+ *
+ * - precache: the page and the search index. Served cache-first; an update
+ *   only downloads the entries whose hash changed and keeps the others.
+ * - transcripts: the bundle manifest (fetched at install), the bundle files
+ *   and the raw transcripts (cached as they are read). Served
+ *   stale-while-revalidate; an update refreshes the cached ones whose hash
+ *   changed and drops the ones no longer built.
+ *
+ * The new worker does not skip waiting: it activates once no tab runs the old
+ * page (the next visit), so an open tab never loses files of the version it
+ * was loaded with. While a worker controls the page, the page leaves
+ * transcripts to it and keeps no Cache Storage copy of its own. Other
+ * origins (Invidious embeds, fonts) are not intercepted.
+ */
+const PRECACHE_MANIFEST = { version: null, precache: {}, transcripts: {} };
+
+const PRECACHE = 'formation-precache';
+const STAGING = 'formation-precache-staging';
+const TRANSCRIPTS = 'formation-sw-transcripts';
+// The page's own transcript cache, used when no worker controls it
+const PAGE_TRANSCRIPTS = 'formation-transcripts-v1';
+// Fetched at install: without it an offline page does not know the bundle
+const BUNDLE_MANIFEST = 'transcripts/bundle/manifest.json';
+// Stored in PRECACHE: what the caches hold (compared against on the next
+// update) and what the last activation fetched
+const MANIFEST_KEY = '__precache-manifest__';
+const HASHED_NAME = /\.[0-9a-f]{8,64}\.[^/]+$/;
+
+const SCOPE = self.registration.scope;
+
+// Cache keys are canonical URLs rebuilt from manifest paths, so a request
+// encoded differently by the page still finds its entry.
+function urlFor(path) {
+    return new URL(path, SCOPE).href;
+}
+
+function pathFor(url) {
+    const href = url.split(/[?#]/)[0];
+    if (!href.startsWith(SCOPE)) return null;
+    try {
+        return decodeURIComponent(href.slice(SCOPE.length)) || 'index.html';
+    } catch (e) {
+        return null;
+    }
+}
+
+async function readStoredManifest(cache) {
+    const response = await cache.match(urlFor(MANIFEST_KEY));
+    const stored = response ? await response.json() : {};
+    return { version: null, precache: {}, transcripts: {}, ...stored };
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        await caches.delete(STAGING);  // Leftovers of an install that failed
+        const [cache, transcripts, staging] = await Promise.all(
+            [PRECACHE, TRANSCRIPTS, STAGING].map(name => caches.open(name)));
+        const previous = await readStoredManifest(cache);
+        const changed = [];
+        for (const [path, hash] of Object.entries(PRECACHE_MANIFEST.precache)) {
+            if (previous.precache[path] !== hash || !(await cache.match(urlFor(path)))) changed.push(path);
+        }
+        for (const [path, hash] of Object.entries(PRECACHE_MANIFEST.transcripts)) {
+            const cached = await transcripts.match(urlFor(path));
+            const stale = previous.transcripts[path] !== hash;
+            if (cached ? stale : path === BUNDLE_MANIFEST) changed.push(path);
+        }
+
+        // Staged apart: the running worker keeps serving the current caches until activate
+        await Promise.all(changed.map(async path => {
+            const response = await fetch(urlFor(path), { cache: 'reload' });
+            if (!response.ok) throw new Error(`${path}: HTTP ${response.status}`);
+            await staging.put(urlFor(path), response);
+        }));
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const [cache, transcripts, staging] = await Promise.all(
+            [PRECACHE, TRANSCRIPTS, STAGING].map(name => caches.open(name)));
+        const previous = await readStoredManifest(cache);
+
+        const fetched = [];
+        for (const request of await staging.keys()) {
+            const path = pathFor(request.url);
+            const target = path in PRECACHE_MANIFEST.precache ? cache : transcripts;
+            await target.put(request, await staging.match(request));
+            fetched.push(path);
+        }
+        await caches.delete(STAGING);
+        // Transcripts are this worker's from now on
+        await caches.delete(PAGE_TRANSCRIPTS);
+
+        // Safe to drop: activation waited until no tab used the previous version
+        for (const request of await cache.keys()) {
+            const path = pathFor(request.url);
+            if (path !== MANIFEST_KEY && !(path in PRECACHE_MANIFEST.precache)) await cache.delete(request);
+        }
+        for (const request of await transcripts.keys()) {
+            if (!(pathFor(request.url) in PRECACHE_MANIFEST.transcripts)) await transcripts.delete(request);
+        }
+        const update = { previousVersion: previous.version, fetched };
+        await cache.put(urlFor(MANIFEST_KEY), new Response(JSON.stringify({ ...PRECACHE_MANIFEST, update }), {
+            headers: { 'Content-Type': 'application/json' }
+        }));
+
+        // Only on the first install: the open page came from the network at
+        // this very version, so it can be served offline from now on
+        if (!previous.version) await self.clients.claim();
+        const message = { type: 'precache-updated', version: PRECACHE_MANIFEST.version, ...update };
+        const windows = await self.clients.matchAll({ type: 'window', includeUncontrolled: true });
+        windows.forEach(client => client.postMessage(message));
+    })());
+});
+
+async function precached(request, path) {
+    const cache = await caches.open(PRECACHE);
+    return (await cache.match(urlFor(path))) || fetch(request);
+}
+
+async function staleWhileRevalidate(event, path) {
+    const cache = await caches.open(TRANSCRIPTS);
+    const key = urlFor(path);
+    const cached = await cache.match(key);
+    // Hashed bundle files never change under the same name
+    if (cached && HASHED_NAME.test(path)) return cached;
+
+    const network = fetch(event.request).then(async response => {
+        if (response.status === 200) await cache.put(key, response.clone());
+        return response;
+    });
+    if (!cached) return network;
+    event.waitUntil(network.catch(() => {}));  // Offline: the cached copy is all we have
+    return cached;
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET' || request.headers.has('Range')) return;
+    const path = pathFor(request.url);
+    if (path === null) return;
+
+    if (path in PRECACHE_MANIFEST.precache) {
+        event.respondWith(precached(request, path));
+    } else if (path in PRECACHE_MANIFEST.transcripts) {
+        event.respondWith(staleWhileRevalidate(event, path));
+    }
+});
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for combine_transcripts.py: header parsing and the offset index.
+
+Usage:
+    python3 -m unittest test_combine_transcripts
+"""
+
+import os
+import json
+import tempfile
+import unittest
+
+from combine_transcripts import (
+    TRANSCRIPT_HEADER_SEPARATOR, build_combined_transcripts, read_transcript, read_transcript_file,
+)
+
+SEPARATOR = TRANSCRIPT_HEADER_SEPARATOR.decode()
+
+
+class CombineTranscriptsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.transcript_dir = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_transcript(self, video_id: str, content: str) -> dict:
+        path = os.path.join(self.transcript_dir, f"{video_id}.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return {'id': video_id, 'title': video_id, 'transcript_file': path, 'transcript_success': True}
+
+    def build(self, results: list) -> dict:
+        with open(os.path.join(self.transcript_dir, "all_results.json"), 'w', encoding='utf-8') as f:
+            json.dump(results, f)
+        return build_combined_transcripts(self.transcript_dir)
+
+    def test_header_followed_by_blank_line(self):
+        result = self.write_transcript("blank", f"Title: Vidéo\nLanguage: fr\n{SEPARATOR}\nPremière ligne.\nSuite.\n")
+        header, body = read_transcript_file(result['transcript_file'])
+        self.assertEqual(header, {'Title': 'Vidéo', 'Language': 'fr'})
+        self.assertEqual(body, "Première ligne.\nSuite.\n")
+
+    def test_header_without_blank_line_keeps_first_body_line(self):
+        result = self.write_transcript("tight", f"Title: Vidéo\n{SEPARATOR}Première ligne.\nSuite.\n")
+        header, body = read_transcript_file(result['transcript_file'])
+        self.assertEqual(header, {'Title': 'Vidéo'})
+        self.assertEqual(body, "Première ligne.\nSuite.\n")
+
+        index = self.build([result])
+        self.assertEqual(read_transcript("tight", self.transcript_dir, index), "Première ligne.\nSuite.\n")
+
+    def test_file_without_header_is_all_body(self):
+        result = self.write_transcript("plain", "Juste le texte.\n")
+        self.assertEqual(read_transcript_file(result['transcript_file']), ({}, "Juste le texte.\n"))
+
+    def test_index_reads_back_every_body(self):
+        results = [
+            self.write_transcript("a", f"Title: A\n{SEPARATOR}\nCorps A.\n"),
+            self.write_transcript("b", f"Title: B\n{SEPARATOR}Corps B, sans ligne vide.\n"),
+        ]
+        index = self.build(results)
+        self.assertEqual(read_transcript("a", self.transcript_dir, index), "Corps A.\n")
+        self.assertEqual(read_transcript("b", self.transcript_dir, index), "Corps B, sans ligne vide.\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
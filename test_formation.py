@@ -2,12 +2,34 @@
 """
 Interactive Formation Course Test Script
 Validates core UX flows, persistence, responsive behavior, and error recovery.
+
+Each scenario is an independent case with its own browser context (fresh
+localStorage), so one failure does not hide the others. Cases wait on DOM
+state, saved state or the app's `formation:ready` / `formation:view` events
+instead of fixed sleeps, and run sharded across worker processes.
+
+Usage:
+    python3 test_formation.py                  # all cases, one process per CPU (max 4)
+    python3 test_formation.py --workers 1      # serial
+    python3 test_formation.py -k mobile        # cases whose name contains "mobile"
+    python3 test_formation.py --shard 2/3      # second third of the cases (CI split)
+
+Environment: HEADLESS=0 to watch, SLOW_MO=ms, ALLOW_NETWORK=1 to let the
+page reach Invidious/YouTube (blocked by default for hermetic runs).
 """
 
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+import argparse
+import multiprocessing
 import os
+import re
+import json
 import time
+import tempfile
+import threading
+import traceback
 from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 REPO_DIR = Path(__file__).resolve().parent
 HTML_FILE = str(REPO_DIR / "formation-interactive.html")
@@ -17,99 +39,175 @@ STATE_KEY = "formation-ecom-state"
 # Defaults: run headless for reliability; set HEADLESS=0 for interactive mode.
 HEADLESS = os.environ.get("HEADLESS", "1") != "0"
 SLOW_MO = int(os.environ.get("SLOW_MO", "0" if HEADLESS else "500"))
+ALLOW_NETWORK = os.environ.get("ALLOW_NETWORK", "0") == "1"
+
+DESKTOP = {"width": 1400, "height": 900}
+MOBILE = {"width": 375, "height": 812}
+
+# Upper bound for any single wait; cases finish as soon as the state is reached
+WAIT_TIMEOUT_MS = 15000
+
+# Persisted state as the app reads it back (progress key + per-lesson note keys)
+STATE_JS = "readPersistedState()"
 
 
 def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def run_tests() -> None:
-    ensure_dir(SCREENSHOTS_DIR)
+class FakeInvidiousHandler(BaseHTTPRequestHandler):
+    """
+    Fake Invidious instances on one local server, one per path prefix:
+    /{name}/api/v1/stats answers after the instance's delay (None = HTTP 503),
+    /{name}/embed/... serves a blank player page.
+    """
+
+    delays = {'slow': 0.6, 'down': None, 'fast': 0.05}
+    # Embeds loading faster than 500 ms are treated as error pages by the player
+    embed_delay = 0.7
+
+    def do_GET(self):
+        name, _, rest = self.path.lstrip('/').partition('/')
+        if name not in self.delays:
+            self.send_error(404)
+            return
+        if rest.startswith('embed/'):
+            time.sleep(self.embed_delay)
+            self._answer(200, 'text/html', b"<!doctype html><title>fake player</title>")
+            return
+        delay = self.delays[name]
+        if delay is None:
+            self._answer(503, 'application/json', b'{"error": "down"}')
+            return
+        time.sleep(delay)
+        self._answer(200, 'application/json', json.dumps({'software': {'name': 'invidious'}}).encode())
+
+    def _answer(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_fake_invidious_base = None
+
+
+def fake_invidious_base() -> str:
+    """Start the fake instances once per worker process; returns the server URL."""
+    global _fake_invidious_base
+    if _fake_invidious_base is None:
+        server = ThreadingHTTPServer(('127.0.0.1', 0), FakeInvidiousHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        _fake_invidious_base = f"http://127.0.0.1:{server.server_port}"
+    return _fake_invidious_base
+
+
+_built_site_base = None
+
+
+def build_and_serve_site() -> tuple:
+    """Build the minified site into a fresh temp dir and serve it; returns (dist dir, URL, build report)."""
+    from build_site import build_site
+    from serve import make_server
+
+    dist_dir = tempfile.mkdtemp(prefix="formation-dist-")
+    report = build_site(str(REPO_DIR / "index.html"), dist_dir, standalone=False)
+    server = make_server(dist_dir, port=0, quiet=True, cache_dir=os.path.join(dist_dir, ".serve_cache"))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return dist_dir, f"http://127.0.0.1:{server.server_port}", report
+
+
+def built_site_base() -> str:
+    """URL of a built site shared by the read-only cases of this worker."""
+    global _built_site_base
+    if _built_site_base is None:
+        _built_site_base = build_and_serve_site()[1]
+    return _built_site_base
+
+
+class FormationPage:
+    """One case's page plus the app-specific waits and helpers."""
+
+    def __init__(self, page):
+        self.page = page
+
+    def wait_until(self, expression: str, arg=None, message: str = "Condition not reached"):
+        """Wait for a JS predicate; a timeout becomes an assertion failure with `message`."""
+        try:
+            self.page.wait_for_function(expression, arg=arg, timeout=WAIT_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            raise AssertionError(message) from None
+
+    def wait_for_state(self, predicate: str, arg=None, message: str = "Saved state not reached"):
+        """Wait until the persisted state satisfies `predicate` (JS using `state` and `arg`)."""
+        self.wait_until(
+            f"(arg) => {{ const state = {STATE_JS}; return !!state && ({predicate}); }}",
+            arg, message,
+        )
+
+    def wait_ready(self):
+        self.wait_until("() => document.documentElement.dataset.appReady === 'true'",
+                        message="App never emitted formation:ready")
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=HEADLESS, slow_mo=SLOW_MO)
-        context = browser.new_context(viewport={"width": 1400, "height": 900})
-        page = context.new_page()
-
-        def get_state():
-            return page.evaluate(
-                """() => {
-                    const raw = localStorage.getItem('formation-ecom-state');
-                    return raw ? JSON.parse(raw) : null;
-                }"""
-            )
-
-        def lesson_ids():
-            return page.evaluate(
-                """() => {
-                    return coursData.phases.flatMap(p => p.lessons.map(l => l.id));
-                }"""
-            )
-
-        def open_first_lesson():
-            modules_tab = page.locator("#sidebar-tab-modules")
-            if modules_tab.count() > 0:
-                modules_tab.first.click()
-                page.wait_for_timeout(250)
-            phase_headers = page.locator(".phase-header")
-            assert phase_headers.count() > 0, "Expected phase headers"
-            phase_headers.first.click()
-            page.wait_for_timeout(350)
-            lessons = page.locator(".lesson-item")
-            assert lessons.count() > 0, "Expected lessons in first phase"
-            lessons.first.click()
-            page.wait_for_timeout(1200)
-
-        def open_main_view(view: str):
-            menu_tab = page.locator("#sidebar-tab-menu")
-            if menu_tab.count() > 0:
-                menu_tab.first.click()
-                page.wait_for_timeout(200)
-            nav = page.locator(f'.nav-item[data-view="{view}"]')
-            if nav.count() > 0 and nav.first.is_visible():
-                nav.first.click()
-            else:
-                page.evaluate("(v) => navigateTo(v)", view)
-            page.wait_for_timeout(450)
-
-        print("=" * 60)
-        print("TESTING: Formation E-commerce Organique Interactive")
-        print("=" * 60)
-
-        # Test 1: Load + shell checks.
-        print("\n[TEST 1] Loading app + core shell...")
-        page.goto(f"file://{HTML_FILE}")
-        page.wait_for_load_state("networkidle")
-        page.screenshot(path=f"{SCREENSHOTS_DIR}/01_initial_load.png", full_page=True)
-        assert page.locator(".logo-text").is_visible(), "Logo should be visible"
-        assert page.locator("#search-input").is_visible(), "Search input should be visible"
-        assert page.locator("#progress-indicator").is_visible(), "Progress indicator should be visible"
-        assert page.locator(".settings-button").is_visible(), "Settings should be visible"
-        assert page.locator(".today-focus-card").count() == 1, "Expected one primary today card"
-        print("  ✅ App shell and today primary rail are visible")
-
-        # Test 2: Sidebar/module tree integrity.
-        print("\n[TEST 2] Checking sidebar modules tree...")
-        page.locator("#sidebar-tab-modules").first.click()
-        page.wait_for_timeout(250)
-        phases = page.locator(".phase-header")
-        phase_count = phases.count()
-        print(f"  Found {phase_count} phases")
-        assert phase_count == 10, f"Expected 10 phases, got {phase_count}"
-        print("  ✅ Module tree is complete")
-
-        # Test 3: Open lesson + lesson workspace.
-        print("\n[TEST 3] Opening first lesson...")
-        open_first_lesson()
-        page.screenshot(path=f"{SCREENSHOTS_DIR}/02_lesson_workspace.png", full_page=True)
-        assert page.locator(".lesson-layout").count() == 1, "Expected lesson layout"
-        assert page.locator("#lesson-video-container").count() == 1, "Expected lesson player container"
-        assert page.locator('[data-action="set-lesson-panel"][data-panel="overview"]').count() == 1
-        print("  ✅ Lesson workspace opened with segmented panels")
-
-        # Test 4: Force localized player error and validate scoping.
-        print("\n[TEST 4] Forcing localized player error state...")
-        current_video = page.evaluate(
+    def open(self):
+        self.page.goto(f"file://{HTML_FILE}")
+        self.wait_ready()
+
+    def reload(self):
+        self.page.reload()
+        self.wait_ready()
+
+    def screenshot(self, name: str):
+        self.page.screenshot(path=f"{SCREENSHOTS_DIR}/{name}", full_page=True)
+
+    def get_state(self):
+        return self.page.evaluate(f"() => {STATE_JS}")
+
+    def lesson_ids(self):
+        return self.page.evaluate(
+            """() => {
+                return coursData.phases.flatMap(p => p.lessons.map(l => l.id));
+            }"""
+        )
+
+    def wait_for_view(self, view: str):
+        self.wait_for_state("state.ui.currentView === arg", view, f"View {view!r} never became current")
+
+    def open_first_lesson(self):
+        page = self.page
+        modules_tab = page.locator("#sidebar-tab-modules")
+        if modules_tab.count() > 0:
+            modules_tab.first.click()
+        page.locator(".phase-header").first.wait_for(state="visible")
+        phase_headers = page.locator(".phase-header")
+        assert phase_headers.count() > 0, "Expected phase headers"
+        phase_headers.first.click()
+        page.locator(".lesson-item").first.wait_for(state="visible")
+        lessons = page.locator(".lesson-item")
+        assert lessons.count() > 0, "Expected lessons in first phase"
+        lessons.first.click()
+        page.locator(".lesson-layout").wait_for()
+        self.wait_for_view("lesson")
+
+    def open_main_view(self, view: str):
+        page = self.page
+        menu_tab = page.locator("#sidebar-tab-menu")
+        if menu_tab.count() > 0:
+            menu_tab.first.click()
+        nav = page.locator(f'.nav-item[data-view="{view}"]')
+        if nav.count() > 0 and nav.first.is_visible():
+            nav.first.click()
+        else:
+            page.evaluate("(v) => navigateTo(v)", view)
+        self.wait_for_view(view)
+
+    def current_lesson_video(self):
+        return self.page.evaluate(
             """() => {
                 const raw = localStorage.getItem('formation-ecom-state');
                 const lessonId = raw ? JSON.parse(raw).ui.currentLessonId : null;
@@ -121,290 +219,700 @@ def run_tests() -> None:
                 return 'GYjzjHlaod0';
             }"""
         )
-        page.evaluate(
+
+    def force_player_error(self):
+        self.page.evaluate(
             """(videoId) => {
                 const container = document.getElementById('lesson-video-container');
                 showInvidiousError(container, videoId, false, getInvidiousBase());
             }""",
-            current_video,
+            self.current_lesson_video(),
         )
-        page.wait_for_timeout(300)
-        assert page.locator(".video-container .video-error").count() == 1, "Error must be scoped to player"
-        assert page.locator(".video-error-title", has_text="Vidéo temporairement indisponible").count() == 1
-        assert page.locator(".content-area > .video-error").count() == 0, "No detached error blocks expected"
-        page.screenshot(path=f"{SCREENSHOTS_DIR}/03_video_error_localized.png", full_page=True)
-        print("  ✅ Localized player error UI is scoped correctly")
-
-        # Test 5: Retry + rotate actions.
-        print("\n[TEST 5] Validating retry and instance-rotation actions...")
-        retry_btn = page.locator('button[data-action="retry-video"]').first
-        assert retry_btn.count() == 1, "Retry button should exist"
-        retry_btn.click()
-        page.wait_for_timeout(1400)
-        player_has_content = (
-            page.locator("#lesson-video-container iframe").count() > 0
-            or page.locator("#lesson-video-container .video-error").count() > 0
-        )
-        assert player_has_content, "Player should remain in a recoverable state"
-
-        rotate_btn = page.locator('button[data-action="rotate-invidious-instance"]').first
-        if rotate_btn.count() > 0:
-            rotate_btn.click()
-            page.wait_for_timeout(1400)
-            player_has_content = (
-                page.locator("#lesson-video-container iframe").count() > 0
-                or page.locator("#lesson-video-container .video-error").count() > 0
-            )
-            assert player_has_content, "Rotate action should keep player recoverable"
-        page.screenshot(path=f"{SCREENSHOTS_DIR}/04_video_retry_rotate.png", full_page=True)
-        print("  ✅ Retry and rotate actions are functional")
-
-        # Test 6: Continue-without-video + completion flow remains unblocked.
-        print("\n[TEST 6] Testing continue-without-video and progression continuity...")
-        continue_without = page.locator('button[data-action="continue-without-video"]').first
-        if continue_without.count() > 0:
-            continue_without.click()
-            page.wait_for_timeout(200)
-            assert page.locator(".video-error-title", has_text="Mode sans vidéo activé").count() == 1
-
-        before_state = get_state()
-        current_lesson = before_state["ui"]["currentLessonId"]
-        before_completed = current_lesson in before_state["progress"]["completedLessonIds"]
-        complete_btn = page.locator('button[data-action="toggle-lesson-complete"]').first
-        complete_btn.click()
-        page.wait_for_timeout(350)
-        after_state = get_state()
-        after_completed = current_lesson in after_state["progress"]["completedLessonIds"]
-        assert before_completed != after_completed, "Completion state should toggle"
-        page.screenshot(path=f"{SCREENSHOTS_DIR}/05_continue_without_video.png", full_page=True)
-        print("  ✅ Learner can continue and update completion without video playback")
-
-        # Test 7: Lesson panel persistence (notes).
-        print("\n[TEST 7] Verifying lesson panel persistence across reload...")
-        notes_tab = page.locator('[data-action="set-lesson-panel"][data-panel="notes"]').first
-        notes_tab.click()
-        page.wait_for_timeout(250)
-        assert notes_tab.get_attribute("aria-selected") == "true", "Notes tab should be active"
-        notes_textarea = page.locator("#lesson-notes")
-        assert notes_textarea.count() == 1, "Notes textarea should be visible on notes panel"
-        notes_textarea.fill("Panel persistence check - " + time.strftime("%H:%M:%S"))
-        page.wait_for_timeout(500)
-        page.reload()
-        page.wait_for_load_state("networkidle")
-        page.wait_for_timeout(800)
-        notes_tab_after = page.locator('[data-action="set-lesson-panel"][data-panel="notes"]').first
-        assert notes_tab_after.get_attribute("aria-selected") == "true", "Notes tab should persist after reload"
-        page.screenshot(path=f"{SCREENSHOTS_DIR}/06_panel_persistence.png", full_page=True)
-        print("  ✅ lessonPanel state persists")
-
-        # Test 8: Return-context with scroll restoration.
-        print("\n[TEST 8] Testing return context and scroll restoration...")
-        open_main_view("today")
-        page.evaluate("() => window.scrollTo(0, 500)")
-        scroll_before = page.evaluate("() => Math.round(window.scrollY)")
-        page.evaluate(
-            """() => {
-                const next = getNextLessonData();
-                if (next?.lesson?.id) {
-                    navigateTo('lesson', { lessonId: next.lesson.id });
-                }
-            }"""
+        self.page.locator(".video-container .video-error").wait_for()
+
+    def wait_player_recoverable(self, message: str):
+        self.wait_until(
+            """() => document.querySelector('#lesson-video-container iframe')
+                    || document.querySelector('#lesson-video-container .video-error')""",
+            message=message,
         )
-        page.wait_for_timeout(800)
-        page.locator('button[data-action="return-to-context"]').first.click()
-        page.wait_for_timeout(600)
-        current_view = get_state()["ui"]["currentView"]
-        scroll_after = page.evaluate("() => Math.round(window.scrollY)")
-        assert current_view == "today", "Return should go back to originating view"
-        assert abs(scroll_after - scroll_before) <= 180, f"Scroll should restore (before={scroll_before}, after={scroll_after})"
-        page.screenshot(path=f"{SCREENSHOTS_DIR}/07_return_context.png", full_page=True)
-        print("  ✅ Return path preserves context and scroll")
-
-        # Test 9: Exercises filter persistence + no detached player errors.
-        print("\n[TEST 9] Checking exercises action board + filter persistence...")
-        open_main_view("exercises")
-        assert page.locator(".exercise-filter-group").count() == 1, "Exercises filter toolbar missing"
-        assert page.locator(".exercise-filter-btn.active", has_text="À faire").count() == 1, "Default filter should be À faire"
-        assert page.locator(".content-area .video-error").count() == 0, "No detached video errors should appear in exercises"
-        done_filter = page.locator('.exercise-filter-btn[data-filter="done"]').first
-        done_filter.click()
-        page.wait_for_timeout(300)
-        assert done_filter.evaluate("el => el.classList.contains('active')"), "Done filter should activate"
-        page.reload()
-        page.wait_for_load_state("networkidle")
-        page.wait_for_timeout(500)
-        # App restores last view by state; if needed force exercises.
-        if page.locator(".exercise-filter-group").count() == 0:
-            open_main_view("exercises")
-        done_filter_after = page.locator('.exercise-filter-btn[data-filter="done"]').first
-        assert done_filter_after.evaluate("el => el.classList.contains('active')"), "Filter should persist after reload"
-        page.screenshot(path=f"{SCREENSHOTS_DIR}/08_exercises_filters.png", full_page=True)
-        print("  ✅ exercisesFilter state persists and exercises board is clean")
-
-        # Test 10: Planning current-week highlight + week action CTA.
-        print("\n[TEST 10] Checking planning week actions...")
-        open_main_view("planning")
-        assert page.locator(".timeline-item.current").count() >= 1, "Expected one current week highlight"
-        week_action_btn = page.locator('button[data-action="toggle-week-actions"]').first
-        assert week_action_btn.count() > 0, "Expected week action button"
-        week_action_btn.click()
-        page.wait_for_timeout(200)
-        assert page.locator(".week-actions.open").count() >= 1, "Week action content should expand"
-        page.screenshot(path=f"{SCREENSHOTS_DIR}/09_planning_actions.png", full_page=True)
-        print("  ✅ Planning CTA and week-detail disclosure work")
-
-        # Test 11: Mobile hierarchy + sticky controls.
-        print("\n[TEST 11] Validating mobile CTA hierarchy and sticky controls...")
-        page.set_viewport_size({"width": 375, "height": 812})
-        page.wait_for_timeout(250)
-        page.locator('.mobile-bottom-nav .mobile-nav-btn[data-view="today"]').first.click()
-        page.wait_for_timeout(450)
-        today_primary = page.locator('.today-focus-card button[data-action="open-lesson"]').first
-        if today_primary.count() > 0:
-            bbox = today_primary.bounding_box()
-            assert bbox and bbox["y"] < 730, "Primary CTA should be above fold on mobile"
-        assert page.locator("#mobile-action-bar.active").count() == 1, "Sticky mobile action bar should be visible on today"
-        assert page.locator(".mobile-bottom-nav").is_visible(), "Mobile bottom nav should be visible"
-        if today_primary.count() > 0:
-            today_primary.click()
-            page.wait_for_timeout(700)
-            assert page.locator("#mobile-action-bar.active").count() == 1, "Sticky action bar should appear on lesson view"
-        page.screenshot(path=f"{SCREENSHOTS_DIR}/10_mobile_actions.png", full_page=True)
-        print("  ✅ Mobile CTA placement and sticky actions are valid")
-
-        # Test 12: Keyboard path for lesson and exercise completion.
-        print("\n[TEST 12] Testing keyboard-only completion path...")
-        page.set_viewport_size({"width": 1400, "height": 900})
-        page.wait_for_timeout(300)
-        if page.locator(".lesson-layout").count() == 0:
-            open_first_lesson()
-
-        current_state = get_state()
-        current_lesson_id = current_state["ui"]["currentLessonId"]
-        before_completed = current_lesson_id in current_state["progress"]["completedLessonIds"]
-
-        complete_btn = page.locator('button[data-action="toggle-lesson-complete"]').first
-        complete_btn.focus()
-        page.keyboard.press("Enter")
-        page.wait_for_timeout(300)
-
-        after_state = get_state()
-        after_completed = current_lesson_id in after_state["progress"]["completedLessonIds"]
-        assert before_completed != after_completed, "Keyboard Enter should toggle lesson completion"
-
-        exercise_tab = page.locator('[data-action="set-lesson-panel"][data-panel="exercise"]').first
-        exercise_tab.focus()
-        page.keyboard.press("Enter")
-        page.wait_for_timeout(300)
-
-        exercise_checkbox = page.locator('.lesson-panel-section.active .exercise-checkbox').first
-        if exercise_checkbox.count() > 0:
-            exercise_id = exercise_checkbox.get_attribute("data-exercise-id")
-            state_before_ex = get_state()
-            ex_before = exercise_id in state_before_ex["progress"]["completedExerciseIds"]
-            exercise_checkbox.focus()
-            page.keyboard.press(" ")
-            page.wait_for_timeout(300)
-            state_after_ex = get_state()
-            ex_after = exercise_id in state_after_ex["progress"]["completedExerciseIds"]
-            assert ex_before != ex_after, "Keyboard Space should toggle exercise completion"
-        page.screenshot(path=f"{SCREENSHOTS_DIR}/11_keyboard_path.png", full_page=True)
-        print("  ✅ Keyboard completion path works for lesson and exercise")
-
-        # Test 13: Mobile search overlay behavior.
-        print("\n[TEST 13] Testing mobile search overlay + escape close...")
-        page.set_viewport_size({"width": 375, "height": 812})
-        page.wait_for_timeout(250)
-        page.locator('.mobile-bottom-nav .mobile-nav-btn[data-view="today"]').first.click()
-        page.wait_for_timeout(300)
-        search_input = page.locator("#search-input")
-        search_input.click()
-        page.wait_for_timeout(300)
-        assert page.locator(".search-box.mobile-expanded").count() == 1, "Search should expand on mobile focus"
-        page.keyboard.press("Escape")
-        page.wait_for_timeout(250)
-        assert page.locator(".search-box.mobile-expanded").count() == 0, "Search overlay should close on Escape"
-        page.screenshot(path=f"{SCREENSHOTS_DIR}/12_mobile_search_overlay.png", full_page=True)
-        print("  ✅ Mobile search overlay opens and closes correctly")
-
-        # Test 14: Schema V3 migration from V2.
-        print("\n[TEST 14] Validating V2 -> V3 migration...")
-        all_lesson_ids = lesson_ids()
-        seed_lesson = all_lesson_ids[0]
-        page.evaluate(
-            """(seedLesson) => {
-                const v2 = {
-                    meta: { schemaVersion: 2, lastSavedAt: null },
-                    progress: {
-                        completedLessonIds: [seedLesson],
-                        completedExerciseIds: [],
-                        completedChecklistIds: [],
-                        completedWeekIds: [],
-                        timerSeconds: 12
-                    },
-                    ui: {
-                        currentView: 'today',
-                        currentLessonId: null,
-                        sidebarTab: 'menu',
-                        searchQuery: '',
-                        pipDismissed: false
-                    },
-                    prefs: {
-                        theme: 'dark',
-                        autoplayVideos: false,
-                        focusModeEnabled: false,
-                        lastInvidiousBase: ''
-                    },
-                    notesByLessonId: {}
-                };
-                localStorage.setItem('formation-ecom-state', JSON.stringify(v2));
-            }""",
-            seed_lesson,
+
+    def is_lesson_completed(self, lesson_id: str) -> bool:
+        return lesson_id in self.get_state()["progress"]["completedLessonIds"]
+
+    def wait_lesson_completed(self, lesson_id: str, completed: bool, message: str):
+        self.wait_for_state(
+            "state.progress.completedLessonIds.includes(arg.id) === arg.completed",
+            {"id": lesson_id, "completed": completed}, message,
         )
-        page.reload()
-        page.wait_for_load_state("networkidle")
-        migrated = get_state()
-        assert migrated["meta"]["schemaVersion"] == 3, "Expected schema version 3 after migration"
-        assert "lessonPanel" in migrated["ui"], "lessonPanel should exist after migration"
-        assert "exercisesFilter" in migrated["ui"], "exercisesFilter should exist after migration"
-        assert "returnContext" in migrated["ui"], "returnContext should exist after migration"
-        assert seed_lesson in migrated["progress"]["completedLessonIds"], "Legacy progress should be preserved"
-        page.screenshot(path=f"{SCREENSHOTS_DIR}/13_migration_v3.png", full_page=True)
-        print("  ✅ V2 data migrates to V3 while preserving progress")
-
-        # Test 15: Accessibility hints (focus-visible + ARIA selected).
-        print("\n[TEST 15] Checking focus and ARIA states...")
-        page.set_viewport_size({"width": 1400, "height": 900})
-        page.wait_for_timeout(250)
-        open_first_lesson()
-        notes_tab = page.locator('[data-action="set-lesson-panel"][data-panel="notes"]').first
-        notes_tab.click()
-        page.wait_for_timeout(250)
-        assert notes_tab.get_attribute("aria-selected") == "true", "Active panel tab should expose aria-selected=true"
-
-        complete_btn = page.locator('button[data-action="toggle-lesson-complete"]').first
-        complete_btn.focus()
-        focus_rule_present = page.evaluate(
-            """() => {
-                const styleTag = document.querySelector('style');
-                return styleTag && styleTag.textContent.includes(':focus-visible') && styleTag.textContent.includes('outline');
-            }"""
+
+
+# ========================================
+# CASES
+# ========================================
+CASES = []
+
+
+def case(title: str, viewport: dict = DESKTOP):
+    """Register a test case; cases are numbered in definition order."""
+    def register(fn):
+        CASES.append({'number': len(CASES) + 1, 'name': fn.__name__, 'title': title,
+                      'viewport': viewport, 'fn': fn})
+        fn.__test__ = False  # Run by run_tests(), not collected by pytest (no `app` fixture)
+        return fn
+    return register
+
+
+@case("Loading app + core shell")
+def test_app_shell(app):
+    page = app.page
+    app.open()
+    app.screenshot("01_initial_load.png")
+    assert page.locator(".logo-text").is_visible(), "Logo should be visible"
+    assert page.locator("#search-input").is_visible(), "Search input should be visible"
+    assert page.locator("#progress-indicator").is_visible(), "Progress indicator should be visible"
+    assert page.locator(".settings-button").is_visible(), "Settings should be visible"
+    assert page.locator(".today-focus-card").count() == 1, "Expected one primary today card"
+    return "App shell and today primary rail are visible"
+
+
+@case("Checking sidebar modules tree")
+def test_sidebar_modules(app):
+    page = app.page
+    app.open()
+    page.locator("#sidebar-tab-modules").first.click()
+    page.locator(".phase-header").first.wait_for(state="visible")
+    phase_count = page.locator(".phase-header").count()
+    assert phase_count == 10, f"Expected 10 phases, got {phase_count}"
+    return f"Module tree is complete ({phase_count} phases)"
+
+
+@case("Opening first lesson")
+def test_lesson_workspace(app):
+    page = app.page
+    app.open()
+    app.open_first_lesson()
+    app.screenshot("02_lesson_workspace.png")
+    assert page.locator(".lesson-layout").count() == 1, "Expected lesson layout"
+    assert page.locator("#lesson-video-container").count() == 1, "Expected lesson player container"
+    assert page.locator('[data-action="set-lesson-panel"][data-panel="overview"]').count() == 1
+    return "Lesson workspace opened with segmented panels"
+
+
+@case("Forcing localized player error state")
+def test_video_error_localized(app):
+    page = app.page
+    app.open()
+    app.open_first_lesson()
+    app.force_player_error()
+    assert page.locator(".video-container .video-error").count() == 1, "Error must be scoped to player"
+    assert page.locator(".video-error-title", has_text="Vidéo temporairement indisponible").count() == 1
+    assert page.locator(".content-area > .video-error").count() == 0, "No detached error blocks expected"
+    app.screenshot("03_video_error_localized.png")
+    return "Localized player error UI is scoped correctly"
+
+
+@case("Validating retry and instance-rotation actions")
+def test_video_retry_rotate(app):
+    page = app.page
+    app.open()
+    app.open_first_lesson()
+    app.force_player_error()
+
+    retry_btn = page.locator('button[data-action="retry-video"]').first
+    assert retry_btn.count() == 1, "Retry button should exist"
+    retry_btn.click()
+    app.wait_player_recoverable("Player should remain in a recoverable state")
+
+    rotate_btn = page.locator('button[data-action="rotate-invidious-instance"]').first
+    if rotate_btn.count() > 0:
+        rotate_btn.click()
+        app.wait_player_recoverable("Rotate action should keep player recoverable")
+    app.screenshot("04_video_retry_rotate.png")
+    return "Retry and rotate actions are functional"
+
+
+@case("Testing continue-without-video and progression continuity")
+def test_continue_without_video(app):
+    page = app.page
+    app.open()
+    app.open_first_lesson()
+    app.force_player_error()
+
+    continue_without = page.locator('button[data-action="continue-without-video"]').first
+    if continue_without.count() > 0:
+        continue_without.click()
+        page.locator(".video-error-title", has_text="Mode sans vidéo activé").wait_for()
+
+    current_lesson = app.get_state()["ui"]["currentLessonId"]
+    before_completed = app.is_lesson_completed(current_lesson)
+    page.locator('button[data-action="toggle-lesson-complete"]').first.click()
+    app.wait_lesson_completed(current_lesson, not before_completed, "Completion state should toggle")
+    app.screenshot("05_continue_without_video.png")
+    return "Learner can continue and update completion without video playback"
+
+
+@case("Verifying lesson panel persistence across reload")
+def test_panel_persistence(app):
+    page = app.page
+    app.open()
+    app.open_first_lesson()
+    notes_tab = page.locator('[data-action="set-lesson-panel"][data-panel="notes"]').first
+    notes_tab.click()
+    app.wait_for_state("state.ui.lessonPanel === 'notes'", message="Notes panel should be saved")
+    assert notes_tab.get_attribute("aria-selected") == "true", "Notes tab should be active"
+
+    notes_textarea = page.locator("#lesson-notes")
+    assert notes_textarea.count() == 1, "Notes textarea should be visible on notes panel"
+    note = "Panel persistence check - " + time.strftime("%H:%M:%S")
+    notes_textarea.fill(note)
+    app.wait_for_state("Object.values(state.notesByLessonId).includes(arg)", note, "Notes should be saved")
+
+    app.reload()
+    notes_tab_after = page.locator('[data-action="set-lesson-panel"][data-panel="notes"]').first
+    notes_tab_after.wait_for()
+    assert notes_tab_after.get_attribute("aria-selected") == "true", "Notes tab should persist after reload"
+    app.screenshot("06_panel_persistence.png")
+    return "lessonPanel state persists"
+
+
+@case("Testing return context and scroll restoration")
+def test_return_context(app):
+    page = app.page
+    app.open()
+    app.open_main_view("today")
+    page.evaluate("() => window.scrollTo(0, 500)")
+    scroll_before = page.evaluate("() => Math.round(window.scrollY)")
+    page.evaluate(
+        """() => {
+            const next = getNextLessonData();
+            if (next?.lesson?.id) {
+                navigateTo('lesson', { lessonId: next.lesson.id });
+            }
+        }"""
+    )
+    return_btn = page.locator('button[data-action="return-to-context"]').first
+    return_btn.wait_for()
+    return_btn.click()
+    app.wait_for_view("today")
+    app.wait_until(
+        "(before) => Math.abs(Math.round(window.scrollY) - before) <= 180", scroll_before,
+        f"Scroll should restore (before={scroll_before}, "
+        f"after={page.evaluate('() => Math.round(window.scrollY)')})",
+    )
+    app.screenshot("07_return_context.png")
+    return "Return path preserves context and scroll"
+
+
+@case("Checking exercises action board + filter persistence")
+def test_exercises_filter(app):
+    page = app.page
+    app.open()
+    app.open_main_view("exercises")
+    assert page.locator(".exercise-filter-group").count() == 1, "Exercises filter toolbar missing"
+    assert page.locator(".exercise-filter-btn.active", has_text="À faire").count() == 1, "Default filter should be À faire"
+    assert page.locator(".content-area .video-error").count() == 0, "No detached video errors should appear in exercises"
+    done_filter = page.locator('.exercise-filter-btn[data-filter="done"]').first
+    done_filter.click()
+    app.wait_for_state("state.ui.exercisesFilter === 'done'", message="Done filter should be saved")
+    assert done_filter.evaluate("el => el.classList.contains('active')"), "Done filter should activate"
+
+    app.reload()
+    # App restores last view by state; if needed force exercises.
+    if page.locator(".exercise-filter-group").count() == 0:
+        app.open_main_view("exercises")
+    done_filter_after = page.locator('.exercise-filter-btn[data-filter="done"]').first
+    assert done_filter_after.evaluate("el => el.classList.contains('active')"), "Filter should persist after reload"
+    app.screenshot("08_exercises_filters.png")
+    return "exercisesFilter state persists and exercises board is clean"
+
+
+@case("Checking planning week actions")
+def test_planning_actions(app):
+    page = app.page
+    app.open()
+    app.open_main_view("planning")
+    assert page.locator(".timeline-item.current").count() >= 1, "Expected one current week highlight"
+    week_action_btn = page.locator('button[data-action="toggle-week-actions"]').first
+    assert week_action_btn.count() > 0, "Expected week action button"
+    week_action_btn.click()
+    page.locator(".week-actions.open").first.wait_for()
+    app.screenshot("09_planning_actions.png")
+    return "Planning CTA and week-detail disclosure work"
+
+
+@case("Validating mobile CTA hierarchy and sticky controls", viewport=MOBILE)
+def test_mobile_actions(app):
+    page = app.page
+    app.open()
+    page.locator('.mobile-bottom-nav .mobile-nav-btn[data-view="today"]').first.click()
+    app.wait_for_view("today")
+    today_primary = page.locator('.today-focus-card button[data-action="open-lesson"]').first
+    if today_primary.count() > 0:
+        bbox = today_primary.bounding_box()
+        assert bbox and bbox["y"] < 730, "Primary CTA should be above fold on mobile"
+    page.locator("#mobile-action-bar.active").wait_for()
+    assert page.locator(".mobile-bottom-nav").is_visible(), "Mobile bottom nav should be visible"
+    if today_primary.count() > 0:
+        today_primary.click()
+        app.wait_for_view("lesson")
+        page.locator("#mobile-action-bar.active").wait_for()
+    app.screenshot("10_mobile_actions.png")
+    return "Mobile CTA placement and sticky actions are valid"
+
+
+@case("Testing keyboard-only completion path")
+def test_keyboard_path(app):
+    page = app.page
+    app.open()
+    app.open_first_lesson()
+
+    current_lesson_id = app.get_state()["ui"]["currentLessonId"]
+    before_completed = app.is_lesson_completed(current_lesson_id)
+    complete_btn = page.locator('button[data-action="toggle-lesson-complete"]').first
+    complete_btn.focus()
+    page.keyboard.press("Enter")
+    app.wait_lesson_completed(current_lesson_id, not before_completed,
+                              "Keyboard Enter should toggle lesson completion")
+
+    exercise_tab = page.locator('[data-action="set-lesson-panel"][data-panel="exercise"]').first
+    exercise_tab.focus()
+    page.keyboard.press("Enter")
+    app.wait_for_state("state.ui.lessonPanel === 'exercise'", message="Keyboard Enter should open the exercise panel")
+
+    exercise_checkbox = page.locator('.lesson-panel-section.active .exercise-checkbox').first
+    if exercise_checkbox.count() > 0:
+        exercise_id = exercise_checkbox.get_attribute("data-exercise-id")
+        ex_before = exercise_id in app.get_state()["progress"]["completedExerciseIds"]
+        exercise_checkbox.focus()
+        page.keyboard.press(" ")
+        app.wait_for_state(
+            "state.progress.completedExerciseIds.includes(arg.id) === arg.completed",
+            {"id": exercise_id, "completed": not ex_before},
+            "Keyboard Space should toggle exercise completion",
         )
-        assert focus_rule_present, "Focus-visible rule should exist in stylesheet"
-        page.screenshot(path=f"{SCREENSHOTS_DIR}/14_a11y_focus.png", full_page=True)
-        print("  ✅ ARIA state and focus-visible styling are present")
-
-        print("\n" + "=" * 60)
-        print("TEST SUMMARY")
-        print("=" * 60)
-        print(f"Screenshots saved to: {SCREENSHOTS_DIR}/")
+    app.screenshot("11_keyboard_path.png")
+    return "Keyboard completion path works for lesson and exercise"
+
+
+@case("Testing mobile search overlay + escape close", viewport=MOBILE)
+def test_mobile_search_overlay(app):
+    page = app.page
+    app.open()
+    page.locator('.mobile-bottom-nav .mobile-nav-btn[data-view="today"]').first.click()
+    app.wait_for_view("today")
+    page.locator("#search-input").click()
+    page.locator(".search-box.mobile-expanded").wait_for()
+    page.keyboard.press("Escape")
+    page.locator(".search-box.mobile-expanded").wait_for(state="detached")
+    app.screenshot("12_mobile_search_overlay.png")
+    return "Mobile search overlay opens and closes correctly"
+
+
+@case("Validating V2 -> V3 migration")
+def test_migration_v3(app):
+    app.open()
+    seed_lesson = app.lesson_ids()[0]
+    app.page.evaluate(
+        """(seedLesson) => {
+            flushState();
+            const v2 = {
+                meta: { schemaVersion: 2, lastSavedAt: null },
+                progress: {
+                    completedLessonIds: [seedLesson],
+                    completedExerciseIds: [],
+                    completedChecklistIds: [],
+                    completedWeekIds: [],
+                    timerSeconds: 12
+                },
+                ui: {
+                    currentView: 'today',
+                    currentLessonId: null,
+                    sidebarTab: 'menu',
+                    searchQuery: '',
+                    pipDismissed: false
+                },
+                prefs: {
+                    theme: 'dark',
+                    autoplayVideos: false,
+                    focusModeEnabled: false,
+                    lastInvidiousBase: ''
+                },
+                notesByLessonId: {}
+            };
+            localStorage.setItem('formation-ecom-state', JSON.stringify(v2));
+        }""",
+        seed_lesson,
+    )
+    app.reload()
+    app.wait_for_state("state.meta.schemaVersion === 3", message="Migrated state should be saved")
+    migrated = app.get_state()
+    assert migrated["meta"]["schemaVersion"] == 3, "Expected schema version 3 after migration"
+    assert "lessonPanel" in migrated["ui"], "lessonPanel should exist after migration"
+    assert "exercisesFilter" in migrated["ui"], "exercisesFilter should exist after migration"
+    assert "returnContext" in migrated["ui"], "returnContext should exist after migration"
+    assert seed_lesson in migrated["progress"]["completedLessonIds"], "Legacy progress should be preserved"
+    app.screenshot("13_migration_v3.png")
+    return "V2 data migrates to V3 while preserving progress"
+
+
+@case("Checking focus and ARIA states")
+def test_a11y_focus(app):
+    page = app.page
+    app.open()
+    app.open_first_lesson()
+    notes_tab = page.locator('[data-action="set-lesson-panel"][data-panel="notes"]').first
+    notes_tab.click()
+    app.wait_for_state("state.ui.lessonPanel === 'notes'", message="Notes panel should open")
+    assert notes_tab.get_attribute("aria-selected") == "true", "Active panel tab should expose aria-selected=true"
+
+    complete_btn = page.locator('button[data-action="toggle-lesson-complete"]').first
+    complete_btn.focus()
+    focus_rule_present = page.evaluate(
+        """() => {
+            const styleTag = document.querySelector('style');
+            return styleTag && styleTag.textContent.includes(':focus-visible') && styleTag.textContent.includes('outline');
+        }"""
+    )
+    assert focus_rule_present, "Focus-visible rule should exist in stylesheet"
+    app.screenshot("14_a11y_focus.png")
+    return "ARIA state and focus-visible styling are present"
+
+
+@case("Ranking Invidious instances by probe latency")
+def test_invidious_ranking(app):
+    page = app.page
+    server = fake_invidious_base()
+    # Listed slowest first: the probes must reorder them
+    instances = [f"{server}/slow", f"{server}/down", f"{server}/fast"]
+    page.add_init_script(f"window.FORMATION_INVIDIOUS_INSTANCES = {json.dumps(instances)};")
+    app.open()
+    app.wait_for_state("state.prefs.invidiousRanking && state.prefs.invidiousRanking.bases[0] === arg",
+                       instances[2], "Fastest instance should be ranked first")
+    ranking = app.get_state()["prefs"]["invidiousRanking"]
+    assert ranking["bases"] == [instances[2], instances[0], instances[1]], ranking["bases"]
+    assert ranking["stats"][instances[1]]["history"] == [False], "Down instance should record a failed probe"
+    assert ranking["stats"][instances[2]]["latencyMs"] < ranking["stats"][instances[0]]["latencyMs"]
+
+    app.open_first_lesson()
+    page.locator("#lesson-video-container iframe").wait_for(state="attached")
+    src = page.locator("#lesson-video-container iframe").get_attribute("src")
+    assert src.startswith(f"{instances[2]}/embed/"), f"Player should start on the fastest instance, got {src}"
+
+    # A fresh ranking survives a reload without re-probing
+    app.reload()
+    assert app.get_state()["prefs"]["invidiousRanking"]["rankedAt"] == ranking["rankedAt"], "Ranking should be reused within its TTL"
+    app.screenshot("15_invidious_ranking.png")
+    return "Instances are probed concurrently and the fastest healthy one is used first"
+
+
+@case("Patching keyed nodes on exercise and week toggles")
+def test_keyed_updates(app):
+    page = app.page
+    app.open()
+    page.evaluate("() => setExercisesFilter('all', false)")
+    app.open_main_view("exercises")
+
+    cards = page.locator(".exercise-item[data-key]")
+    assert cards.count() >= 2, "Expected keyed exercise cards"
+    first_id = cards.nth(0).locator(".exercise-checkbox").get_attribute("data-exercise-id")
+    # Tag the live nodes with an expando: a full re-render would replace them
+    page.evaluate("""() => {
+        document.querySelectorAll('.exercise-item[data-key], .phase-group[data-key]')
+            .forEach(el => { el.__kept = true; });
+    }""")
+    replaced_js = "sel => Array.from(document.querySelectorAll(sel)).filter(el => !el.__kept).length"
+    details = page.locator("details.details-card").nth(1)
+    details.evaluate("el => { el.open = true; }")
+
+    cards.nth(0).locator(".exercise-checkbox").click()
+    app.wait_for_state("state.progress.completedExerciseIds.includes(arg)", first_id,
+                       "Clicking the checkbox should complete the exercise")
+    assert cards.nth(0).locator(".exercise-checkbox.checked").count() == 1, "Toggled card should be patched"
+    assert page.evaluate(replaced_js, ".exercise-item[data-key]") == 0, \
+        "Exercise cards should be patched in place, not re-created"
+    assert page.evaluate(replaced_js, ".phase-group[data-key]") == 0, \
+        "Sidebar phases should be patched in place, not re-created"
+    assert details.evaluate("el => el.open"), "A section opened by the learner should stay open"
+
+    app.open_main_view("planning")
+    page.locator('button[data-action="toggle-week-actions"]').first.click()
+    page.evaluate("() => { document.querySelector('.timeline-item[data-key]').__kept = true; }")
+    page.locator('.timeline-marker[data-action="toggle-week"]').first.click()
+    page.locator(".timeline-item.completed").first.wait_for()
+    assert page.evaluate(replaced_js, ".timeline-item[data-key]:first-child") == 0, "Week row should be patched in place"
+    assert page.locator(".week-actions.open").count() == 1, "Opened week actions should stay open"
+    app.screenshot("16_keyed_updates.png")
+    return "Toggles patch only the changed keyed nodes and keep disclosure state"
+
+
+@case("Running the minified build")
+def test_built_site(app):
+    page = app.page
+    page.goto(f"{built_site_base()}/index.html")
+    app.wait_ready()
+    assert page.evaluate("() => coursData.phases.every(p => p.lessons.every(l => Array.isArray(l.keyPoints)))"), \
+        "The build should keep coursData whole"
+
+    app.open_first_lesson()
+    page.locator(".key-points li").first.wait_for()
+    app.open_main_view("exercises")
+    page.locator(".exercise-copy").first.wait_for(state="attached")
+    app.screenshot("17_built_site.png")
+    return "The minified page renders lessons and exercises like the source"
+
+
+OFFLINE_READY_JS = """
+document.addEventListener('formation:offline-ready', event => {
+    window.__offlineReady = [...(window.__offlineReady || []), event.detail];
+});
+"""
+
+
+@case("Reloading the built site offline from the service worker")
+def test_offline_reload(app):
+    from build_site import TIMING_INIT_JS, TIMING_JS
+
+    page = app.page
+    base = built_site_base()
+    page.add_init_script(TIMING_INIT_JS + OFFLINE_READY_JS)
+    page.goto(f"{base}/index.html")
+    app.wait_ready()
+    first_visit = page.evaluate(TIMING_JS)
+    app.wait_until("() => (window.__offlineReady || []).length > 0 && !!navigator.serviceWorker.controller",
+                   message="The service worker never finished precaching")
+
+    app.reload()
+    repeat_visit = page.evaluate(TIMING_JS)
+    assert page.evaluate("() => performance.getEntriesByType('navigation')[0].workerStart > 0"), \
+        "The repeat visit should be served through the service worker"
+
+    page.context.set_offline(True)
+    try:
+        app.reload()
+        app.open_first_lesson()
+        page.locator(".key-points li").first.wait_for()
+        app.open_main_view("exercises")
+        page.locator(".exercise-copy").first.wait_for(state="attached")
+        app.screenshot("18_offline_reload.png")
+    finally:
+        page.context.set_offline(False)
+    return (f"Offline reload works; app ready {first_visit['ready_ms']:.0f} ms on the first visit, "
+            f"{repeat_visit['ready_ms']:.0f} ms on the repeat visit")
+
+
+@case("Updating the offline cache with only the changed files")
+def test_offline_cache_update(app):
+    from build_site import SERVICE_WORKER_TEMPLATE, write_service_worker
+
+    page = app.page
+    dist_dir, base, report = build_and_serve_site()
+    page.add_init_script(OFFLINE_READY_JS)
+    page.goto(f"{base}/index.html")
+    app.wait_ready()
+    app.wait_until("() => (window.__offlineReady || []).length > 0",
+                   message="The service worker never finished precaching")
+    first = page.evaluate("() => window.__offlineReady[0]")
+    manifest = report['manifest']
+    expected = [*manifest['precache'], *(path for path in manifest['transcripts'] if path.endswith("/manifest.json"))]
+    assert sorted(first['fetched']) == sorted(expected), \
+        "The first install should precache the page, the search index and the bundle manifest"
+
+    # A transcript read once is cached by the worker
+    transcript = next(path for path in sorted(manifest['transcripts']) if path.endswith(".txt"))
+    app.wait_until("() => !!navigator.serviceWorker.controller", message="The first install should claim the page")
+    page.evaluate("(path) => fetch(path).then(response => response.text())", transcript)
+
+    # A new build where only the search index and that transcript changed
+    for path in ("search-index.json", transcript):
+        with open(os.path.join(dist_dir, path), "a", encoding="utf-8") as f:
+            f.write("\n")
+    updated = write_service_worker(dist_dir, [*manifest['precache'], *manifest['transcripts']],
+                                   str(REPO_DIR / SERVICE_WORKER_TEMPLATE))
+    assert updated['version'] != manifest['version'], "Changing a file should change the worker"
+
+    page.evaluate("() => navigator.serviceWorker.getRegistration().then(registration => registration.update())")
+    app.wait_until("() => navigator.serviceWorker.getRegistration().then(registration => !!registration.waiting)",
+                   message="The updated service worker never finished installing")
+    assert len(page.evaluate("() => window.__offlineReady")) == 1, \
+        "The update should wait while a tab still runs the previous version"
+
+    # Closing the last tab of the previous version lets the update take over on the next visit
+    context = page.context
+    page.close()
+    app = FormationPage(context.new_page())
+    app.page.goto(f"{base}/index.html")
+    app.wait_ready()
+    stored_manifest_js = """() => caches.open('formation-precache')
+        .then(cache => cache.match(new URL('__precache-manifest__', location.href).href))
+        .then(response => response ? response.json() : null)"""
+    app.wait_until(f"(version) => ({stored_manifest_js})().then(stored => stored?.version === version)",
+                   updated['version'], "The updated service worker never activated")
+    update = app.page.evaluate(stored_manifest_js)['update']
+    assert update['previousVersion'] == manifest['version'], "The update should replace the first version"
+    assert sorted(update['fetched']) == sorted(["search-index.json", transcript]), \
+        f"Only the changed files should be fetched, got {update['fetched']}"
+    return (f"The update fetched 2 of {len(updated['precache']) + len(updated['transcripts'])} files "
+            f"(one precached, one cached transcript)")
+
+
+@case("Searching a transcript from the worker without long tasks")
+def test_transcript_worker_search(app):
+    page = app.page
+    page.goto(f"{built_site_base()}/index.html")
+    app.wait_ready()
+    page.evaluate("""() => {
+        const lesson = coursData.phases.flatMap(phase => phase.lessons).find(l => transcriptMap[l.videoId]);
+        navigateTo('lesson', { lessonId: lesson.id });
+    }""")
+    page.locator('.lesson-panel-tab[data-panel="transcript"]').click()
+    page.locator(".transcript-block").first.wait_for()
+    assert page.evaluate("() => transcriptView.documentId > 0 && !!transcriptWorker.worker"), \
+        "The transcript should be loaded and split by the worker"
+
+    page.evaluate("""() => {
+        window.__longTasks = 0;
+        new PerformanceObserver(list => { window.__longTasks += list.getEntries().length; })
+            .observe({ type: 'longtask' });
+    }""")
+    search = page.locator("#transcript-search")
+    search.click()
+    search.type("vous", delay=60)
+    app.wait_until("() => transcriptView.query === 'vous'", message="The search result never came back")
+    page.locator("mark.transcript-highlight.active").wait_for()
+    count = page.locator("#transcript-match-count").inner_text()
+    assert count.startswith("1 / "), f"Counter should show the first match, got {count!r}"
+    search.press("Enter")
+    assert page.locator("#transcript-match-count").inner_text().startswith("2 / "), "Enter should move to the next match"
+    long_tasks = page.evaluate("() => window.__longTasks")
+    assert long_tasks == 0, f"Typing in the transcript search caused {long_tasks} long tasks"
+    app.screenshot("19_transcript_worker_search.png")
+    return f"Matches come from the worker ({count.split('/')[-1].strip()} for 'vous') with no long task while typing"
+
+
+# ========================================
+# RUNNER
+# ========================================
+def run_case(browser, test_case: dict) -> dict:
+    """Run one case in a fresh browser context; never raises."""
+    context = browser.new_context(viewport=test_case['viewport'])
+    if not ALLOW_NETWORK:
+        # Invidious embeds and fonts would make timings depend on the network
+        context.route(re.compile(r"^https?://(?!127\.0\.0\.1[:/])"), lambda route: route.abort())
+    context.set_default_timeout(WAIT_TIMEOUT_MS)
+    page = context.new_page()
+    start = time.perf_counter()
+    result = {'number': test_case['number'], 'name': test_case['name'], 'title': test_case['title']}
+    try:
+        result['message'] = test_case['fn'](FormationPage(page))
+        result['ok'] = True
+    except Exception as e:
+        result['ok'] = False
+        result['error'] = f"{type(e).__name__}: {e}"
+        result['traceback'] = traceback.format_exc()
+        try:
+            page.screenshot(path=f"{SCREENSHOTS_DIR}/failed_{test_case['number']:02d}_{test_case['name']}.png",
+                            full_page=True)
+        except Exception:
+            pass
+    finally:
+        result['seconds'] = time.perf_counter() - start
+        context.close()
+    return result
+
+
+def run_shard(case_numbers: list) -> list:
+    """Worker process entry point: one browser, one context per case; never raises."""
+    selected = [c for c in CASES if c['number'] in case_numbers]
+    results = []
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=HEADLESS, slow_mo=SLOW_MO)
+            try:
+                for test_case in selected:
+                    results.append(run_case(browser, test_case))
+            finally:
+                browser.close()
+    except Exception as e:
+        # Chromium missing or crashed: the cases it did not run fail instead of the whole pool
+        first_line = (str(e).strip().splitlines() or [""])[0]
+        error = f"Browser unavailable: {type(e).__name__}: {first_line}"
+        trace = traceback.format_exc()
+        done = {r['number'] for r in results}
+        results += [
+            {'number': c['number'], 'name': c['name'], 'title': c['title'],
+             'ok': False, 'error': error, 'traceback': trace, 'seconds': 0.0}
+            for c in selected if c['number'] not in done
+        ]
+    return results
+
+
+def select_cases(keyword: str = None, shard: str = None) -> list:
+    selected = [c for c in CASES if not keyword or keyword.lower() in c['name'].lower()]
+    if shard:
+        index, total = (int(part) for part in shard.split('/'))
+        selected = selected[index - 1::total]
+    return selected
+
+
+def run_tests(workers: int = None, keyword: str = None, shard: str = None) -> int:
+    """
+    Run the selected cases sharded across `workers` processes.
+
+    Returns:
+        Number of failed cases
+    """
+    ensure_dir(SCREENSHOTS_DIR)
+    selected = select_cases(keyword, shard)
+    workers = max(1, min(workers or min(4, os.cpu_count() or 1), len(selected) or 1))
+    shards = [[c['number'] for c in selected[i::workers]] for i in range(workers)]
+
+    print("=" * 60)
+    print("TESTING: Formation E-commerce Organique Interactive")
+    print(f"{len(selected)} cases across {workers} worker process(es)")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    if workers == 1:
+        shard_results = [run_shard(shards[0])]
+    else:
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            shard_results = pool.map(run_shard, shards)
+    elapsed = time.perf_counter() - start
+
+    results = sorted((r for shard_result in shard_results for r in shard_result), key=lambda r: r['number'])
+    for result in results:
+        print(f"\n[TEST {result['number']}] {result['title']}... ({result['seconds']:.1f}s)")
+        if result['ok']:
+            print(f"  ✅ {result['message']}")
+        else:
+            print(f"  ❌ {result['error']}")
+            print("    " + result['traceback'].strip().replace("\n", "\n    "))
+
+    failed = [r for r in results if not r['ok']]
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    print(f"Passed: {len(results) - len(failed)}/{len(results)} in {elapsed:.1f}s "
+          f"(sum of case times {sum(r['seconds'] for r in results):.1f}s)")
+    print(f"Screenshots saved to: {SCREENSHOTS_DIR}/")
+    if failed:
+        print("\nFailed: " + ", ".join(f"{r['number']} ({r['name']})" for r in failed))
+    else:
         print("\nAll completion-first regression checks finished successfully.")
-        print("=" * 60)
+    print("=" * 60)
+    return len(failed)
+
 
-        print("\nBrowser will close in 5 seconds...")
-        page.wait_for_timeout(5000)
-        browser.close()
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the course page regression cases.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes, each with its own browser (default: min(4, CPU cores))")
+    parser.add_argument('-k', dest='keyword', help="Only run cases whose name contains this text")
+    parser.add_argument('--shard', help="Run only shard I of N, as I/N (for splitting across CI jobs)")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    run_tests()
+    args = parse_args()
+    raise SystemExit(1 if run_tests(args.workers, args.keyword, args.shard) else 0)
@@ -12,11 +12,25 @@ This runs entirely locally - no API keys or cloud services needed.
 """
 
 import os
-import json
 import subprocess
 import sys
+import time
+import argparse
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+from combine_transcripts import build_combined_transcripts, combined_paths
+from transcript_index import build_index, index_dir
+from segment_store import save_segments
+from build_transcript_bundle import build_transcript_bundle, bundle_dir
+from build_search_index import SEARCH_INDEX_PATH, build_search_index, write_search_index
+from results_store import CAPTIONS, WHISPER, ResultsStore
+from run_metrics import METRICS_DIR, RATIO_BUCKETS, RunMetrics, partial_profile_path, profile_to_file
+
+METRICS_JOB = "transcribe_missing_videos"
+
 # Check for required packages
 def check_and_install_packages():
     """Check and install required packages."""
@@ -44,28 +58,34 @@ def check_and_install_packages():
         return True
     return False
 
-def get_failed_videos():
-    """Get list of videos that failed to get transcripts."""
-    results_path = "transcripts/all_results.json"
-
-    if not os.path.exists(results_path):
-        print("❌ No results file found. Run fetch_transcripts.py first.")
+def get_failed_videos(store: ResultsStore):
+    """Get list of videos that failed to get transcripts and have no Whisper transcript yet."""
+    if CAPTIONS not in store.counts():
+        print("❌ No caption results found. Run fetch_transcripts.py first.")
         return []
 
-    with open(results_path, 'r', encoding='utf-8') as f:
-        results = json.load(f)
+    return store.failed_captions()
 
-    failed_videos = [
-        video for video in results
-        if not video.get('transcript_success', False)
-    ]
+# Extensions yt-dlp may leave behind for a finished audio stream (legacy runs used .mp3)
+AUDIO_EXTENSIONS = ('.webm', '.opus', '.m4a', '.ogg', '.mp3', '.mp4')
 
-    return failed_videos
+WHISPER_SAMPLE_RATE = 16000
+
+def find_cached_audio(video_id: str, output_dir: str) -> str:
+    """Return the cached audio file for a video ID, whatever its container, or None."""
+    for ext in AUDIO_EXTENSIONS:
+        path = os.path.join(output_dir, f"{video_id}{ext}")
+        if os.path.exists(path):
+            return path
+    return None
 
 def download_audio(video_id: str, output_dir: str) -> str:
     """
     Download audio from a YouTube video using yt-dlp.
 
+    The native audio stream (usually Opus/WebM or AAC/M4A) is kept as-is: no
+    MP3 re-encode, since Whisper decodes and resamples to 16 kHz mono anyway.
+
     Args:
         video_id: YouTube video ID
         output_dir: Directory to save the audio file
@@ -75,21 +95,16 @@ def download_audio(video_id: str, output_dir: str) -> str:
     """
     import yt_dlp
 
-    output_path = os.path.join(output_dir, f"{video_id}.mp3")
-
     # Skip if already downloaded
-    if os.path.exists(output_path):
-        return output_path
+    cached_path = find_cached_audio(video_id, output_dir)
+    if cached_path:
+        return cached_path
 
     url = f"https://www.youtube.com/watch?v={video_id}"
 
     ydl_opts = {
-        'format': 'bestaudio/best',
-        'postprocessors': [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': 'mp3',
-            'preferredquality': '192',
-        }],
+        # Smallest-overhead audio-only streams first; no postprocessing
+        'format': 'bestaudio[ext=webm]/bestaudio[ext=m4a]/bestaudio/best',
         'outtmpl': os.path.join(output_dir, f"{video_id}.%(ext)s"),
         'quiet': True,
         'no_warnings': True,
@@ -97,41 +112,122 @@ def download_audio(video_id: str, output_dir: str) -> str:
 
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
-        return output_path
+            info = ydl.extract_info(url, download=True)
+            return ydl.prepare_filename(info)
     except Exception as e:
         print(f"  ❌ Download failed: {e}")
         return None
 
-def transcribe_audio(audio_path: str, model_name: str = "base") -> dict:
+def pcm_cache_path(audio_path: str) -> str:
+    """Path of the 16 kHz mono int16 .npy cached next to an audio file."""
+    return os.path.splitext(audio_path)[0] + ".pcm16.npy"
+
+def load_audio_16k(audio_path: str, keep_pcm: bool = False):
+    """
+    Decode an audio file to the 16 kHz mono float32 array Whisper expects.
+
+    With `keep_pcm`, the decoded samples are also stored as int16 .npy next to
+    the source, and later calls load that file instead of running ffmpeg.
+
+    Returns:
+        (float32 numpy array, seconds spent decoding/loading)
+    """
+    import numpy as np
+    import whisper
+
+    start = time.perf_counter()
+    pcm_path = pcm_cache_path(audio_path)
+
+    if os.path.exists(pcm_path):
+        audio = np.load(pcm_path).astype(np.float32) / 32768.0
+    else:
+        audio = whisper.load_audio(audio_path)
+        if keep_pcm:
+            samples = np.clip(audio * 32768.0, -32768, 32767).astype(np.int16)
+            np.save(pcm_path, samples)
+
+    return audio, time.perf_counter() - start
+
+def audio_disk_usage(audio_path: str) -> int:
+    """Bytes used on disk by a cached audio file and its .npy sidecar, if any."""
+    return sum(
+        os.path.getsize(path)
+        for path in (audio_path, pcm_cache_path(audio_path))
+        if os.path.exists(path)
+    )
+
+def remove_audio(audio_path: str) -> None:
+    """Delete a downloaded audio file and its .npy sidecar, if any."""
+    for path in (audio_path, pcm_cache_path(audio_path)):
+        if os.path.exists(path):
+            os.remove(path)
+
+# Whisper model cached per process, so each worker loads the weights only once
+_loaded_models = {}
+# Seconds spent loading models in this process, not yet reported in a result
+_unreported_model_load_seconds = []
+
+
+def get_whisper_model(model_name: str = "base"):
+    """Load a Whisper model on first use and reuse it for the rest of the process."""
+    import whisper
+
+    if model_name not in _loaded_models:
+        start = time.perf_counter()
+        _loaded_models[model_name] = whisper.load_model(model_name)
+        _unreported_model_load_seconds.append(time.perf_counter() - start)
+    return _loaded_models[model_name]
+
+
+def transcribe_audio(audio_path: str, model_name: str = "base", keep_pcm: bool = False,
+                     metrics_dir: str = None) -> dict:
     """
     Transcribe audio file using OpenAI Whisper.
 
     Args:
         audio_path: Path to the audio file
         model_name: Whisper model to use (tiny, base, small, medium, large)
+        keep_pcm: Cache the decoded 16 kHz samples as .npy for later runs
+        metrics_dir: When set, profile this call into the per-process partial
+            profile of the "whisper" stage under this metrics directory
 
     Returns:
-        Dictionary with transcription results
+        Dictionary with transcription results and timing (audio seconds,
+        preprocessing seconds, wall seconds, real-time factor = wall / audio,
+        and model load seconds the first time this process loads the model)
     """
-    import whisper
+    if metrics_dir:
+        with profile_to_file(partial_profile_path(metrics_dir, METRICS_JOB, 'whisper')):
+            return transcribe_audio(audio_path, model_name, keep_pcm)
 
     try:
-        # Load model (will download on first use)
-        model = whisper.load_model(model_name)
+        # Load model (cached after the first call in this process)
+        model = get_whisper_model(model_name)
+        model_load_seconds = sum(_unreported_model_load_seconds)
+        _unreported_model_load_seconds.clear()
+
+        start = time.perf_counter()
+        audio, preprocess_seconds = load_audio_16k(audio_path, keep_pcm)
+        audio_seconds = len(audio) / WHISPER_SAMPLE_RATE
 
         # Transcribe with language detection
         result = model.transcribe(
-            audio_path,
+            audio,
             language=None,  # Auto-detect language
             verbose=False
         )
+        wall_seconds = time.perf_counter() - start
 
         return {
             'success': True,
             'text': result['text'],
             'language': result.get('language', 'unknown'),
-            'segments': result.get('segments', [])
+            'segments': result.get('segments', []),
+            'audio_seconds': audio_seconds,
+            'preprocess_seconds': preprocess_seconds,
+            'wall_seconds': wall_seconds,
+            'rtf': wall_seconds / audio_seconds if audio_seconds else None,
+            'model_load_seconds': model_load_seconds,
         }
     except Exception as e:
         return {
@@ -139,7 +235,207 @@ def transcribe_audio(audio_path: str, model_name: str = "base") -> dict:
             'error': str(e)
         }
 
-def main():
+def _init_transcription_worker(model_name: str, threads: int) -> None:
+    """Process-pool initializer: pin torch threads and load the model once."""
+    import torch
+
+    torch.set_num_threads(threads)
+    get_whisper_model(model_name)
+
+class TranscriptionEngine:
+    """
+    Spread Whisper transcriptions across a pool of worker processes.
+
+    Each worker loads the model once (in its initializer) and then decodes
+    queued files with `threads_per_worker` torch threads. By default the pool
+    fills the machine: workers x threads_per_worker = CPU cores. With
+    `profile_metrics_dir`, workers profile their calls into per-process files
+    that RunMetrics.write() merges.
+    """
+
+    def __init__(self, model_name: str = "base", workers: int = None, threads_per_worker: int = None,
+                 keep_pcm: bool = False, profile_metrics_dir: str = None):
+        cpu_count = os.cpu_count() or 1
+        self.model_name = model_name
+        self.keep_pcm = keep_pcm
+        self.profile_metrics_dir = profile_metrics_dir
+        self.threads_per_worker = max(1, threads_per_worker or min(4, cpu_count))
+        self.workers = max(1, workers or cpu_count // self.threads_per_worker)
+
+        self.pool = None
+
+    def __enter__(self):
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_transcription_worker,
+            initargs=(self.model_name, self.threads_per_worker),
+        )
+        return self
+
+    def __exit__(self, *exc_info):
+        self.pool.shutdown()
+        self.pool = None
+
+    def submit(self, audio_path: str):
+        """Queue one file on the pool; returns a Future of the transcription dict."""
+        return self.pool.submit(transcribe_audio, audio_path, self.model_name, self.keep_pcm, self.profile_metrics_dir)
+
+    def transcribe(self, audio_path: str) -> dict:
+        """Transcribe one file on the pool and wait for the result."""
+        return self.submit(audio_path).result()
+
+    def transcribe_many(self, audio_paths: list):
+        """
+        Transcribe several audio files in parallel.
+
+        Yields:
+            (audio_path, transcription dict) as each file finishes
+        """
+        with self:
+            futures = {self.submit(path): path for path in audio_paths}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+def run_pipeline(videos: list, download, transcribe,
+                 download_workers: int = 2, transcribe_workers: int = 1, max_pending: int = 2):
+    """
+    Overlap audio downloads with transcription (producer/consumer).
+
+    Download threads feed a bounded queue that transcription threads drain.
+    When `max_pending` downloaded files are waiting, downloaders block, so at
+    most max_pending + download_workers + transcribe_workers audio files are
+    on disk but not yet transcribed. The pipeline never deletes audio: disk use
+    only stays bounded if the caller removes each file once its result is
+    handled (main() does, unless --keep-audio or --pcm-cache); the files
+    transcribed but not yet handled, at most one per transcription worker while
+    the caller keeps up, add to the bound.
+
+    Args:
+        videos: Video dictionaries to process
+        download: Callable(video) -> audio path, or None if the download failed
+        transcribe: Callable(audio_path) -> transcription dict
+        download_workers: Concurrent downloads
+        transcribe_workers: Concurrent transcriptions
+        max_pending: Capacity of the downloaded-but-not-transcribed queue
+
+    Yields:
+        (video, audio_path or None, transcription dict or None) as each video finishes
+    """
+    todo = queue.Queue()
+    for video in videos:
+        todo.put(video)
+    ready = queue.Queue(maxsize=max(1, max_pending))
+    finished = queue.Queue()
+
+    def download_stage():
+        while True:
+            try:
+                video = todo.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                audio_path = download(video)
+            except Exception as e:
+                print(f"  ❌ Download failed: {e}")
+                audio_path = None
+            if audio_path:
+                ready.put((video, audio_path))  # Blocks while the queue is full
+            else:
+                finished.put((video, None, None))
+
+    def transcribe_stage():
+        while True:
+            item = ready.get()
+            if item is None:
+                return
+            video, audio_path = item
+            try:
+                transcription = transcribe(audio_path)
+            except Exception as e:
+                transcription = {'success': False, 'error': str(e)}
+            finished.put((video, audio_path, transcription))
+
+    downloaders = [threading.Thread(target=download_stage, daemon=True)
+                   for _ in range(max(1, download_workers))]
+    transcribers = [threading.Thread(target=transcribe_stage, daemon=True)
+                    for _ in range(max(1, transcribe_workers))]
+    for thread in downloaders + transcribers:
+        thread.start()
+
+    def close_ready_queue():
+        for thread in downloaders:
+            thread.join()
+        for _ in transcribers:
+            ready.put(None)
+
+    threading.Thread(target=close_ready_queue, daemon=True).start()
+
+    for _ in videos:
+        yield finished.get()
+
+def record_transcription_metrics(metrics: RunMetrics, transcription: dict) -> None:
+    """Split one worker-side transcription into model load, audio decode and Whisper decode."""
+    if transcription.get('model_load_seconds'):
+        metrics.observe('stage_seconds', transcription['model_load_seconds'], stage='model_load')
+    metrics.observe('stage_seconds', transcription['preprocess_seconds'], stage='audio_decode')
+    metrics.observe('stage_seconds', transcription['wall_seconds'] - transcription['preprocess_seconds'],
+                    stage='whisper_decode')
+    metrics.inc('audio_seconds_total', transcription['audio_seconds'])
+    metrics.inc('wall_seconds_total', transcription['wall_seconds'])
+    if transcription['rtf'] is not None:
+        metrics.observe('whisper_rtf', transcription['rtf'], buckets=RATIO_BUCKETS)
+
+def save_whisper_transcript(video: dict, transcription: dict, transcript_dir: str, model_name: str) -> str:
+    """
+    Write a Whisper transcript with its header block.
+
+    Returns:
+        Path to the written .txt file
+    """
+    video_id = video['id']
+    safe_title = "".join(c for c in video['title'] if c.isalnum() or c in ' -_')[:50]
+    transcript_path = os.path.join(transcript_dir, f"{video_id}_{safe_title}_whisper.txt")
+
+    with open(transcript_path, 'w', encoding='utf-8') as f:
+        f.write(f"Title: {video['title']}\n")
+        f.write(f"Video ID: {video_id}\n")
+        f.write(f"URL: https://www.youtube.com/watch?v={video_id}\n")
+        f.write(f"Duration: {video.get('duration', 'Unknown')}\n")
+        f.write(f"Transcribed with: OpenAI Whisper ({model_name})\n")
+        f.write(f"Detected Language: {transcription.get('language', 'unknown')}\n")
+        f.write("=" * 60 + "\n\n")
+        f.write(transcription['text'])
+
+    return transcript_path
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Transcribe videos without captions using Whisper.")
+    parser.add_argument('--model', default="base",
+                        help="Whisper model: tiny, base, small, medium, large (default: base)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Transcription processes (default: CPU cores / threads per worker)")
+    parser.add_argument('--threads-per-worker', type=int, default=None,
+                        help="Torch threads per process (default: min(4, CPU cores))")
+    parser.add_argument('--download-workers', type=int, default=2,
+                        help="Concurrent audio downloads (default: 2)")
+    parser.add_argument('--max-pending', type=int, default=2,
+                        help="Downloaded files allowed to wait for transcription (default: 2)")
+    parser.add_argument('--pcm-cache', action='store_true',
+                        help="Keep decoded 16 kHz mono audio as .npy so re-runs skip ffmpeg "
+                             "(implies --keep-audio: the .npy is only found next to its audio file)")
+    parser.add_argument('--keep-audio', action='store_true',
+                        help="Keep downloaded audio (and .npy) after its transcript is saved (default: delete them)")
+    parser.add_argument('--metrics-dir', default=METRICS_DIR,
+                        help=f"Where the Prometheus textfile and JSON run summary go (default: {METRICS_DIR})")
+    parser.add_argument('--profile', action='store_true',
+                        help="Run each stage under cProfile and save one .prof file per stage")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    # A re-run finds the .npy through the audio file, so the cache needs both
+    keep_audio = args.keep_audio or args.pcm_cache
+
     print("=" * 60)
     print("YouTube Video Transcription Tool")
     print("Using: yt-dlp + OpenAI Whisper (100% local & open-source)")
@@ -155,7 +451,7 @@ def main():
     # Configuration
     AUDIO_DIR = "audio_downloads"
     TRANSCRIPT_DIR = "transcripts"
-    WHISPER_MODEL = "base"  # Options: tiny, base, small, medium, large
+    WHISPER_MODEL = args.model  # Options: tiny, base, small, medium, large
     # Note: "base" is a good balance of speed and accuracy
     # "tiny" is faster but less accurate
     # "medium" or "large" are more accurate but slower and need more RAM
@@ -163,109 +459,119 @@ def main():
     os.makedirs(AUDIO_DIR, exist_ok=True)
     os.makedirs(TRANSCRIPT_DIR, exist_ok=True)
 
-    # Get videos that failed
-    failed_videos = get_failed_videos()
+    # Get videos that failed; results are upserted into the store as they finish
+    store = ResultsStore(TRANSCRIPT_DIR)
+    failed_videos = get_failed_videos(store)
 
     if not failed_videos:
         print("✅ All videos already have transcripts!")
         return
 
+    metrics = RunMetrics(METRICS_JOB, args.metrics_dir, profile=args.profile)
+    engine = TranscriptionEngine(WHISPER_MODEL, args.workers, args.threads_per_worker, args.pcm_cache,
+                                 profile_metrics_dir=args.metrics_dir if args.profile else None)
+
     print(f"📋 Found {len(failed_videos)} videos without transcripts")
-    print(f"🎤 Using Whisper model: {WHISPER_MODEL}")
+    print(f"🎤 Using Whisper model: {WHISPER_MODEL} "
+          f"({engine.workers} workers x {engine.threads_per_worker} threads)")
     print()
 
-    # Process each video
     results = []
     successful = 0
     failed = 0
 
-    for i, video in enumerate(failed_videos, 1):
-        video_id = video['id']
-        title = video['title'][:50]
-
-        print(f"\n[{i}/{len(failed_videos)}] {title}...")
-
-        # Step 1: Download audio
-        print("  📥 Downloading audio...")
-        audio_path = download_audio(video_id, AUDIO_DIR)
-
-        if not audio_path or not os.path.exists(audio_path):
-            print("  ❌ Download failed, skipping...")
-            failed += 1
-            results.append({
-                **video,
-                'whisper_success': False,
-                'error': 'Download failed'
-            })
-            continue
-
-        # Step 2: Transcribe with Whisper
-        print("  🎤 Transcribing with Whisper...")
-        transcription = transcribe_audio(audio_path, WHISPER_MODEL)
-
-        if transcription['success']:
-            successful += 1
-            print(f"  ✅ Success! (Language: {transcription.get('language', 'unknown')})")
-
-            # Save individual transcript
-            safe_title = "".join(c for c in video['title'] if c.isalnum() or c in ' -_')[:50]
-            transcript_path = os.path.join(TRANSCRIPT_DIR, f"{video_id}_{safe_title}_whisper.txt")
-
-            with open(transcript_path, 'w', encoding='utf-8') as f:
-                f.write(f"Title: {video['title']}\n")
-                f.write(f"Video ID: {video_id}\n")
-                f.write(f"URL: https://www.youtube.com/watch?v={video_id}\n")
-                f.write(f"Duration: {video.get('duration', 'Unknown')}\n")
-                f.write(f"Transcribed with: OpenAI Whisper ({WHISPER_MODEL})\n")
-                f.write(f"Detected Language: {transcription.get('language', 'unknown')}\n")
-                f.write("=" * 60 + "\n\n")
-                f.write(transcription['text'])
-
-            results.append({
-                **video,
-                'whisper_success': True,
-                'whisper_language': transcription.get('language'),
-                'transcript_file': transcript_path
-            })
-        else:
-            failed += 1
-            print(f"  ❌ Transcription failed: {transcription.get('error', 'Unknown error')[:50]}")
-            results.append({
-                **video,
-                'whisper_success': False,
-                'error': transcription.get('error', 'Unknown error')
-            })
-
-    # Save results
-    whisper_results_path = os.path.join(TRANSCRIPT_DIR, "whisper_results.json")
-    with open(whisper_results_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
-
-    # Append to combined transcripts
-    combined_path = os.path.join(TRANSCRIPT_DIR, "COMBINED_TRANSCRIPTS.txt")
-    with open(combined_path, 'a', encoding='utf-8') as f:
-        f.write("\n\n" + "=" * 80 + "\n")
-        f.write("WHISPER TRANSCRIPTIONS (Videos without YouTube subtitles)\n")
-        f.write("=" * 80 + "\n")
-
-        for result in results:
-            if result.get('whisper_success') and 'transcript_file' in result:
-                f.write("\n" + "=" * 80 + "\n")
-                f.write(f"VIDEO: {result['title']}\n")
-                f.write(f"URL: https://www.youtube.com/watch?v={result['id']}\n")
-                f.write(f"Duration: {result.get('duration', 'Unknown')}\n")
-                f.write(f"Transcribed with: Whisper ({WHISPER_MODEL})\n")
-                f.write("=" * 80 + "\n\n")
-
-                try:
-                    with open(result['transcript_file'], 'r', encoding='utf-8') as tf:
-                        content = tf.read()
-                        if "=" * 60 in content:
-                            content = content.split("=" * 60 + "\n\n", 1)[-1]
-                        f.write(content)
-                except:
-                    pass
-                f.write("\n\n")
+    def download(video):
+        with metrics.stage('audio_download'):
+            audio_path = download_audio(video['id'], AUDIO_DIR)
+        ok = bool(audio_path and os.path.exists(audio_path))
+        metrics.record_item('audio_download', ok, audio_disk_usage(audio_path) if ok else None)
+        return audio_path if ok else None
+
+    def transcribe(audio_path):
+        # Includes time queued for a free worker process
+        with metrics.stage('transcribe'):
+            return engine.transcribe(audio_path)
+
+    # Download and transcribe concurrently: the network and CPU stay busy together
+    with engine:
+        pipeline = run_pipeline(
+            failed_videos, download, transcribe,
+            download_workers=args.download_workers,
+            transcribe_workers=engine.workers,
+            max_pending=args.max_pending,
+        )
+        for i, (video, audio_path, transcription) in enumerate(pipeline, 1):
+            print(f"\n[{i}/{len(failed_videos)}] {video['title'][:50]}...")
+
+            if audio_path is None:
+                print("  ❌ Download failed, skipping...")
+                failed += 1
+                results.append({
+                    **video,
+                    'whisper_success': False,
+                    'error': 'Download failed'
+                })
+                store.record(WHISPER, results[-1])
+                continue
+
+            metrics.record_item('transcribe', transcription['success'])
+            if transcription['success']:
+                successful += 1
+                record_transcription_metrics(metrics, transcription)
+                audio_bytes = audio_disk_usage(audio_path)
+                print(f"  ✅ Success! (Language: {transcription.get('language', 'unknown')}, "
+                      f"{transcription['audio_seconds']:.0f}s audio in {transcription['wall_seconds']:.0f}s, "
+                      f"RTF {transcription['rtf'] or 0:.2f})")
+                print(f"  💾 Audio cache: {audio_bytes / 1e6:.1f} MB, "
+                      f"preprocessing {transcription['preprocess_seconds']:.1f}s")
+
+                transcript_path = save_whisper_transcript(video, transcription, TRANSCRIPT_DIR, WHISPER_MODEL)
+                segments_path = save_segments(video['id'], transcription.get('segments'), TRANSCRIPT_DIR)
+
+                results.append({
+                    **video,
+                    'whisper_success': True,
+                    'whisper_language': transcription.get('language'),
+                    'segments_file': segments_path,
+                    'whisper_rtf': round(transcription['rtf'] or 0, 3),
+                    'audio_bytes': audio_bytes,
+                    'preprocess_seconds': round(transcription['preprocess_seconds'], 3),
+                    'transcript_file': transcript_path
+                })
+            else:
+                failed += 1
+                print(f"  ❌ Transcription failed: {transcription.get('error', 'Unknown error')[:50]}")
+                results.append({
+                    **video,
+                    'whisper_success': False,
+                    'error': transcription.get('error', 'Unknown error')
+                })
+            store.record(WHISPER, results[-1])
+            # Failed videos keep theirs: the next run retries them without downloading again
+            if transcription['success'] and not keep_audio:
+                remove_audio(audio_path)
+
+    # whisper_results.json stays available for readers of the old format
+    whisper_results_path = store.export_json(WHISPER)
+
+    # Rebuild the combined transcripts so Whisper sections are replaced, not appended again
+    combined_path, _ = combined_paths(TRANSCRIPT_DIR)
+    with metrics.stage('combine'):
+        build_combined_transcripts(TRANSCRIPT_DIR)
+
+    # Re-tokenize only the new/changed transcripts in the search index
+    with metrics.stage('search_index'):
+        index_stats = build_index(TRANSCRIPT_DIR)
+
+    # Refresh the compressed bundle the course page loads transcripts from
+    with metrics.stage('bundle'):
+        build_transcript_bundle(TRANSCRIPT_DIR)
+
+    # The page's header search indexes transcript text too
+    with metrics.stage('header_search_index'):
+        header_index = build_search_index(transcript_dir=TRANSCRIPT_DIR)
+        write_search_index(header_index)
+    metrics_files = metrics.write()
 
     # Summary
     print("\n" + "=" * 60)
@@ -274,11 +580,25 @@ def main():
     print(f"Total videos processed: {len(failed_videos)}")
     print(f"Successfully transcribed: {successful}")
     print(f"Failed: {failed}")
+    cached_bytes = sum(r.get('audio_bytes', 0) for r in results)
+    preprocess_seconds = sum(r.get('preprocess_seconds', 0) for r in results)
+    print(f"Audio cache: {cached_bytes / 1e6:.1f} MB, preprocessing {preprocess_seconds:.1f}s total")
+    audio_seconds = metrics.value('audio_seconds_total')
+    wall_seconds = metrics.value('wall_seconds_total')
+    if audio_seconds:
+        print(f"Whisper: {audio_seconds / 60:.0f} min of audio in {wall_seconds / 60:.1f} min "
+              f"(RTF {wall_seconds / audio_seconds:.2f})")
     print(f"\nOutput files:")
-    print(f"  📁 Audio files: {AUDIO_DIR}/")
+    print(f"  📁 Audio files: {AUDIO_DIR}/" + ("" if keep_audio else " (transcribed ones deleted)"))
     print(f"  📋 Whisper results: {whisper_results_path}")
     print(f"  📖 Individual transcripts: {TRANSCRIPT_DIR}/")
     print(f"  📖 Combined transcripts updated: {combined_path}")
+    print(f"  🔍 Search index: {index_dir(TRANSCRIPT_DIR)}/ ({index_stats['reindexed']} transcripts re-indexed)")
+    print(f"  📦 Page transcript bundle: {bundle_dir(TRANSCRIPT_DIR)}/")
+    print(f"  🔎 Header search index: {SEARCH_INDEX_PATH} (version {header_index['version']})")
+    print(f"  📈 Metrics: {metrics_files['prometheus']}, {metrics_files['summary']}")
+    for path in metrics_files['profiles']:
+        print(f"  ⏱️  Profile: {path}")
     print("=" * 60)
 
 if __name__ == "__main__":
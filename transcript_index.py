@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Transcript Full-Text Index
+==========================
+Positional inverted index over every transcript in transcripts/ (YouTube
+captions and Whisper output), with BM25 ranking and "exact phrase" queries.
+
+Tokens are accent-folded and lower-cased ("Créer", "creer" and "CRÉER" all
+match), so French and English queries work without diacritics.
+
+On-disk layout (transcripts/search_index/):
+- docs.json:     indexed documents (video ID, title, file, size/mtime, length)
+- lexicon.json:  term -> [document frequency, byte offset, byte length]
+- postings.bin:  per term, varint-encoded (doc delta, tf, position deltas...)
+
+Only the postings of the query terms are read, with one seek each, so queries
+answer in milliseconds. Rebuilds are incremental: unchanged files (same size
+and mtime) keep their postings, and only new or modified transcripts are
+re-tokenized.
+
+Usage:
+    python3 transcript_index.py build [--full]
+    python3 transcript_index.py search 'produit gagnant "page produit"' [-n 10]
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import argparse
+import unicodedata
+
+from combine_transcripts import collect_transcript_entries, read_transcript_file
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+PHRASE_PATTERN = re.compile(r'"([^"]+)"')
+# Ligatures NFKD leaves alone
+EXTRA_FOLDS = str.maketrans({'œ': 'oe', 'æ': 'ae', 'ß': 'ss'})
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def index_dir(transcript_dir: str) -> str:
+    return os.path.join(transcript_dir, "search_index")
+
+
+def fold(text: str) -> str:
+    """Lower-case and strip accents: 'Élève' -> 'eleve'."""
+    decomposed = unicodedata.normalize('NFKD', text.lower().translate(EXTRA_FOLDS))
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> list:
+    """Split text into accent-folded terms, in order."""
+    return [fold(match.group()) for match in TOKEN_PATTERN.finditer(text)]
+
+
+def tokenize_with_offsets(text: str):
+    """Yield (term, start, end) with character offsets into the original text."""
+    for match in TOKEN_PATTERN.finditer(text):
+        yield fold(match.group()), match.start(), match.end()
+
+
+# ----------------------------------------------------------------------------
+# Varint postings encoding
+# ----------------------------------------------------------------------------
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos: int) -> tuple:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def encode_postings(postings: dict) -> bytes:
+    """Encode {doc_number: [positions]} as varints with doc and position deltas."""
+    out = bytearray()
+    _write_varint(out, len(postings))
+    previous_doc = 0
+    for doc in sorted(postings):
+        positions = postings[doc]
+        _write_varint(out, doc - previous_doc)
+        _write_varint(out, len(positions))
+        previous_position = 0
+        for position in positions:
+            _write_varint(out, position - previous_position)
+            previous_position = position
+        previous_doc = doc
+    return bytes(out)
+
+
+def decode_postings(data) -> dict:
+    """Inverse of encode_postings()."""
+    postings = {}
+    count, pos = _read_varint(data, 0)
+    doc = 0
+    for _ in range(count):
+        delta, pos = _read_varint(data, pos)
+        doc += delta
+        tf, pos = _read_varint(data, pos)
+        positions = []
+        position = 0
+        for _ in range(tf):
+            delta, pos = _read_varint(data, pos)
+            position += delta
+            positions.append(position)
+        postings[doc] = positions
+    return postings
+
+
+# ----------------------------------------------------------------------------
+# Building
+# ----------------------------------------------------------------------------
+
+def _file_signature(path: str) -> list:
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _load_existing(directory: str) -> tuple:
+    """Return (docs list, {term: {doc: positions}}) from a previous build, or empty."""
+    try:
+        with open(os.path.join(directory, "docs.json"), 'r', encoding='utf-8') as f:
+            docs = json.load(f)['docs']
+        with open(os.path.join(directory, "lexicon.json"), 'r', encoding='utf-8') as f:
+            lexicon = json.load(f)
+        with open(os.path.join(directory, "postings.bin"), 'rb') as f:
+            data = f.read()
+    except (OSError, ValueError, KeyError):
+        return [], {}
+
+    view = memoryview(data)
+    terms = {
+        term: decode_postings(view[offset:offset + length])
+        for term, (_, offset, length) in lexicon.items()
+    }
+    return docs, terms
+
+
+def build_index(transcript_dir: str = "transcripts", full: bool = False) -> dict:
+    """
+    Build or incrementally update the on-disk index.
+
+    Args:
+        transcript_dir: Directory with the transcripts and results JSON
+        full: Ignore the previous build and re-tokenize everything
+
+    Returns:
+        Stats: {'documents', 'terms', 'reindexed', 'removed', 'seconds'}
+    """
+    start = time.perf_counter()
+    directory = index_dir(transcript_dir)
+    os.makedirs(directory, exist_ok=True)
+
+    captions, whispers = collect_transcript_entries(transcript_dir)
+    wanted = {}
+    for source, entries in (('captions', captions), ('whisper', whispers)):
+        for result in entries:
+            wanted[result['id']] = {
+                'id': result['id'],
+                'title': result['title'],
+                'file': result['transcript_file'],
+                'source': source,
+                'signature': _file_signature(result['transcript_file']),
+            }
+
+    old_docs, old_terms = ([], {}) if full else _load_existing(directory)
+
+    # Keep documents whose file is unchanged; everything else gets re-tokenized
+    kept = {}
+    for number, doc in enumerate(old_docs):
+        current = wanted.get(doc['id'])
+        if current and current['file'] == doc['file'] and current['signature'] == doc['signature']:
+            kept[number] = doc
+    kept_ids = {doc['id'] for doc in kept.values()}
+    to_index = [doc for video_id, doc in wanted.items() if video_id not in kept_ids]
+
+    # Renumber documents compactly: kept ones first (old order), then new ones
+    docs = []
+    renumber = {}
+    for old_number, doc in sorted(kept.items()):
+        renumber[old_number] = len(docs)
+        docs.append(doc)
+
+    terms = {}
+    for term, postings in old_terms.items():
+        remapped = {renumber[doc]: positions for doc, positions in postings.items() if doc in renumber}
+        if remapped:
+            terms[term] = remapped
+
+    for doc in to_index:
+        number = len(docs)
+        _, body = read_transcript_file(doc['file'])
+        tokens = tokenize(body)
+        for position, term in enumerate(tokens):
+            terms.setdefault(term, {}).setdefault(number, []).append(position)
+        docs.append({**doc, 'length': len(tokens)})
+
+    # Write postings + lexicon, then docs.json last (it marks the build complete)
+    lexicon = {}
+    tmp_postings = os.path.join(directory, "postings.bin.tmp")
+    with open(tmp_postings, 'wb') as f:
+        for term in sorted(terms):
+            encoded = encode_postings(terms[term])
+            lexicon[term] = [len(terms[term]), f.tell(), len(encoded)]
+            f.write(encoded)
+
+    tmp_lexicon = os.path.join(directory, "lexicon.json.tmp")
+    with open(tmp_lexicon, 'w', encoding='utf-8') as f:
+        json.dump(lexicon, f, ensure_ascii=False, separators=(',', ':'))
+
+    average_length = sum(doc['length'] for doc in docs) / len(docs) if docs else 0
+    tmp_docs = os.path.join(directory, "docs.json.tmp")
+    with open(tmp_docs, 'w', encoding='utf-8') as f:
+        json.dump({'average_length': average_length, 'docs': docs}, f, ensure_ascii=False, indent=1)
+
+    os.replace(tmp_postings, os.path.join(directory, "postings.bin"))
+    os.replace(tmp_lexicon, os.path.join(directory, "lexicon.json"))
+    os.replace(tmp_docs, os.path.join(directory, "docs.json"))
+
+    return {
+        'documents': len(docs),
+        'terms': len(lexicon),
+        'reindexed': len(to_index),
+        'removed': sum(1 for doc in old_docs if doc['id'] not in wanted),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+# ----------------------------------------------------------------------------
+# Searching
+# ----------------------------------------------------------------------------
+
+class TranscriptIndex:
+    """Read-only view of a built index; postings are read lazily per term."""
+
+    def __init__(self, transcript_dir: str = "transcripts"):
+        directory = index_dir(transcript_dir)
+        with open(os.path.join(directory, "docs.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(os.path.join(directory, "lexicon.json"), 'r', encoding='utf-8') as f:
+            self.lexicon = json.load(f)
+        self.docs = meta['docs']
+        self.average_length = meta['average_length'] or 1
+        self.postings_path = os.path.join(directory, "postings.bin")
+        self._cache = {}
+
+    def postings(self, term: str) -> dict:
+        """Return {doc_number: [positions]} for one folded term."""
+        if term not in self._cache:
+            entry = self.lexicon.get(term)
+            if entry is None:
+                self._cache[term] = {}
+            else:
+                _, offset, length = entry
+                with open(self.postings_path, 'rb') as f:
+                    f.seek(offset)
+                    self._cache[term] = decode_postings(f.read(length))
+        return self._cache[term]
+
+    def idf(self, term: str) -> float:
+        df = self.lexicon.get(term, [0])[0]
+        n = len(self.docs)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def phrase_matches(self, phrase_terms: list) -> dict:
+        """Return {doc_number: [start positions]} where the terms appear consecutively."""
+        if not phrase_terms:
+            return {}
+        lists = [self.postings(term) for term in phrase_terms]
+        candidates = set(lists[0])
+        for postings in lists[1:]:
+            candidates &= set(postings)
+
+        matches = {}
+        for doc in candidates:
+            following = [set(postings[doc]) for postings in lists[1:]]
+            starts = [
+                start for start in lists[0][doc]
+                if all(start + offset + 1 in positions for offset, positions in enumerate(following))
+            ]
+            if starts:
+                matches[doc] = starts
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """
+        Rank documents with BM25. Quoted parts must match as exact phrases.
+
+        Returns:
+            List of {'id', 'title', 'file', 'score', 'position'} (position = first
+            matching token), best first
+        """
+        phrases = [tokenize(p) for p in PHRASE_PATTERN.findall(query)]
+        free_terms = tokenize(PHRASE_PATTERN.sub(' ', query))
+        scoring_terms = list(dict.fromkeys(free_terms + [t for p in phrases for t in p]))
+        if not scoring_terms:
+            return []
+
+        required = None
+        first_hit = {}
+        for phrase in phrases:
+            matches = self.phrase_matches(phrase)
+            required = set(matches) if required is None else required & set(matches)
+            for doc, starts in matches.items():
+                first_hit[doc] = min(first_hit.get(doc, starts[0]), starts[0])
+
+        scores = {}
+        for term in scoring_terms:
+            idf = self.idf(term)
+            for doc, positions in self.postings(term).items():
+                if required is not None and doc not in required:
+                    continue
+                tf = len(positions)
+                length_norm = 1 - BM25_B + BM25_B * self.docs[doc]['length'] / self.average_length
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * length_norm)
+                if not phrases:
+                    first_hit[doc] = min(first_hit.get(doc, positions[0]), positions[0])
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [
+            {
+                'id': self.docs[doc]['id'],
+                'title': self.docs[doc]['title'],
+                'file': self.docs[doc]['file'],
+                'score': score,
+                'position': first_hit.get(doc, 0),
+            }
+            for doc, score in ranked
+        ]
+
+
+def snippet(path: str, position: int, width: int = 12) -> str:
+    """Return the text around token number `position` of a transcript body."""
+    _, body = read_transcript_file(path)
+    tokens = list(tokenize_with_offsets(body))
+    if not tokens:
+        return ""
+    start = tokens[max(0, position - width)][1]
+    end = tokens[min(len(tokens) - 1, position + width)][2]
+    return " ".join(body[start:end].split())
+
+
+def main():
+    TRANSCRIPT_DIR = "transcripts"
+
+    parser = argparse.ArgumentParser(description="Build and query the transcript search index.")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    build_parser = subcommands.add_parser('build', help="Build or incrementally update the index")
+    build_parser.add_argument('--full', action='store_true', help="Re-tokenize every transcript")
+    search_parser = subcommands.add_parser('search', help="Ranked search; quote phrases")
+    search_parser.add_argument('query')
+    search_parser.add_argument('-n', '--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        stats = build_index(TRANSCRIPT_DIR, full=args.full)
+        print(f"🗂️  Indexed {stats['documents']} transcripts, {stats['terms']} terms "
+              f"({stats['reindexed']} re-tokenized, {stats['removed']} removed) "
+              f"in {stats['seconds']:.2f}s")
+        return
+
+    if not os.path.exists(os.path.join(index_dir(TRANSCRIPT_DIR), "docs.json")):
+        print("❌ No index found. Run: python3 transcript_index.py build")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    index = TranscriptIndex(TRANSCRIPT_DIR)
+    hits = index.search(args.query, args.limit)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"🔍 {len(hits)} results for {args.query!r} in {elapsed_ms:.1f} ms\n")
+    for rank, hit in enumerate(hits, 1):
+        print(f"{rank:>2}. [{hit['score']:.2f}] {hit['title'][:70]}")
+        print(f"    https://www.youtube.com/watch?v={hit['id']}")
+        print(f"    …{snippet(hit['file'], hit['position'])}…")
+
+
+if __name__ == "__main__":
+    main()